@@ -41,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
+    'django.contrib.postgres',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
@@ -58,6 +59,7 @@ REST_FRAMEWORK = {
 }
 
 MIDDLEWARE = [
+    'hotel_app.timing.RequestTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -99,6 +101,8 @@ DATABASES = {
         'PASSWORD': getenv('PG_PASSWORD'),
         'HOST': getenv('PG_HOST'),
         'PORT': getenv('PG_PORT'),
+        'CONN_MAX_AGE': int(getenv('PG_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': getenv('PG_CONN_HEALTH_CHECKS', 'on') == 'on',
         'OPTIONS': {'options': '-c search_path=public,hotel'},
         'TEST': {
             'NAME': 'test_db',
@@ -106,6 +110,25 @@ DATABASES = {
     }
 }
 
+# Connections are kept for PG_CONN_MAX_AGE seconds and checked before reuse; 0 closes them after each request.
+# Under hotel/asgi.py every request runs on its own thread, so set PG_CONN_MAX_AGE=0 and pool with pgbouncer.
+# With pgbouncer in transaction mode server-side cursors would outlive the transaction and the startup
+# options are rejected, so set the search path on the role: ALTER ROLE <user> SET search_path = public, hotel;
+
+if getenv('PG_BOUNCER', 'off') == 'on':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+    DATABASES['default']['OPTIONS'] = {}
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': getenv('CACHE_LOCATION', 'hotel'),
+    }
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -151,4 +174,58 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Page size of REST API lists and the cap for the page_size query parameter
+
+REST_PAGE_SIZE = 50
+
+REST_MAX_PAGE_SIZE = 500
+
+# Largest number of reserves accepted by /rest/reserve/batch/
+
+RESERVE_BATCH_MAX = 500
+
+# Serve hotel, room and service lists from values() rows instead of serializers
+
+REST_FAST_PATH = getenv('REST_FAST_PATH', 'off') == 'on'
+
+# Async hotel list, hotel, room and room search pages, for serving through hotel/asgi.py
+
+ASYNC_VIEWS = getenv('ASYNC_VIEWS', 'off') == 'on'
+
+# Per-request SQL, template and serializer timings in Server-Timing headers and JSON lines
+# in the hotel_app.timing log; slow requests and requests repeating SQL are logged as warnings
+
+REQUEST_TIMING = getenv('REQUEST_TIMING', 'off') == 'on'
+
+REQUEST_TIMING_SLOW_MS = 500
+
+REQUEST_TIMING_MAX_DUPLICATES = 5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'loggers': {'hotel_app.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False}},
+}
+
+# Rendered hotel and room page content, invalidated by signals.
+# On by default only with a cache shared by all workers: locmem invalidation stays in one process
+
+PAGE_CACHE = getenv('PAGE_CACHE', 'off' if CACHES['default']['BACKEND'].endswith('LocMemCache') else 'on') == 'on'
+
+PAGE_CACHE_TIMEOUT = 600
+
+# In-memory availability index used by room search and the reserve page
+
+AVAILABILITY_INDEX = getenv('AVAILABILITY_INDEX', 'off') == 'on'
+
+AVAILABILITY_INDEX_HORIZON = 365
+
+AVAILABILITY_INDEX_MAX_AGE = 300
+
+# In-memory hotel and city prefix index used by search autocomplete
+
+AUTOCOMPLETE_MAX_AGE = 300
+
 TEST_RUNNER = 'tests.runner.PostgresSchemaRunner'
\ No newline at end of file
@@ -2,10 +2,13 @@
 
 from django import forms
 from django.contrib import admin
+from django.db.models import Sum
 from django.utils.translation import gettext_lazy as _
 
-from .models import (Address, Client, Hotel, HotelService, Reserve,
-                     ReserveService, Room, Service, models)
+from .models import (SUMMARY_FIELDS, Address, Client, Hotel,
+                     HotelDailyStats, HotelService, Reserve, ReserveService,
+                     Room, Service, models)
+from .paginators import EstimatedCountPaginator
 
 
 class HotelAdminForm(forms.ModelForm):
@@ -51,11 +54,23 @@ class ClientAdminForm(forms.ModelForm):
         fields = '__all__'
 
 
+class LargeTableAdmin(admin.ModelAdmin):
+    """Администратор для больших таблиц.
+
+    Список не считает полное количество строк, а для таблицы без фильтров
+    берёт оценку из статистики Postgres.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
 class HotelServiceInline(admin.TabularInline):
     """Встроенная строка для отеля-сервиса."""
 
     model = HotelService
     extra = 1
+    autocomplete_fields = ('hotel', 'service')
 
 
 class RoomClientInline(admin.TabularInline):
@@ -63,6 +78,7 @@ class RoomClientInline(admin.TabularInline):
 
     model = Reserve
     extra = 1
+    autocomplete_fields = ('room',)
 
 
 class ReserveServiceInline(admin.TabularInline):
@@ -70,41 +86,57 @@ class ReserveServiceInline(admin.TabularInline):
 
     model = ReserveService
     extra = 1
+    autocomplete_fields = ('service',)
 
 
 @admin.register(Hotel)
-class HotelAdmin(admin.ModelAdmin):
+class HotelAdmin(LargeTableAdmin):
     """Администратор модели отель."""
 
     form = HotelAdminForm
     extra = 1
     inlines = (HotelServiceInline,)
+    list_display = ('name', 'rating', 'hotel_address')
+    list_select_related = ('hotel_address',)
+    search_fields = ('name',)
+    autocomplete_fields = ('hotel_address',)
 
 
 @admin.register(Service)
-class ServiceAdmin(admin.ModelAdmin):
+class ServiceAdmin(LargeTableAdmin):
     """Администратор модели сервис."""
 
     model = Service
     inlines = (HotelServiceInline,)
+    list_display = ('name',)
+    search_fields = ('name',)
 
 
 @admin.register(Room)
-class RoomAdmin(admin.ModelAdmin):
+class RoomAdmin(LargeTableAdmin):
     """Администратор модели номер."""
 
     form = RoomAdminForm
+    list_display = ('number', 'category', 'floor', 'cost', 'hotel')
+    list_select_related = ('hotel',)
+    list_filter = ('category',)
+    search_fields = ('hotel__name',)
+    autocomplete_fields = ('hotel',)
 
 
 @admin.register(HotelService)
-class HotelServiceAdmin(admin.ModelAdmin):
+class HotelServiceAdmin(LargeTableAdmin):
     """Администратор модели отель-сервис."""
 
     model = HotelService
+    list_display = ('hotel', 'service', 'cost')
+    list_select_related = ('hotel', 'service')
+    search_fields = ('hotel__name', 'service__name')
+    autocomplete_fields = ('hotel', 'service')
 
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(LargeTableAdmin):
     """Администратор модели клиент."""
 
     model = ClientAdminForm
@@ -112,25 +144,105 @@ class ClientAdmin(admin.ModelAdmin):
         models.DecimalField: {'widget': forms.NumberInput(attrs={'min': 0, 'step': 1})}
     }
     inlines = (RoomClientInline,)
+    list_display = ('user', 'money', 'active_reserves', 'next_check_in')
+    list_select_related = ('user',)
+    search_fields = ('user__username',)
+    autocomplete_fields = ('user',)
+    readonly_fields = SUMMARY_FIELDS
 
 
 @admin.register(Reserve)
-class ReserveAdmin(admin.ModelAdmin):
+class ReserveAdmin(LargeTableAdmin):
     """Администратор модели бронирование."""
 
     model = Reserve
     inlines = (ReserveServiceInline,)
+    list_display = ('__str__', 'user', 'start_date', 'end_date', 'price')
+    list_select_related = ('room__hotel', 'user__user')
+    search_fields = ('room__hotel__name', 'user__user__username')
+    autocomplete_fields = ('room', 'user')
+
+    def get_queryset(self, request):
+        """Получить брони с номером и отелем для строкового представления.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: брони
+        """
+        return super().get_queryset(request).select_related('room__hotel', 'user__user')
 
 
 @admin.register(ReserveService)
-class ReserveServiceAdmin(admin.ModelAdmin):
+class ReserveServiceAdmin(LargeTableAdmin):
     """Администратор модели бронирование-сервис."""
 
     model = ReserveService
+    list_display = ('reserve', 'service')
+    list_select_related = ('reserve__room__hotel', 'service')
+    autocomplete_fields = ('reserve', 'service')
 
 
 @admin.register(Address)
-class AddressAdmin(admin.ModelAdmin):
+class AddressAdmin(LargeTableAdmin):
     """Администратор можеди адресс."""
 
     model = Address
+    list_display = ('city', 'street', 'number')
+    search_fields = ('city', 'street')
+
+
+@admin.register(HotelDailyStats)
+class HotelDailyStatsAdmin(LargeTableAdmin):
+    """Администратор дневной сводки отелей, только для чтения.
+
+    Над списком выводятся суммы за выбранный в date_hierarchy месяц или год.
+    """
+
+    model = HotelDailyStats
+    list_display = ('day', 'hotel', 'rooms_sold', 'revenue', 'service_revenue')
+    list_select_related = ('hotel',)
+    search_fields = ('hotel__name',)
+    date_hierarchy = 'day'
+
+    def has_add_permission(self, request) -> bool:
+        """Сводку заполняют сигналы и команда rebuild_stats.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            bool: ложь
+        """
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        """Сводку заполняют сигналы и команда rebuild_stats.
+
+        Args:
+            request (_type_): запрос
+            obj (_type_): объект. по умолчанию None.
+
+        Returns:
+            bool: ложь
+        """
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        """Добавить суммы по отфильтрованной сводке.
+
+        Args:
+            request (_type_): запрос
+            extra_context (_type_): контекст. по умолчанию None.
+
+        Returns:
+            _type_: ответ
+        """
+        response = super().changelist_view(request, extra_context)
+        changelist = getattr(response, 'context_data', {}).get('cl')
+        if changelist is not None:
+            response.context_data['totals'] = changelist.queryset.aggregate(
+                room_nights=Sum('rooms_sold'), revenue=Sum('revenue'), service_revenue=Sum('service_revenue'),
+            )
+        return response
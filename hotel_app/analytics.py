@@ -0,0 +1,276 @@
+"""Модуль для аналитики загрузки и выручки отелей.
+
+Дневная сводка HotelDailyStats хранит на отель и ночь количество
+проданных номеров, выручку (цена брони, поделённая на ночи) и выручку
+услуг (стоимость услуг отеля в брони за ночь). Сигналы пересчитывают
+после фиксации транзакции только ночи изменённой брони, команда
+rebuild_stats пересчитывает любой период целиком, а отчёты по месяцам
+читают только сводку.
+"""
+
+from calendar import monthrange
+from datetime import date, timedelta
+from typing import Any, NamedTuple, Optional
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import (HotelDailyStats, HotelService, Reserve, ReserveService,
+                     Room)
+
+# ночи брони раскладываются через generate_series по смещениям от даты
+# заезда, поэтому день получается сложением date + integer без часовых поясов
+REFRESH_SQL = '''
+INSERT INTO {stats} (id, created, modified, hotel_id, day, rooms_sold, revenue, service_revenue)
+SELECT gen_random_uuid(), now(), now(), room.hotel_id, reserve.start_date + night.n AS day, count(*),
+       sum(coalesce(reserve.price, 0) / (reserve.end_date - reserve.start_date)),
+       coalesce(sum(services.cost), 0)
+FROM {reserve} reserve
+JOIN {room} room ON room.id = reserve.room_id
+CROSS JOIN LATERAL generate_series(
+    greatest(reserve.start_date, coalesce(%(start)s::date, reserve.start_date)) - reserve.start_date,
+    least(reserve.end_date, coalesce(%(end)s::date, reserve.end_date)) - reserve.start_date - 1
+) AS night(n)
+LEFT JOIN LATERAL (
+    SELECT sum(hotel_service.cost) AS cost
+    FROM {reserve_service} reserve_service
+    JOIN {hotel_service} hotel_service
+        ON hotel_service.service_id = reserve_service.service_id AND hotel_service.hotel_id = room.hotel_id
+    WHERE reserve_service.reserve_id = reserve.id
+) AS services ON true
+WHERE reserve.end_date > reserve.start_date
+    AND (%(start)s::date IS NULL OR reserve.end_date > %(start)s::date)
+    AND (%(end)s::date IS NULL OR reserve.start_date < %(end)s::date)
+    AND (%(hotel)s::uuid IS NULL OR room.hotel_id = %(hotel)s::uuid)
+GROUP BY room.hotel_id, day
+ON CONFLICT (hotel_id, day) DO UPDATE SET
+    modified = EXCLUDED.modified,
+    rooms_sold = EXCLUDED.rooms_sold,
+    revenue = EXCLUDED.revenue,
+    service_revenue = EXCLUDED.service_revenue
+'''.format(
+    stats=HotelDailyStats._meta.db_table,
+    reserve=Reserve._meta.db_table,
+    room=Room._meta.db_table,
+    reserve_service=ReserveService._meta.db_table,
+    hotel_service=HotelService._meta.db_table,
+)
+
+# пересчёты одного отеля идут по очереди под его advisory-блокировкой, а пересчёт
+# всех отелей берёт общую блокировку, которую пересчёты отелей держат разделяемой
+LOCK_ALL = 1701
+LOCK_HOTEL = 1702
+LOCK_ALL_SQL = 'SELECT pg_advisory_xact_lock(%(all)s, 0)'
+LOCK_HOTEL_SQL = 'SELECT pg_advisory_xact_lock_shared(%(all)s, 0), pg_advisory_xact_lock(%(one)s, hashtext(%(hotel)s))'
+
+
+class Window(NamedTuple):
+    """Ночи отеля, которые нужно пересчитать."""
+
+    hotel: Any
+    start: date
+    end: date
+
+
+class MonthStats(NamedTuple):
+    """Загрузка и выручка отеля за месяц."""
+
+    month: date
+    hotel: Any
+    hotel_name: str
+    rooms: int
+    room_nights: int
+    occupancy: float
+    revenue: Any
+    service_revenue: Any
+
+
+def rebuild(start: Optional[date] = None, end: Optional[date] = None, hotel: Any = None) -> int:
+    """Пересчитать сводку за период.
+
+    Пересчёты одного отеля не пересекаются: иначе вставка одного из них
+    может прочитать брони до фиксации другого и вернуть устаревшие строки.
+
+    Args:
+        start (Optional[date]): первая ночь, None - без ограничения. по умолчанию None.
+        end (Optional[date]): ночь после последней, None - без ограничения. по умолчанию None.
+        hotel (Any): id отеля, None - все отели. по умолчанию None.
+
+    Returns:
+        int: количество строк сводки за период
+    """
+    stale = HotelDailyStats.objects.all()
+    if start is not None:
+        stale = stale.filter(day__gte=start)
+    if end is not None:
+        stale = stale.filter(day__lt=end)
+    if hotel is not None:
+        stale = stale.filter(hotel=hotel)
+    params = {'start': start, 'end': end, 'hotel': None if hotel is None else str(hotel)}
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if hotel is None:
+                cursor.execute(LOCK_ALL_SQL, {'all': LOCK_ALL})
+            else:
+                cursor.execute(LOCK_HOTEL_SQL, {'all': LOCK_ALL, 'one': LOCK_HOTEL, 'hotel': params['hotel']})
+            stale.delete()
+            cursor.execute(REFRESH_SQL, params)
+            return cursor.rowcount
+
+
+def reserve_window(reserve_id: Any) -> Optional[Window]:
+    """Получить ночи брони в базе данных.
+
+    Args:
+        reserve_id (Any): id брони
+
+    Returns:
+        Optional[Window]: ночи или None, если брони нет
+    """
+    row = Reserve.objects.filter(id=reserve_id).values_list('room__hotel_id', 'start_date', 'end_date').first()
+    return None if row is None else Window(*row)
+
+
+def room_window(room_id: Any, start: date, end: date) -> Optional[Window]:
+    """Получить ночи номера.
+
+    Args:
+        room_id (Any): id номера
+        start (date): дата заезда
+        end (date): дата выезда
+
+    Returns:
+        Optional[Window]: ночи или None, если номера нет
+    """
+    hotel_id = Room.objects.filter(id=room_id).values_list('hotel_id', flat=True).first()
+    return None if hotel_id is None else Window(hotel_id, start, end)
+
+
+def instance_window(reserve: Reserve) -> Optional[Window]:
+    """Получить ночи брони, взяв отель из уже загруженного номера без запроса.
+
+    Args:
+        reserve (Reserve): бронь
+
+    Returns:
+        Optional[Window]: ночи или None, если номера нет
+    """
+    room = Reserve.room.field.get_cached_value(reserve, None)
+    if room is not None and room.pk == reserve.room_id:
+        return Window(room.hotel_id, reserve.start_date, reserve.end_date)
+    return room_window(reserve.room_id, reserve.start_date, reserve.end_date)
+
+
+def refresh(window: Optional[Window]) -> None:
+    """Пересчитать сводку за ночи одного отеля.
+
+    Args:
+        window (Optional[Window]): ночи или None
+    """
+    if window is not None and window.end > window.start:
+        rebuild(window.start, window.end, window.hotel)
+
+
+class RefreshBatch:
+    """Ночи отелей, которые пересчитываются после фиксации одной транзакции."""
+
+    def __init__(self) -> None:
+        """Создать пустой пересчёт."""
+        self.windows = {}
+
+    def add(self, window: Window) -> None:
+        """Добавить ночи, объединив их с ночами того же отеля.
+
+        Args:
+            window (Window): ночи
+        """
+        known = self.windows.get(window.hotel)
+        if known is not None:
+            window = Window(window.hotel, min(known.start, window.start), max(known.end, window.end))
+        self.windows[window.hotel] = window
+
+    def run(self) -> None:
+        """Пересчитать сводку по отелю за раз."""
+        if getattr(connection, 'stats_refresh', None) is self:
+            connection.stats_refresh = None
+        for window in self.windows.values():
+            refresh(window)
+
+
+def schedule_refresh(window: Optional[Window]) -> None:
+    """Пересчитать сводку после фиксации транзакции.
+
+    Пересчёт после фиксации видит брони других завершённых транзакций,
+    поэтому ночь не теряет чужую бронь. Ночи одного отеля из всей
+    транзакции объединяются и пересчитываются одним запросом.
+
+    Args:
+        window (Optional[Window]): ночи или None
+    """
+    if window is None:
+        return
+    batch = getattr(connection, 'stats_refresh', None)
+    # после отката транзакции её колбэков больше нет, и пересчёт начинается заново
+    scheduled = batch is not None and any(entry[1] == batch.run for entry in connection.run_on_commit)
+    if not scheduled:
+        batch = connection.stats_refresh = RefreshBatch()
+    batch.add(window)
+    if not scheduled:
+        transaction.on_commit(batch.run)
+
+
+def days_in(month: date, start: date, end: date) -> int:
+    """Получить количество ночей месяца внутри полуинтервала.
+
+    Args:
+        month (date): первый день месяца
+        start (date): начало
+        end (date): конец
+
+    Returns:
+        int: количество ночей
+    """
+    next_month = month + timedelta(days=monthrange(month.year, month.month)[1])
+    return max((min(end, next_month) - max(start, month)).days, 0)
+
+
+def monthly(start: date, end: date, hotel: Any = None) -> list[MonthStats]:
+    """Получить загрузку и выручку отелей по месяцам из сводки.
+
+    Загрузка - проданные номеро-ночи, делённые на номера отеля, умноженные
+    на ночи месяца внутри периода.
+
+    Args:
+        start (date): первая ночь
+        end (date): ночь после последней
+        hotel (Any): id отеля. по умолчанию None.
+
+    Returns:
+        list[MonthStats]: месяцы по возрастанию, внутри месяца отели по названию
+    """
+    stats = HotelDailyStats.objects.filter(day__gte=start, day__lt=end)
+    if hotel is not None:
+        stats = stats.filter(hotel=hotel)
+    rows = list(stats.annotate(month=TruncMonth('day')).values('month', 'hotel_id', 'hotel__name').annotate(
+        room_nights=Sum('rooms_sold'), revenue=Sum('revenue'), service_revenue=Sum('service_revenue'),
+    ).order_by('month', 'hotel__name', 'hotel_id'))
+    rooms = dict(
+        Room.objects.filter(hotel__in={row['hotel_id'] for row in rows}).values('hotel').annotate(
+            count=Count('id'),
+        ).values_list('hotel', 'count'),
+    )
+    report = []
+    for row in rows:
+        capacity = rooms.get(row['hotel_id'], 0) * days_in(row['month'], start, end)
+        report.append(MonthStats(
+            month=row['month'],
+            hotel=row['hotel_id'],
+            hotel_name=row['hotel__name'],
+            rooms=rooms.get(row['hotel_id'], 0),
+            room_nights=row['room_nights'],
+            occupancy=row['room_nights'] / capacity if capacity else 0.0,
+            revenue=row['revenue'],
+            service_revenue=row['service_revenue'],
+        ))
+    return report
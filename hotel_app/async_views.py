@@ -0,0 +1,200 @@
+"""Модуль для асинхронных версий страниц только для чтения.
+
+Страницы подключаются вместо синхронных при ASYNC_VIEWS и рассчитаны на
+запуск через hotel/asgi.py: запрос ждёт базу и кэш, не занимая поток
+воркера. Независимые запросы (отель, его номера и услуги) выполняются
+через asyncio.gather, шаблоны рендерятся в sync_to_async.
+"""
+
+import asyncio
+from functools import partial
+from typing import Optional
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.core import exceptions
+from django.core import paginator as django_paginator
+from django.db.models import QuerySet
+from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
+
+from . import availability, fragments, page_cache, pricing, views
+from .forms import RoomSearchForm
+from .models import Hotel, Room, check_date
+from .paginators import KeysetPaginator, apage_or_first, approximate_count
+
+
+def parse_id(request) -> Optional[UUID]:
+    """Получить id из параметра запроса.
+
+    Args:
+        request (_type_): запрос
+
+    Returns:
+        Optional[UUID]: id или None, если он не задан или некорректен
+    """
+    try:
+        return UUID(request.GET.get('id', None) or '')
+    except ValueError:
+        return None
+
+
+async def alist(queryset: QuerySet) -> list:
+    """Получить объекты запроса асинхронно.
+
+    Args:
+        queryset (QuerySet): объекты
+
+    Returns:
+        list: объекты
+    """
+    return [instance async for instance in queryset]
+
+
+async def hotel_list(request):
+    """Список отелей.
+
+    Args:
+        request (_type_): запрос
+
+    Returns:
+        _type_: ответ
+    """
+    paginator = KeysetPaginator(
+        Hotel.objects.select_related('hotel_address'), views.HOTEL_ORDERING, views.HotelListView.per_page,
+    )
+    page, hotels_count = await asyncio.gather(
+        apage_or_first(paginator, request.GET.get('after'), request.GET.get('before')),
+        sync_to_async(approximate_count)(Hotel),
+    )
+    hotel_cards = await sync_to_async(fragments.render_many)(fragments.HOTEL_CARD, page.object_list)
+    context = {
+        'hotels': page.object_list,
+        'hotels_list': page.object_list,
+        'hotel_cards': hotel_cards,
+        'page': page,
+        'hotels_count': hotels_count,
+    }
+    return await sync_to_async(render)(request, 'index.html', context)
+
+
+async def render_hotel_content(id_: UUID) -> str:
+    """Отрендерить содержимое страницы отеля, читая отель, номера и услуги одновременно.
+
+    Args:
+        id_ (UUID): id отеля
+
+    Returns:
+        str: содержимое
+    """
+    hotel, rooms, services = await asyncio.gather(
+        Hotel.objects.select_related('hotel_address').filter(id=id_).afirst(),
+        alist(Room.objects.filter(hotel=id_)),
+        sync_to_async(pricing.hotel_services)(id_),
+    )
+    room_tiles = await sync_to_async(fragments.render_many)(fragments.ROOM_TILE, rooms)
+    context = {'hotel': hotel, 'room_tiles': room_tiles, 'services': services if hotel else []}
+    return await sync_to_async(render_to_string)('content/hotel.html', context)
+
+
+async def render_room_content(id_: UUID) -> str:
+    """Отрендерить содержимое страницы номера.
+
+    Args:
+        id_ (UUID): id номера
+
+    Returns:
+        str: содержимое
+    """
+    room = await Room.objects.select_related('hotel').filter(id=id_).afirst()
+    return await sync_to_async(render_to_string)('content/room.html', {'room': room})
+
+
+async def hotel(request):
+    """Отель.
+
+    Args:
+        request (_type_): запрос
+
+    Returns:
+        _type_: ответ
+    """
+    id_ = parse_id(request)
+    if id_ is None:
+        return redirect('homepage')
+    content = await page_cache.aget_or_render(page_cache.HOTEL, id_, partial(render_hotel_content, id_))
+    return await sync_to_async(render)(request, 'hotel.html', {'content': content})
+
+
+async def room(request):
+    """Номер.
+
+    Args:
+        request (_type_): запрос
+
+    Returns:
+        _type_: ответ
+    """
+    id_ = parse_id(request)
+    if id_ is None:
+        return redirect('homepage')
+    content = await page_cache.aget_or_render(page_cache.ROOM, id_, partial(render_room_content, id_))
+    return await sync_to_async(render)(request, 'room.html', {'content': content})
+
+
+async def free_rooms_page(form: RoomSearchForm, number: Optional[str]) -> django_paginator.Page:
+    """Получить страницу свободных номеров двумя асинхронными запросами.
+
+    Args:
+        form (RoomSearchForm): проверенная форма поиска
+        number (Optional[str]): номер страницы
+
+    Returns:
+        django_paginator.Page: страница
+    """
+    # индекс занятости может читать базу при перестроении
+    rooms = await sync_to_async(availability.free_rooms)(**form.cleaned_data)
+    paginator = django_paginator.Paginator(rooms, views.FREE_ROOMS_PER_PAGE)
+    paginator.count = await rooms.acount()
+    try:
+        number = paginator.validate_number(number)
+    except django_paginator.PageNotAnInteger:
+        number = 1
+    except django_paginator.EmptyPage:
+        number = paginator.num_pages
+    bottom = (number - 1) * paginator.per_page
+    objects = await alist(rooms[bottom:bottom + paginator.per_page])
+    return django_paginator.Page(objects, number, paginator)
+
+
+async def book_by_date(request):
+    """Поиск свободных номеров по датам; отправка формы обрабатывается синхронной версией.
+
+    Args:
+        request (_type_): запрос
+
+    Returns:
+        _type_: ответ
+    """
+    if request.method != 'GET':
+        return await sync_to_async(views.book_by_date)(request)
+    form_errors = []
+    free_rooms = None
+    query = ''
+    if 'start_date' in request.GET:
+        form = RoomSearchForm(request.GET)
+        if form.is_valid():
+            try:
+                check_date(form.cleaned_data['start_date'])
+                check_date(form.cleaned_data['end_date'])
+            except exceptions.ValidationError:
+                form_errors.append(views.DATE_ERROR)
+            free_rooms = await free_rooms_page(form, request.GET.get('page'))
+            params = request.GET.copy()
+            for excluded in ('page', 'csrfmiddlewaretoken'):
+                params.pop(excluded, None)
+            query = params.urlencode()
+    else:
+        form = RoomSearchForm()
+    context = {'form': form, 'form_errors': form_errors, 'rooms': free_rooms, 'query': query}
+    return await sync_to_async(render)(request, 'book_by_date.html', context)
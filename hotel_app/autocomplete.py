@@ -0,0 +1,338 @@
+"""Модуль для подсказок поиска отелей из памяти.
+
+Нормализованные названия отелей и городов лежат в отсортированных списках
+ключей, по списку на значение рейтинга, и подсказки для префикса ищутся
+bisect без запроса к базе данных. Ключ начинается с каждого слова, поэтому
+"pal" находит "Grand Palace". Отели ранжируются по рейтингу, города - по
+лучшему рейтингу своих отелей.
+
+Индекс строится целиком при первой подсказке и обновляется сигналами после
+коммита транзакции. Изменения, сделанные другими процессами и массовыми
+вставками в обход сигналов, он увидит только после перестроения, поэтому
+индекс перестраивается не реже AUTOCOMPLETE_MAX_AGE секунд.
+"""
+
+from bisect import bisect_left, insort
+from decimal import Decimal
+from threading import Lock, RLock
+from time import monotonic
+from typing import Any, Iterable, NamedTuple, Optional
+
+from django.conf import settings
+
+from .models import Hotel
+
+DEFAULT_LIMIT = 10
+DEFAULT_MAX_AGE = 300
+HOTEL = 'hotel'
+CITY = 'city'
+
+
+def normalize(text: Optional[str]) -> str:
+    """Привести текст к виду ключа: без регистра, ё как е, слова через один пробел.
+
+    Args:
+        text (Optional[str]): текст или None
+
+    Returns:
+        str: ключ
+    """
+    return ' '.join((text or '').casefold().replace('ё', 'е').split())
+
+
+def word_keys(text: Optional[str]) -> list[str]:
+    """Получить ключи, начинающиеся с каждого слова текста.
+
+    Args:
+        text (Optional[str]): текст или None
+
+    Returns:
+        list[str]: ключи
+    """
+    words = normalize(text).split()
+    return [' '.join(words[start:]) for start in range(len(words))]
+
+
+class Suggestion(NamedTuple):
+    """Подсказка: отель или город."""
+
+    kind: str
+    text: str
+    rating: Decimal
+    id: Any = None
+
+
+class HotelRecord(NamedTuple):
+    """Отель в индексе."""
+
+    name: str
+    rating: Decimal
+    city: Optional[str]
+
+
+class AutocompleteIndex:
+    """Отсортированные списки ключей названий отелей и городов по рейтингу."""
+
+    def __init__(self, max_age: float = DEFAULT_MAX_AGE) -> None:
+        """Создать пустой индекс.
+
+        Args:
+            max_age (float): время жизни индекса в секундах. по умолчанию DEFAULT_MAX_AGE.
+        """
+        self.max_age = max_age
+        self.built_at = None
+        self.buckets = {}
+        self.ratings = []
+        self.hotels = {}
+        self.cities = {}
+        self.city_hotels = {}
+        self.city_ratings = {}
+        self._lock = RLock()
+        self._building = Lock()
+
+    @property
+    def is_built(self) -> bool:
+        """Проверить, построен ли индекс.
+
+        Returns:
+            bool: истина/ложь
+        """
+        return self.built_at is not None
+
+    def build(self) -> None:
+        """Построить индекс по базе данных одним запросом."""
+        self.load(Hotel.objects.order_by().values_list('id', 'name', 'rating', 'hotel_address__city'))
+
+    def load(self, rows: Iterable[tuple]) -> None:
+        """Построить индекс по строкам отелей: каждый список ключей сортируется один раз.
+
+        Args:
+            rows (Iterable[tuple]): id, название, рейтинг и город или None
+        """
+        hotels, cities, city_hotels, buckets = {}, {}, {}, {}
+        for hotel_id, name, rating, city in rows:
+            hotels[hotel_id] = HotelRecord(name, rating, city)
+            buckets.setdefault(rating, []).extend((key, HOTEL, hotel_id) for key in word_keys(name))
+            city_key = normalize(city)
+            if city_key:
+                city_hotels.setdefault(city_key, set()).add(hotel_id)
+                cities.setdefault(city_key, city)
+        city_ratings = {
+            city_key: max(hotels[hotel_id].rating for hotel_id in members)
+            for city_key, members in city_hotels.items()
+        }
+        for city_key, rating in city_ratings.items():
+            buckets.setdefault(rating, []).extend((key, CITY, city_key) for key in word_keys(city_key))
+        for keys in buckets.values():
+            keys.sort()
+        with self._lock:
+            self.built_at = monotonic()
+            self.buckets = buckets
+            self.ratings = sorted(buckets)
+            self.hotels = hotels
+            self.cities = cities
+            self.city_hotels = city_hotels
+            self.city_ratings = city_ratings
+
+    def is_stale(self) -> bool:
+        """Проверить, нужно ли перестроить индекс.
+
+        Returns:
+            bool: истина/ложь
+        """
+        built_at = self.built_at
+        return built_at is None or monotonic() - built_at > self.max_age
+
+    def ensure_fresh(self) -> None:
+        """Перестроить индекс, если он не построен или устарел.
+
+        Перестраивает один поток. Пока индекс устарел, остальные отвечают по
+        старому индексу и ждут только построения ещё не построенного.
+        """
+        if not self.is_stale():
+            return
+        if not self._building.acquire(blocking=not self.is_built):
+            return
+        try:
+            if self.is_stale():
+                self.build()
+        finally:
+            self._building.release()
+
+    def invalidate(self) -> None:
+        """Перестроить индекс при следующей подсказке, например после массовой вставки отелей."""
+        with self._lock:
+            self.built_at = None
+
+    def suggest(self, text: str, limit: int = DEFAULT_LIMIT) -> list[Suggestion]:
+        """Получить подсказки для начала названия отеля или города.
+
+        Списки ключей просматриваются от лучшего рейтинга к худшему, и
+        просмотр останавливается на limit подсказках, поэтому короткий
+        префикс стоит не дороже длинного.
+
+        Args:
+            text (str): введённый текст
+            limit (int): количество подсказок. по умолчанию DEFAULT_LIMIT.
+
+        Returns:
+            list[Suggestion]: подсказки, лучший рейтинг первым
+        """
+        prefix = normalize(text)
+        if not prefix:
+            return []
+        self.ensure_fresh()
+        found = {}
+        with self._lock:
+            for rating in reversed(self.ratings):
+                keys = self.buckets[rating]
+                position = bisect_left(keys, (prefix,))
+                while len(found) < limit and position < len(keys) and keys[position][0].startswith(prefix):
+                    _, kind, ref = keys[position]
+                    found.setdefault((kind, ref), None)
+                    position += 1
+                if len(found) >= limit:
+                    break
+            return [self._suggestion(kind, ref) for kind, ref in found]
+
+    def _suggestion(self, kind: str, ref: Any) -> Suggestion:
+        """Получить подсказку по ключу.
+
+        Args:
+            kind (str): HOTEL или CITY
+            ref (Any): id отеля или ключ города
+
+        Returns:
+            Suggestion: подсказка
+        """
+        if kind == HOTEL:
+            hotel = self.hotels[ref]
+            return Suggestion(HOTEL, hotel.name, hotel.rating, ref)
+        return Suggestion(CITY, self.cities[ref], self.city_ratings[ref])
+
+    def hotels_changed(self, hotel_ids: list) -> None:
+        """Перечитать отели из базы данных и заменить их ключи.
+
+        Args:
+            hotel_ids (list): id отелей
+        """
+        if self.is_built:
+            self._reload(Hotel.objects.filter(id__in=hotel_ids))
+
+    def address_changed(self, address_id: Any) -> None:
+        """Перечитать отели с изменённым адресом.
+
+        Args:
+            address_id (Any): id адреса
+        """
+        if self.is_built:
+            self._reload(Hotel.objects.filter(hotel_address=address_id))
+
+    def hotel_deleted(self, hotel_id: Any) -> None:
+        """Удалить ключи отеля.
+
+        Args:
+            hotel_id (Any): id отеля
+        """
+        with self._lock:
+            if self.is_built:
+                self._remove(hotel_id)
+
+    def _reload(self, hotels) -> None:
+        """Заменить ключи отелей строками из базы данных.
+
+        Args:
+            hotels (_type_): отели
+        """
+        rows = list(hotels.order_by().values_list('id', 'name', 'rating', 'hotel_address__city'))
+        with self._lock:
+            for hotel_id, name, rating, city in rows:
+                self._remove(hotel_id)
+                self._add(hotel_id, HotelRecord(name, rating, city))
+
+    def _add(self, hotel_id: Any, hotel: HotelRecord) -> None:
+        """Добавить ключи отеля и пересчитать рейтинг его города.
+
+        Args:
+            hotel_id (Any): id отеля
+            hotel (HotelRecord): отель
+        """
+        self.hotels[hotel_id] = hotel
+        for key in word_keys(hotel.name):
+            self._insert((key, HOTEL, hotel_id), hotel.rating)
+        city_key = normalize(hotel.city)
+        if not city_key:
+            return
+        self.city_hotels.setdefault(city_key, set()).add(hotel_id)
+        self.cities.setdefault(city_key, hotel.city)
+        self._rate_city(city_key, max(self.city_ratings.get(city_key, hotel.rating), hotel.rating))
+
+    def _remove(self, hotel_id: Any) -> None:
+        """Удалить ключи отеля и пересчитать рейтинг его города.
+
+        Args:
+            hotel_id (Any): id отеля
+        """
+        hotel = self.hotels.pop(hotel_id, None)
+        if hotel is None:
+            return
+        for key in word_keys(hotel.name):
+            self._discard((key, HOTEL, hotel_id), hotel.rating)
+        city_key = normalize(hotel.city)
+        members = self.city_hotels.get(city_key)
+        if not members:
+            return
+        members.discard(hotel_id)
+        self._rate_city(city_key, max((self.hotels[member].rating for member in members), default=None))
+
+    def _rate_city(self, city_key: str, rating: Optional[Decimal]) -> None:
+        """Перенести ключи города в список нового рейтинга или удалить город без отелей.
+
+        Args:
+            city_key (str): ключ города
+            rating (Optional[Decimal]): лучший рейтинг отелей города или None
+        """
+        old = self.city_ratings.get(city_key)
+        if old == rating:
+            return
+        items = [(key, CITY, city_key) for key in word_keys(city_key)]
+        if old is not None:
+            for item in items:
+                self._discard(item, old)
+        if rating is None:
+            del self.city_hotels[city_key], self.cities[city_key], self.city_ratings[city_key]
+            return
+        for item in items:
+            self._insert(item, rating)
+        self.city_ratings[city_key] = rating
+
+    def _insert(self, item: tuple, rating: Decimal) -> None:
+        """Вставить ключ в список рейтинга.
+
+        Args:
+            item (tuple): ключ, вид и ссылка
+            rating (Decimal): рейтинг
+        """
+        keys = self.buckets.get(rating)
+        if keys is None:
+            keys = self.buckets[rating] = []
+            insort(self.ratings, rating)
+        insort(keys, item)
+
+    def _discard(self, item: tuple, rating: Decimal) -> None:
+        """Удалить ключ из списка рейтинга, а пустой список - из индекса.
+
+        Args:
+            item (tuple): ключ, вид и ссылка
+            rating (Decimal): рейтинг
+        """
+        keys = self.buckets.get(rating, [])
+        position = bisect_left(keys, item)
+        if position < len(keys) and keys[position] == item:
+            del keys[position]
+        if rating in self.buckets and not keys:
+            del self.buckets[rating]
+            self.ratings.remove(rating)
+
+
+index = AutocompleteIndex(max_age=getattr(settings, 'AUTOCOMPLETE_MAX_AGE', DEFAULT_MAX_AGE))
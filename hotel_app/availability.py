@@ -0,0 +1,142 @@
+"""Модуль для поиска свободных номеров."""
+
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from django.db.models import (Count, Exists, Func, IntegerField, Max,
+                              OuterRef, QuerySet, Subquery, Sum, Value)
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from . import availability_index
+from .models import Address, Hotel, Reserve, Room, overlapping_reserves
+
+ROOMS_ORDERING = ('category', 'floor', 'number', 'id')
+
+
+class DateDiff(Func):
+    """Количество дней между датами: разность date - date в Postgres."""
+
+    template = '(%(expressions)s)'
+    arg_joiner = ' - '
+    output_field = IntegerField()
+
+
+def unreserved_rooms(start_date: date, end_date: date) -> QuerySet:
+    """Получить номера без броней на полуинтервал [start_date, end_date) запросом к базе.
+
+    Args:
+        start_date (date): дата заезда
+        end_date (date): дата выезда
+
+    Returns:
+        QuerySet: свободные номера
+    """
+    return Room.objects.filter(~Exists(overlapping_reserves(OuterRef('pk'), start_date, end_date)))
+
+
+def filter_rooms(
+    rooms: QuerySet,
+    hotel: Optional[UUID] = None,
+    city: Optional[str] = None,
+    category: Optional[str] = None,
+    max_cost: Optional[Decimal] = None,
+    floor: Optional[int] = None,
+) -> QuerySet:
+    """Отфильтровать номера.
+
+    Args:
+        rooms (QuerySet): номера
+        hotel (Optional[UUID]): id отеля. по умолчанию None.
+        city (Optional[str]): город отеля. по умолчанию None.
+        category (Optional[str]): категория номера. по умолчанию None.
+        max_cost (Optional[Decimal]): максимальная цена за сутки. по умолчанию None.
+        floor (Optional[int]): этаж. по умолчанию None.
+
+    Returns:
+        QuerySet: номера
+    """
+    if hotel is not None:
+        rooms = rooms.filter(hotel_id=hotel)
+    if city:
+        rooms = rooms.filter(hotel__hotel_address__city__iexact=city)
+    if category:
+        rooms = rooms.filter(category=category)
+    if max_cost is not None:
+        rooms = rooms.filter(cost__lte=max_cost)
+    if floor is not None:
+        rooms = rooms.filter(floor=floor)
+    return rooms
+
+
+def free_rooms(start_date: date, end_date: date, **filters) -> QuerySet:
+    """Получить номера, свободные все ночи полуинтервала [start_date, end_date).
+
+    Занятость проверяется через NOT EXISTS по броням номера, поэтому
+    результат строится одним запросом без выгрузки броней. Если включён
+    индекс занятости и даты попадают в его горизонт, брони не читаются вовсе.
+
+    Args:
+        start_date (date): дата заезда
+        end_date (date): дата выезда
+        filters (Any): фильтры filter_rooms
+
+    Returns:
+        QuerySet: свободные номера
+    """
+    free_ids = None
+    if availability_index.is_enabled():
+        free_ids = availability_index.index.free_room_ids(start_date, end_date)
+    if free_ids is None:
+        rooms = unreserved_rooms(start_date, end_date)
+    else:
+        rooms = Room.objects.filter(id__in=free_ids)
+    return filter_rooms(rooms, **filters).order_by(*ROOMS_ORDERING)
+
+
+def rooms_free_nights(start_date: date, end_date: date, **filters) -> QuerySet:
+    """Получить номера хотя бы с одной свободной ночью и количеством свободных ночей.
+
+    Занятые ночи каждого номера суммируются коррелированным подзапросом
+    по пересечениям броней с окном, так что ответ строится одним запросом.
+
+    Args:
+        start_date (date): начало окна
+        end_date (date): конец окна, не включая
+        filters (Any): фильтры filter_rooms
+
+    Returns:
+        QuerySet: номера с аннотацией free_nights
+    """
+    booked = overlapping_reserves(OuterRef('pk'), start_date, end_date).order_by().values('room').annotate(
+        nights=Sum(DateDiff(Least('end_date', Value(end_date)), Greatest('start_date', Value(start_date)))),
+    ).values('nights')
+    rooms = Room.objects.annotate(
+        free_nights=Value((end_date - start_date).days) - Coalesce(Subquery(booked), 0),
+    ).filter(free_nights__gt=0)
+    return filter_rooms(rooms, **filters).order_by('-free_nights', *ROOMS_ORDERING)
+
+
+def availability_version(start_date: date, end_date: date) -> str:
+    """Получить версию занятости для окна дат.
+
+    Версия меняется при изменении или удалении брони, пересекающей окно,
+    и при изменении номеров, отелей и адресов, по которым фильтруются
+    номера, поэтому подходит для ETag.
+
+    Args:
+        start_date (date): начало окна
+        end_date (date): конец окна, не включая
+
+    Returns:
+        str: версия
+    """
+    reserves = Reserve.objects.filter(start_date__lt=end_date, end_date__gt=start_date).aggregate(
+        modified=Max('modified'), count=Count('id'),
+    )
+    parts = [reserves['modified'], reserves['count']]
+    for model in (Room, Hotel, Address):
+        versions = model.objects.aggregate(modified=Max('modified'), count=Count('id'))
+        parts += [versions['modified'], versions['count']]
+    return '-'.join(str(part.timestamp()) if hasattr(part, 'timestamp') else str(part) for part in parts)
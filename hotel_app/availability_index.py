@@ -0,0 +1,319 @@
+"""Модуль для индекса занятости номеров в памяти.
+
+Для каждого номера хранится строка флагов занятости по ночам на горизонт
+вперёд от сегодняшнего дня. Поиск свободных номеров на полуинтервал
+[start, end) превращается в векторную операцию над срезом матрицы.
+
+Индекс живёт в памяти процесса и обновляется сигналами после коммита
+транзакции. Изменения, сделанные другими процессами, он увидит только после
+перестроения, поэтому индекс перестраивается не реже AVAILABILITY_INDEX_MAX_AGE
+секунд, а окончательную проверку брони всегда делает база данных.
+"""
+
+from datetime import date, timedelta
+from functools import partial
+from threading import RLock
+from time import monotonic
+from typing import Any, Optional
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Reserve, Room
+
+DEFAULT_HORIZON = 365
+DEFAULT_MAX_AGE = 300
+CHUNK_SIZE = 10000
+
+
+def is_enabled() -> bool:
+    """Проверить, включён ли индекс.
+
+    Returns:
+        bool: истина/ложь
+    """
+    return getattr(settings, 'AVAILABILITY_INDEX', False)
+
+
+class AvailabilityIndex:
+    """Матрица занятости номеров по ночам."""
+
+    def __init__(self, horizon: int = DEFAULT_HORIZON, max_age: float = DEFAULT_MAX_AGE) -> None:
+        """Создать пустой индекс.
+
+        Args:
+            horizon (int): количество ночей вперёд. по умолчанию DEFAULT_HORIZON.
+            max_age (float): время жизни индекса в секундах. по умолчанию DEFAULT_MAX_AGE.
+        """
+        self.horizon = horizon
+        self.max_age = max_age
+        self.origin = None
+        self.built_at = None
+        self.room_ids = []
+        self.positions = {}
+        self.busy = np.zeros((0, horizon), dtype=bool)
+        self.spans = {}
+        self._lock = RLock()
+        self._builds = 0
+        self._journal = None
+
+    @property
+    def is_built(self) -> bool:
+        """Проверить, построен ли индекс.
+
+        Returns:
+            bool: истина/ложь
+        """
+        return self.origin is not None
+
+    def build(self) -> None:
+        """Построить индекс по базе данных одним проходом по броням.
+
+        Изменения, пришедшие от сигналов во время чтения базы, записываются
+        в журнал и повторяются на новой матрице после замены, поэтому
+        перестроение их не теряет. Повтор безопасен для уже учтённых
+        изменений.
+        """
+        with self._lock:
+            self._builds += 1
+            if self._journal is None:
+                self._journal = []
+        try:
+            self._build()
+        finally:
+            with self._lock:
+                self._builds -= 1
+                if not self._builds:
+                    self._journal = None
+
+    def _build(self) -> None:
+        """Прочитать базу данных, заменить матрицу и повторить журнал."""
+        origin = timezone.localdate()
+        horizon_end = origin + timedelta(days=self.horizon)
+        room_ids = list(Room.objects.order_by().values_list('id', flat=True))
+        positions = {room_id: row for row, room_id in enumerate(room_ids)}
+        reserves = Reserve.objects.order_by().filter(
+            start_date__lt=horizon_end, end_date__gt=origin,
+        ).values_list('id', 'room_id', 'start_date', 'end_date')
+
+        spans = {}
+        rows, starts, ends = [], [], []
+        for reserve_id, room_id, start_date, end_date in reserves.iterator(chunk_size=CHUNK_SIZE):
+            # номер мог появиться между запросами номеров и броней, тогда его строка добавляется здесь
+            if room_id not in positions:
+                positions[room_id] = len(room_ids)
+                room_ids.append(room_id)
+            spans[reserve_id] = (room_id, start_date, end_date)
+            rows.append(positions[room_id])
+            starts.append((start_date - origin).days)
+            ends.append((end_date - origin).days)
+
+        # разностный массив: +1 в день заезда, -1 в день выезда, затем накопленная сумма
+        diff = np.zeros((len(room_ids), self.horizon + 1), dtype=np.int32)
+        rows = np.asarray(rows, dtype=np.intp)
+        np.add.at(diff, (rows, np.clip(np.asarray(starts, dtype=np.intp), 0, self.horizon)), 1)
+        np.add.at(diff, (rows, np.clip(np.asarray(ends, dtype=np.intp), 0, self.horizon)), -1)
+        busy = np.cumsum(diff, axis=1)[:, :self.horizon] > 0
+
+        with self._lock:
+            self.origin = origin
+            self.built_at = monotonic()
+            self.room_ids = room_ids
+            self.positions = positions
+            self.busy = busy
+            self.spans = spans
+            for change in self._journal:
+                change()
+
+    def ensure_fresh(self) -> None:
+        """Перестроить индекс, если он не построен, устарел или сменились сутки."""
+        if not self.is_built or self.origin != timezone.localdate() or monotonic() - self.built_at > self.max_age:
+            self.build()
+
+    def _window(self, start_date: date, end_date: date) -> Optional[slice]:
+        """Получить срез столбцов для полуинтервала.
+
+        Args:
+            start_date (date): дата заезда
+            end_date (date): дата выезда
+
+        Returns:
+            Optional[slice]: срез или None, если полуинтервал вне горизонта
+        """
+        start = (start_date - self.origin).days
+        end = (end_date - self.origin).days
+        if start < 0 or end > self.horizon or end <= start:
+            return None
+        return slice(start, end)
+
+    def free_room_ids(self, start_date: date, end_date: date) -> Optional[list]:
+        """Получить id номеров, свободных все ночи полуинтервала.
+
+        Args:
+            start_date (date): дата заезда
+            end_date (date): дата выезда
+
+        Returns:
+            Optional[list]: id номеров или None, если ответить по индексу нельзя
+        """
+        self.ensure_fresh()
+        with self._lock:
+            window = self._window(start_date, end_date)
+            if window is None:
+                return None
+            free_rows = np.flatnonzero(~self.busy[:, window].any(axis=1))
+            return [self.room_ids[row] for row in free_rows]
+
+    def is_free(self, room_id: Any, start_date: date, end_date: date) -> Optional[bool]:
+        """Проверить, свободен ли номер все ночи полуинтервала.
+
+        Args:
+            room_id (Any): id номера
+            start_date (date): дата заезда
+            end_date (date): дата выезда
+
+        Returns:
+            Optional[bool]: истина/ложь или None, если ответить по индексу нельзя
+        """
+        self.ensure_fresh()
+        with self._lock:
+            window = self._window(start_date, end_date)
+            row = self.positions.get(room_id)
+            if window is None or row is None:
+                return None
+            return not self.busy[row, window].any()
+
+    def _stamp(self, room_id: Any, start_date: date, end_date: date, value: bool) -> None:
+        """Отметить ночи номера занятыми или свободными.
+
+        Args:
+            room_id (Any): id номера
+            start_date (date): дата заезда
+            end_date (date): дата выезда
+            value (bool): занятость
+        """
+        row = self.positions.get(room_id)
+        if row is None:
+            return
+        start = max((start_date - self.origin).days, 0)
+        end = min((end_date - self.origin).days, self.horizon)
+        if start < end:
+            self.busy[row, start:end] = value
+
+    def _log(self, change: partial) -> None:
+        """Применить изменение и записать его в журнал идущего перестроения.
+
+        Args:
+            change (partial): изменение
+        """
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append(change)
+            change()
+
+    def reserve_saved(self, reserve_id: Any, room_id: Any, start_date: date, end_date: date) -> None:
+        """Учесть созданную или изменённую бронь.
+
+        Args:
+            reserve_id (Any): id брони
+            room_id (Any): id номера
+            start_date (date): дата заезда
+            end_date (date): дата выезда
+        """
+        self._log(partial(self._save_reserve, reserve_id, room_id, start_date, end_date))
+
+    def reserve_deleted(self, reserve_id: Any) -> None:
+        """Учесть удалённую бронь.
+
+        Args:
+            reserve_id (Any): id брони
+        """
+        self._log(partial(self._delete_reserve, reserve_id))
+
+    def room_added(self, room_id: Any) -> None:
+        """Добавить строку для нового номера.
+
+        Args:
+            room_id (Any): id номера
+        """
+        self.rooms_added([room_id])
+
+    def rooms_added(self, room_ids: list) -> None:
+        """Добавить строки для новых номеров одним расширением матрицы.
+
+        Args:
+            room_ids (list): id номеров
+        """
+        self._log(partial(self._add_rooms, list(room_ids)))
+
+    def room_deleted(self, room_id: Any) -> None:
+        """Удалить строку номера.
+
+        Args:
+            room_id (Any): id номера
+        """
+        self._log(partial(self._delete_room, room_id))
+
+    def _save_reserve(self, reserve_id: Any, room_id: Any, start_date: date, end_date: date) -> None:
+        """Отметить ночи брони занятыми.
+
+        Брони одного номера не пересекаются, поэтому старые ночи брони
+        можно просто освободить.
+
+        Args:
+            reserve_id (Any): id брони
+            room_id (Any): id номера
+            start_date (date): дата заезда
+            end_date (date): дата выезда
+        """
+        if not self.is_built:
+            return
+        self._delete_reserve(reserve_id)
+        self.spans[reserve_id] = (room_id, start_date, end_date)
+        self._stamp(room_id, start_date, end_date, True)
+
+    def _delete_reserve(self, reserve_id: Any) -> None:
+        """Освободить ночи брони.
+
+        Args:
+            reserve_id (Any): id брони
+        """
+        span = self.spans.pop(reserve_id, None)
+        if self.is_built and span:
+            self._stamp(*span, False)
+
+    def _add_rooms(self, room_ids: list) -> None:
+        """Добавить свободные строки номеров, которых ещё нет в матрице.
+
+        Args:
+            room_ids (list): id номеров
+        """
+        if not self.is_built:
+            return
+        new_ids = [room_id for room_id in dict.fromkeys(room_ids) if room_id not in self.positions]
+        if not new_ids:
+            return
+        for room_id in new_ids:
+            self.positions[room_id] = len(self.room_ids)
+            self.room_ids.append(room_id)
+        self.busy = np.vstack((self.busy, np.zeros((len(new_ids), self.horizon), dtype=bool)))
+
+    def _delete_room(self, room_id: Any) -> None:
+        """Удалить строку номера.
+
+        Args:
+            room_id (Any): id номера
+        """
+        row = self.positions.pop(room_id, None)
+        if row is None:
+            return
+        self.room_ids.pop(row)
+        self.busy = np.delete(self.busy, row, axis=0)
+        self.positions = {room: position for position, room in enumerate(self.room_ids)}
+
+
+index = AvailabilityIndex(
+    horizon=getattr(settings, 'AVAILABILITY_INDEX_HORIZON', DEFAULT_HORIZON),
+    max_age=getattr(settings, 'AVAILABILITY_INDEX_MAX_AGE', DEFAULT_MAX_AGE),
+)
@@ -0,0 +1,337 @@
+"""Модуль для замера страниц и REST API на сгенерированных данных.
+
+Запросы идут через тестовый клиент, поэтому в замер входят middleware,
+шаблоны и сериализаторы. Для каждой ссылки из hotel_app/urls.py считаются
+перцентили времени ответа, количество SQL-запросов и время в базе данных,
+а отчёт сравнивается с сохранённым базовым.
+"""
+
+from datetime import date, timedelta
+from itertools import cycle
+from statistics import fmean, quantiles
+from time import perf_counter
+from typing import Callable, NamedTuple, Optional
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import analytics
+from .models import (Address, Client, Hotel, HotelService, Reserve, Room,
+                     Service, class_types)
+
+CLIENTS = 100
+SERVICES = 5
+NIGHTS = 2
+# брони сгенерированных данных начинаются через FIRST_DAY дней, а брони замера - через FREE_DAY
+FIRST_DAY = 30
+FREE_DAY = 3000
+# простое число: подряд идущие запросы обходят разные отели и номера
+STRIDE = 7919
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+USERNAME = 'bench'
+
+
+class Dataset(NamedTuple):
+    """Сгенерированные данные для замера."""
+
+    hotels: list[Hotel]
+    rooms: list[Room]
+    services: list[Service]
+    client: Client
+    today: date
+
+
+class Endpoint(NamedTuple):
+    """Замеряемая ссылка: запрос строится до начала замера, поэтому может создать нужные ему объекты."""
+
+    name: str
+    method: str
+    request: Callable[[Dataset, int], tuple[str, dict]]
+    content_type: Optional[str] = None
+
+
+def seed(hotels: int, rooms: int, reserves: int) -> Dataset:
+    """Заполнить базу данных отелями, номерами и бронями.
+
+    Args:
+        hotels (int): количество отелей
+        rooms (int): номеров в отеле
+        reserves (int): броней на номер
+
+    Returns:
+        Dataset: данные
+    """
+    addresses = Address.objects.bulk_create(
+        Address(city=f'city {number % 20}', street='street', number=number + 1) for number in range(hotels)
+    )
+    hotel_objects = Hotel.objects.bulk_create(
+        Hotel(name=f'hotel {number}', rating=number % 5 + 1, hotel_address=address)
+        for number, address in enumerate(addresses)
+    )
+    services = Service.objects.bulk_create(Service(name=f'service {number}') for number in range(SERVICES))
+    HotelService.objects.bulk_create(
+        HotelService(hotel=hotel, service=service, cost=5) for hotel in hotel_objects for service in services
+    )
+    categories = [category for category, _ in class_types]
+    room_objects = Room.objects.bulk_create(
+        Room(category=categories[number % len(categories)], floor=number // 10 + 1, number=number + 1,
+             cost=10 + number % 10 * 5, hotel=hotel)
+        for hotel in hotel_objects for number in range(rooms)
+    )
+    users = User.objects.bulk_create(User(username=f'guest {number}') for number in range(CLIENTS))
+    clients = Client.objects.bulk_create(Client(user=user, money=1000) for user in users)
+    today = date.today()
+    owners = cycle(clients)
+    Reserve.objects.bulk_create(
+        Reserve(
+            user=next(owners), room=room, price=room.cost * NIGHTS,
+            start_date=today + timedelta(days=FIRST_DAY + number * (NIGHTS + 1)),
+            end_date=today + timedelta(days=FIRST_DAY + number * (NIGHTS + 1) + NIGHTS),
+        )
+        for room in room_objects for number in range(reserves)
+    )
+    Client.objects.refresh_summaries()
+    Hotel.objects.refresh_search([hotel.id for hotel in hotel_objects])
+    analytics.rebuild()
+    user = User.objects.create_superuser(username=USERNAME, password=USERNAME)
+    client = Client.objects.create(user=user, money=10 ** 9)
+    return Dataset(hotel_objects, room_objects, services, client, today)
+
+
+def free_dates(dataset: Dataset, number: int) -> tuple[date, date]:
+    """Получить даты брони замера, не пересекающиеся с другими.
+
+    Args:
+        dataset (Dataset): данные
+        number (int): номер запроса
+
+    Returns:
+        tuple[date, date]: дата заезда и дата выезда
+    """
+    start = dataset.today + timedelta(days=FREE_DAY + number * NIGHTS)
+    return start, start + timedelta(days=NIGHTS)
+
+
+def period(dataset: Dataset, days: int = 30) -> dict:
+    """Получить параметры периода с занятыми номерами.
+
+    Args:
+        dataset (Dataset): данные
+        days (int): длина периода. по умолчанию 30.
+
+    Returns:
+        dict: параметры start и end
+    """
+    start = dataset.today + timedelta(days=FIRST_DAY)
+    return {'start': start.isoformat(), 'end': (start + timedelta(days=days)).isoformat()}
+
+
+def pick(objects: list, number: int):
+    """Выбрать объект по номеру запроса.
+
+    Args:
+        objects (list): объекты
+        number (int): номер запроса
+
+    Returns:
+        _type_: объект
+    """
+    return objects[number * STRIDE % len(objects)]
+
+
+def search(dataset: Dataset, number: int) -> tuple[str, dict]:
+    """Запрос поиска свободных номеров.
+
+    Args:
+        dataset (Dataset): данные
+        number (int): номер запроса
+
+    Returns:
+        tuple[str, dict]: ссылка и параметры
+    """
+    dates = period(dataset, 3)
+    return reverse('book_by_date'), {'start_date': dates['start'], 'end_date': dates['end']}
+
+
+def book(dataset: Dataset, number: int) -> tuple[str, dict]:
+    """Запрос брони через страницу бронирования.
+
+    Args:
+        dataset (Dataset): данные
+        number (int): номер запроса
+
+    Returns:
+        tuple[str, dict]: ссылка и данные формы
+    """
+    start, end = free_dates(dataset, number)
+    url = f"{reverse('reserve')}?id={dataset.rooms[0].id}"
+    return url, {'start_date': start.isoformat(), 'end_date': end.isoformat()}
+
+
+def cancel(dataset: Dataset, number: int) -> tuple[str, dict]:
+    """Создать бронь и получить запрос её отмены.
+
+    Args:
+        dataset (Dataset): данные
+        number (int): номер запроса
+
+    Returns:
+        tuple[str, dict]: ссылка и параметры
+    """
+    start, end = free_dates(dataset, number)
+    reserve = Reserve.objects.create(
+        user=dataset.client, room=dataset.rooms[1], start_date=start, end_date=end, price=dataset.rooms[1].cost,
+    )
+    return reverse('delete_reserve'), {'id': reserve.id}
+
+
+def book_batch(dataset: Dataset, number: int) -> tuple[str, dict]:
+    """Запрос пакета из одной брони через REST API.
+
+    Args:
+        dataset (Dataset): данные
+        number (int): номер запроса
+
+    Returns:
+        tuple[str, dict]: ссылка и тело запроса
+    """
+    start, end = free_dates(dataset, number)
+    item = {
+        'room': str(dataset.rooms[2].id), 'user': str(dataset.client.id),
+        'start_date': start.isoformat(), 'end_date': end.isoformat(),
+    }
+    return reverse('reserve-batch'), {'reserves': [item]}
+
+
+ENDPOINTS = (
+    Endpoint('homepage', 'get', lambda dataset, number: (reverse('homepage'), {})),
+    Endpoint('hotel', 'get', lambda dataset, number: (reverse('hotel'), {'id': pick(dataset.hotels, number).id})),
+    Endpoint('room', 'get', lambda dataset, number: (reverse('room'), {'id': pick(dataset.rooms, number).id})),
+    Endpoint('book_by_date', 'get', search),
+    Endpoint('search', 'get', lambda dataset, number: (reverse('search'), {'q': pick(dataset.hotels, number).name})),
+    Endpoint('reserve page', 'get', lambda dataset, number: (reverse('reserve'), {
+        'id': pick(dataset.rooms, number).id,
+    })),
+    Endpoint('reserve', 'post', book),
+    Endpoint('delete_reserve', 'get', cancel),
+    Endpoint('profile', 'get', lambda dataset, number: (reverse('profile'), {})),
+    Endpoint('register', 'get', lambda dataset, number: (reverse('register'), {})),
+    Endpoint('login', 'get', lambda dataset, number: (reverse('login'), {})),
+    Endpoint('rest hotels', 'get', lambda dataset, number: (reverse('hotel-list'), {})),
+    Endpoint('rest hotel', 'get', lambda dataset, number: (
+        reverse('hotel-detail', args=[pick(dataset.hotels, number).id]), {},
+    )),
+    Endpoint('rest hotel search', 'get', lambda dataset, number: (
+        reverse('hotel-search'), {'q': pick(dataset.hotels, number).name},
+    )),
+    Endpoint('rest services', 'get', lambda dataset, number: (reverse('service-list'), {})),
+    Endpoint('rest rooms', 'get', lambda dataset, number: (reverse('room-list'), {})),
+    Endpoint('rest reserves', 'get', lambda dataset, number: (reverse('reserve-list'), {})),
+    Endpoint('rest reserve batch', 'post', book_batch, 'application/json'),
+    Endpoint('rest availability', 'get', lambda dataset, number: (reverse('availability'), period(dataset, 3))),
+    Endpoint('rest autocomplete', 'get', lambda dataset, number: (
+        reverse('autocomplete'), {'q': pick(dataset.hotels, number).name[:3]},
+    )),
+    Endpoint('rest quote', 'get', lambda dataset, number: (reverse('quote'), {
+        'room': pick(dataset.rooms, number).id, **period(dataset, 3),
+    })),
+    Endpoint('rest analytics', 'get', lambda dataset, number: (reverse('analytics'), period(dataset))),
+    Endpoint('rest export', 'get', lambda dataset, number: (reverse('export_reserves'), period(dataset))),
+    Endpoint('rest db pool', 'get', lambda dataset, number: (reverse('db_pool'), {})),
+)
+
+
+def measure(
+    endpoint: Endpoint, dataset: Dataset, client: TestClient, requests: int, warmup: int,
+) -> dict:
+    """Замерить ссылку.
+
+    Args:
+        endpoint (Endpoint): ссылка
+        dataset (Dataset): данные
+        client (TestClient): клиент с вошедшим пользователем
+        requests (int): количество замеряемых запросов
+        warmup (int): количество запросов до замера
+
+    Raises:
+        RuntimeError: ссылка ответила ошибкой
+
+    Returns:
+        dict: перцентили в миллисекундах, SQL-запросы и время в базе данных на запрос
+    """
+    timings, queries, query_ms = [], [], []
+    for number in range(warmup + requests):
+        url, data = endpoint.request(dataset, number)
+        send = getattr(client, endpoint.method)
+        options = {'content_type': endpoint.content_type} if endpoint.content_type else {}
+        with CaptureQueriesContext(connection) as captured:
+            start = perf_counter()
+            response = send(url, data, **options)
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+            elapsed = (perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f'{endpoint.name}: {endpoint.method.upper()} {url} -> {response.status_code}')
+        if number >= warmup:
+            timings.append(elapsed)
+            queries.append(len(captured))
+            query_ms.append(sum(float(query['time']) for query in captured.captured_queries) * 1000)
+    percentiles = quantiles(timings, n=100)
+    return {
+        'method': endpoint.method.upper(),
+        'requests': requests,
+        'p50_ms': round(percentiles[49], 3),
+        'p95_ms': round(percentiles[94], 3),
+        'p99_ms': round(percentiles[98], 3),
+        'queries': round(fmean(queries), 2),
+        'query_ms': round(fmean(query_ms), 3),
+    }
+
+
+def run(dataset: Dataset, requests: int, warmup: int, names: Optional[set[str]] = None) -> dict:
+    """Замерить все ссылки или выбранные.
+
+    Args:
+        dataset (Dataset): данные
+        requests (int): количество замеряемых запросов на ссылку
+        warmup (int): количество запросов до замера
+        names (Optional[set[str]]): имена ссылок. по умолчанию None.
+
+    Returns:
+        dict: результаты по именам ссылок
+    """
+    client = TestClient()
+    client.force_login(dataset.client.user)
+    return {
+        endpoint.name: measure(endpoint, dataset, client, requests, warmup)
+        for endpoint in ENDPOINTS if names is None or endpoint.name in names
+    }
+
+
+def regressions(report: dict, baseline: dict, metric: str, max_slowdown: float, max_extra_queries: float) -> list[str]:
+    """Сравнить отчёт с базовым.
+
+    Args:
+        report (dict): результаты по ссылкам
+        baseline (dict): базовые результаты по ссылкам
+        metric (str): перцентиль из METRICS
+        max_slowdown (float): допустимое замедление в процентах
+        max_extra_queries (float): допустимый рост SQL-запросов на запрос
+
+    Returns:
+        list[str]: описания регрессий
+    """
+    found = []
+    for name, result in report.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = base[metric] * (1 + max_slowdown / 100)
+        if result[metric] > limit:
+            found.append(f'{name}: {metric} {result[metric]} > {base[metric]} +{max_slowdown}%')
+        if result['queries'] > base['queries'] + max_extra_queries:
+            found.append(f"{name}: queries {result['queries']} > {base['queries']} +{max_extra_queries}")
+    return found
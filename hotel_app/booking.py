@@ -0,0 +1,294 @@
+"""Модуль для бронирования номеров."""
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from functools import partial
+from time import sleep
+from typing import Any, Iterable, NamedTuple, Optional
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F
+
+from . import analytics, pricing
+from .availability_index import index
+from .models import (RESERVE_EXIST, ROOM_NOT_EXIST, Client, Reserve,
+                     ReserveService, Room)
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 0.05
+# serialization_failure и deadlock_detected
+RETRY_SQLSTATES = frozenset(('40001', '40P01'))
+# exclusion_violation: бронь, вставленная параллельно без блокировки номера
+BATCH_RETRY_SQLSTATES = RETRY_SQLSTATES | {'23P01'}
+INSUFFICIENT_FUNDS = 'Недостаточно средств! текущая цена:{price} у вас на счету: {money}'
+CLIENT_NOT_EXIST = 'Клиента не существует'
+SERVICE_NOT_IN_HOTEL = 'Услуги нет в отеле номера'
+BATCH_ABORTED = 'Пакет не сохранён из-за ошибок в других бронях'
+NON_FIELD_ERRORS = 'non_field_errors'
+
+
+class BatchResult(NamedTuple):
+    """Результат брони из пакета: созданная бронь или ошибки."""
+
+    reserve: Optional[Reserve]
+    errors: dict
+
+
+def get_sqlstate(error: Exception) -> str:
+    """Получить код ошибки Postgres.
+
+    Args:
+        error (Exception): ошибка базы данных
+
+    Returns:
+        str: код ошибки
+    """
+    cause = error.__cause__
+    return getattr(cause, 'pgcode', None) or getattr(cause, 'sqlstate', None)
+
+
+def book_room(
+    client: Client, room: Room, start_date: date, end_date: date, service_ids: Iterable[Any] = (),
+) -> Reserve:
+    """Забронировать номер, повторяя попытку при конфликте сериализации.
+
+    Args:
+        client (Client): клиент
+        room (Room): номер
+        start_date (date): дата заезда
+        end_date (date): дата выезда
+        service_ids (Iterable[Any]): id услуг отеля. по умолчанию ().
+
+    Raises:
+        OperationalError: не удалось выполнить транзакцию
+
+    Returns:
+        Reserve: бронь
+    """
+    service_ids = list(service_ids)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return _book_room(client, room, start_date, end_date, service_ids)
+        except OperationalError as error:
+            if attempt == MAX_ATTEMPTS or get_sqlstate(error) not in RETRY_SQLSTATES:
+                raise
+            sleep(RETRY_DELAY * attempt)
+
+
+def _book_room(client: Client, room: Room, start_date: date, end_date: date, service_ids: list[Any]) -> Reserve:
+    """Забронировать номер в одной транзакции.
+
+    Строка номера блокируется, поэтому конкурентные брони одного номера
+    проверяют пересечения по очереди. Средства списываются условным UPDATE,
+    который не даёт балансу уйти в минус.
+
+    Args:
+        client (Client): клиент
+        room (Room): номер
+        start_date (date): дата заезда
+        end_date (date): дата выезда
+        service_ids (list[Any]): id услуг отеля
+
+    Raises:
+        ValidationError: бронь невозможна
+
+    Returns:
+        Reserve: бронь
+    """
+    with transaction.atomic():
+        room = Room.objects.select_for_update().get(pk=room.pk)
+        price = pricing.quote(room, start_date, end_date, service_ids)
+        reserve = Reserve(user=client, room=room, start_date=start_date, end_date=end_date, price=price)
+
+        debited = Client.objects.filter(pk=client.pk, money__gte=price).update(money=F('money') - price)
+        if not debited:
+            money = Client.objects.values_list('money', flat=True).get(pk=client.pk)
+            raise ValidationError(INSUFFICIENT_FUNDS.format(price=price, money=money))
+        try:
+            with transaction.atomic():
+                reserve.save()
+        except IntegrityError as error:
+            raise ValidationError(RESERVE_EXIST) from error
+        ReserveService.objects.bulk_create(
+            ReserveService(reserve=reserve, service_id=service_id) for service_id in service_ids
+        )
+    return reserve
+
+
+def cancel_reserve(reserve: Reserve) -> Decimal:
+    """Отменить бронь и вернуть деньги клиенту в одной транзакции.
+
+    Бронь блокируется перед возвратом, поэтому из параллельных отмен одной
+    брони деньги вернёт только первая, а остальные не найдут брони.
+
+    Args:
+        reserve (Reserve): бронь
+
+    Raises:
+        DoesNotExist: бронь уже отменена
+
+    Returns:
+        Decimal: возвращённая сумма
+    """
+    with transaction.atomic():
+        locked = Reserve.objects.select_for_update(of=('self',)).select_related('room').filter(pk=reserve.pk).first()
+        if locked is None:
+            raise Reserve.DoesNotExist(f'reserve {reserve.pk} is already cancelled')
+        price = locked.price or 0
+        Client.objects.filter(pk=locked.user_id).update(money=F('money') + price)
+        locked.delete()
+    return price
+
+
+def book_batch(items: list[dict], all_or_none: bool = False) -> list[BatchResult]:
+    """Создать пакет броней в одной транзакции, повторяя попытку при конфликте.
+
+    Args:
+        items (list[dict]): брони: room, user, start_date, end_date, services
+        all_or_none (bool): не сохранять ничего, если хоть одна бронь отклонена. по умолчанию False.
+
+    Raises:
+        OperationalError: не удалось выполнить транзакцию
+        IntegrityError: не удалось выполнить транзакцию
+
+    Returns:
+        list[BatchResult]: результаты в порядке броней
+    """
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            return _book_batch(items, all_or_none)
+        except (OperationalError, IntegrityError) as error:
+            if attempt == MAX_ATTEMPTS or get_sqlstate(error) not in BATCH_RETRY_SQLSTATES:
+                raise
+            sleep(RETRY_DELAY * attempt)
+
+
+def busy_intervals(room_ids: Iterable[Any], start_date: date, end_date: date) -> dict[Any, list[tuple[date, date]]]:
+    """Получить одним запросом занятые полуинтервалы номеров в окне дат.
+
+    Args:
+        room_ids (Iterable[Any]): id номеров
+        start_date (date): начало окна
+        end_date (date): конец окна
+
+    Returns:
+        dict[Any, list[tuple[date, date]]]: отсортированные полуинтервалы по номерам
+    """
+    busy = defaultdict(list)
+    rows = Reserve.objects.filter(room__in=room_ids, start_date__lt=end_date, end_date__gt=start_date).order_by(
+        'room', 'start_date',
+    ).values_list('room_id', 'start_date', 'end_date')
+    for room_id, start, end in rows:
+        busy[room_id].append((start, end))
+    return busy
+
+
+def overlaps(intervals: list[tuple[date, date]], start_date: date, end_date: date) -> bool:
+    """Проверить пересечение с отсортированными непересекающимися полуинтервалами.
+
+    Из полуинтервалов, начавшихся до end_date, последний заканчивается
+    позже всех, поэтому достаточно проверить только его.
+
+    Args:
+        intervals (list[tuple[date, date]]): полуинтервалы
+        start_date (date): дата заезда
+        end_date (date): дата выезда
+
+    Returns:
+        bool: истина/ложь
+    """
+    position = bisect_left(intervals, (end_date,))
+    return position > 0 and intervals[position - 1][1] > start_date
+
+
+def batch_errors(item: dict, rooms: dict, clients: set, busy: dict) -> dict:
+    """Получить ошибки брони из пакета.
+
+    Args:
+        item (dict): бронь
+        rooms (dict): номера по id
+        clients (set): id клиентов
+        busy (dict): занятые полуинтервалы по номерам
+
+    Returns:
+        dict: ошибки по полям
+    """
+    room = rooms.get(item['room'])
+    if room is None:
+        return {'room': [ROOM_NOT_EXIST]}
+    if item['user'] not in clients:
+        return {'user': [CLIENT_NOT_EXIST]}
+    if not set(item['services']) <= {service.id for service in pricing.hotel_services(room.hotel_id)}:
+        return {'services': [SERVICE_NOT_IN_HOTEL]}
+    if overlaps(busy[room.id], item['start_date'], item['end_date']):
+        return {NON_FIELD_ERRORS: [RESERVE_EXIST]}
+    return {}
+
+
+def _book_batch(items: list[dict], all_or_none: bool) -> list[BatchResult]:
+    """Создать пакет броней в одной транзакции.
+
+    Номера пакета блокируются в порядке id, брони этих номеров в окне дат
+    пакета читаются одним запросом, а пересечения с ними и внутри пакета
+    ищутся в памяти по отсортированным полуинтервалам. Бронь раньше в
+    пакете имеет приоритет.
+
+    Args:
+        items (list[dict]): брони
+        all_or_none (bool): не сохранять ничего, если хоть одна бронь отклонена
+
+    Returns:
+        list[BatchResult]: результаты в порядке броней
+    """
+    if not items:
+        return []
+    with transaction.atomic():
+        rooms = Room.objects.select_for_update().filter(id__in={item['room'] for item in items}).order_by('id')
+        rooms = {room.id: room for room in rooms.only('id', 'cost', 'hotel_id')}
+        clients = set(Client.objects.filter(id__in={item['user'] for item in items}).values_list('id', flat=True))
+        busy = busy_intervals(
+            rooms, min(item['start_date'] for item in items), max(item['end_date'] for item in items),
+        )
+        results = []
+        for item in items:
+            errors = batch_errors(item, rooms, clients, busy)
+            reserve = None
+            if not errors:
+                insort(busy[item['room']], (item['start_date'], item['end_date']))
+                reserve = Reserve(
+                    user_id=item['user'], room_id=item['room'], start_date=item['start_date'],
+                    end_date=item['end_date'],
+                    price=pricing.quote(rooms[item['room']], item['start_date'], item['end_date'], item['services']),
+                )
+            results.append(BatchResult(reserve, errors))
+        if all_or_none and any(result.errors for result in results):
+            return [BatchResult(None, result.errors or {NON_FIELD_ERRORS: [BATCH_ABORTED]}) for result in results]
+        created = [(result.reserve, item) for result, item in zip(results, items) if result.reserve is not None]
+        Reserve.objects.bulk_create(reserve for reserve, _ in created)
+        ReserveService.objects.bulk_create(
+            ReserveService(reserve=reserve, service_id=service_id)
+            for reserve, item in created for service_id in item['services']
+        )
+        reserves_created([reserve for reserve, _ in created], rooms)
+    return results
+
+
+def reserves_created(reserves: list[Reserve], rooms: dict) -> None:
+    """Сделать для созданных bulk_create броней то же, что сигналы делают для одной.
+
+    Args:
+        reserves (list[Reserve]): брони
+        rooms (dict): номера броней по id
+    """
+    for client_id in {reserve.user_id for reserve in reserves}:
+        Client.objects.refresh_summary(client_id)
+    for reserve in reserves:
+        transaction.on_commit(partial(
+            index.reserve_saved, reserve.id, reserve.room_id, reserve.start_date, reserve.end_date,
+        ))
+        analytics.schedule_refresh(
+            analytics.Window(rooms[reserve.room_id].hotel_id, reserve.start_date, reserve.end_date),
+        )
@@ -0,0 +1,69 @@
+"""Модуль для метрик постоянных соединений с базой данных.
+
+Django 4.1 не держит пул соединений: при CONN_MAX_AGE > 0 каждый поток
+переиспользует своё соединение между запросами, а новое открывается после
+CONN_MAX_AGE секунд или неудачной проверки здоровья. Счётчики процесса
+показывают, сколько запросов обошлись без нового соединения.
+"""
+
+from collections import Counter
+from threading import Lock
+
+from django.db import connections
+
+stats = Counter()
+# счётчики увеличивают потоки многопоточного сервера, а += у Counter не атомарен
+_lock = Lock()
+
+
+def count(name: str) -> None:
+    """Увеличить счётчик процесса.
+
+    Args:
+        name (str): 'requests' или 'connections'
+    """
+    with _lock:
+        stats[name] += 1
+
+
+def counts() -> tuple[int, int]:
+    """Получить согласованные счётчики запросов и соединений.
+
+    Returns:
+        tuple[int, int]: запросы и соединения
+    """
+    with _lock:
+        return stats['requests'], stats['connections']
+
+
+def reuse_ratio() -> float:
+    """Получить долю запросов, обслуженных без открытия соединения.
+
+    Returns:
+        float: доля от 0 до 1
+    """
+    requests, opened = counts()
+    if not requests:
+        return 0.0
+    return max(0.0, 1 - opened / requests)
+
+
+def snapshot(alias: str = 'default') -> dict:
+    """Получить метрики соединений процесса и настройки базы данных.
+
+    Args:
+        alias (str): база данных. по умолчанию 'default'.
+
+    Returns:
+        dict: метрики и настройки
+    """
+    settings_dict = connections[alias].settings_dict
+    requests, opened = counts()
+    return {
+        'requests': requests,
+        'connections': opened,
+        'reuse_ratio': reuse_ratio(),
+        'conn_max_age': settings_dict['CONN_MAX_AGE'],
+        'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+        'server_side_cursors': not settings_dict.get('DISABLE_SERVER_SIDE_CURSORS', False),
+    }
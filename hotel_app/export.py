@@ -0,0 +1,195 @@
+"""Модуль для потоковой выгрузки бронирований в CSV и NDJSON.
+
+Бронирования читаются курсором на стороне сервера через iterator(), а
+строки сразу превращаются в байты, так что память не зависит от размера
+выгрузки. Услуги брони собираются подзапросом ARRAY, без запроса на
+каждую строку.
+"""
+
+import csv
+import zlib
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db.models import OuterRef, QuerySet
+
+from .fastpath import render_json
+from .models import Reserve, ReserveService
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+FORMATS = (CSV, NDJSON)
+CONTENT_TYPES = {CSV: 'text/csv; charset=utf-8', NDJSON: 'application/x-ndjson'}
+GZIP_CONTENT_TYPE = 'application/gzip'
+DEFAULT_CHUNK_SIZE = 2000
+SERVICES_SEPARATOR = ';'
+# 16 + MAX_WBITS: zlib пишет заголовок и контрольную сумму gzip
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+COLUMNS = (
+    'id', 'created', 'start_date', 'end_date', 'nights', 'hotel_id', 'hotel', 'room_id', 'room_number',
+    'category', 'client_id', 'client', 'price', 'services',
+)
+FIELDS = (
+    'id', 'created', 'start_date', 'end_date', 'room__hotel_id', 'room__hotel__name', 'room_id', 'room__number',
+    'room__category', 'user_id', 'user__user__username', 'price', 'services_names',
+)
+
+
+def chunk_size() -> int:
+    """Получить количество строк, читаемых курсором за раз.
+
+    Returns:
+        int: строки
+    """
+    return getattr(settings, 'EXPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def reserves(start: Optional[date] = None, end: Optional[date] = None, hotel: Any = None) -> QuerySet:
+    """Получить бронирования для выгрузки.
+
+    Бронь попадает в период по дате заезда, поэтому соседние периоды не
+    пересекаются и выручка не считается дважды.
+
+    Args:
+        start (Optional[date]): первый день заезда. по умолчанию None.
+        end (Optional[date]): день после последнего дня заезда. по умолчанию None.
+        hotel (Any): id отеля. по умолчанию None.
+
+    Returns:
+        QuerySet: строки values_list в порядке заезда
+    """
+    queryset = Reserve.objects.all()
+    if start is not None:
+        queryset = queryset.filter(start_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(start_date__lt=end)
+    if hotel is not None:
+        queryset = queryset.filter(room__hotel_id=hotel)
+    services = ReserveService.objects.filter(reserve=OuterRef('pk')).order_by('service__name')
+    return queryset.annotate(
+        services_names=ArraySubquery(services.values('service__name')),
+    ).order_by('start_date', 'id').values_list(*FIELDS)
+
+
+def rows(queryset: QuerySet) -> Iterator[dict]:
+    """Читать бронирования курсором на стороне сервера.
+
+    Args:
+        queryset (QuerySet): строки из reserves()
+
+    Yields:
+        Iterator[dict]: строки выгрузки
+    """
+    for values in queryset.iterator(chunk_size=chunk_size()):
+        row = dict(zip(FIELDS, values))
+        yield {
+            'id': row['id'],
+            'created': row['created'],
+            'start_date': row['start_date'],
+            'end_date': row['end_date'],
+            'nights': (row['end_date'] - row['start_date']).days,
+            'hotel_id': row['room__hotel_id'],
+            'hotel': row['room__hotel__name'],
+            'room_id': row['room_id'],
+            'room_number': row['room__number'],
+            'category': row['room__category'],
+            'client_id': row['user_id'],
+            'client': row['user__user__username'],
+            # строка, чтобы деньги не превращались во float
+            'price': str(row['price'] if row['price'] is not None else Decimal(0)),
+            'services': row['services_names'],
+        }
+
+
+class Line:
+    """Буфер для csv.writer, который возвращает записанную строку."""
+
+    def write(self, value: str) -> str:
+        """Вернуть строку вместо записи.
+
+        Args:
+            value (str): строка
+
+        Returns:
+            str: строка
+        """
+        return value
+
+
+def csv_lines(data: Iterable[dict]) -> Iterator[bytes]:
+    """Получить строки CSV с заголовком.
+
+    Args:
+        data (Iterable[dict]): строки выгрузки
+
+    Yields:
+        Iterator[bytes]: строки CSV
+    """
+    writer = csv.writer(Line())
+    yield writer.writerow(COLUMNS).encode()
+    for row in data:
+        row['services'] = SERVICES_SEPARATOR.join(row['services'])
+        row['created'] = row['created'].isoformat()
+        yield writer.writerow([row[name] for name in COLUMNS]).encode()
+
+
+def ndjson_lines(data: Iterable[dict]) -> Iterator[bytes]:
+    """Получить строки NDJSON.
+
+    Args:
+        data (Iterable[dict]): строки выгрузки
+
+    Yields:
+        Iterator[bytes]: строки JSON
+    """
+    for row in data:
+        yield render_json(row) + b'\n'
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Сжать поток в gzip, не накапливая его в памяти.
+
+    Args:
+        chunks (Iterable[bytes]): поток
+
+    Yields:
+        Iterator[bytes]: сжатый поток
+    """
+    compressor = zlib.compressobj(wbits=GZIP_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def stream(fmt: str, queryset: QuerySet, gzip: bool = False) -> Iterator[bytes]:
+    """Получить поток выгрузки.
+
+    Args:
+        fmt (str): CSV или NDJSON
+        queryset (QuerySet): строки из reserves()
+        gzip (bool): сжать поток. по умолчанию False.
+
+    Returns:
+        Iterator[bytes]: поток
+    """
+    lines = (csv_lines if fmt == CSV else ndjson_lines)(rows(queryset))
+    return gzip_chunks(lines) if gzip else lines
+
+
+def filename(fmt: str, gzip: bool = False) -> str:
+    """Получить имя файла выгрузки.
+
+    Args:
+        fmt (str): CSV или NDJSON
+        gzip (bool): поток сжат. по умолчанию False.
+
+    Returns:
+        str: имя файла
+    """
+    return f'reserves.{fmt}.gz' if gzip else f'reserves.{fmt}'
@@ -0,0 +1,215 @@
+"""Модуль для быстрой отдачи списков REST API.
+
+Строки читаются через values() без создания моделей, а поля
+сериализатора заранее превращаются в функции преобразования, так что
+ответ совпадает с ответом сериализатора DRF.
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from django.urls import NoReverseMatch, reverse
+from rest_framework import ISO_8601, relations, serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+URL_PLACEHOLDER = 'fastpathpk'
+JSON_MEDIA_TYPE = 'application/json'
+
+Converter = Optional[Callable[[Any], Any]]
+
+
+def is_enabled() -> bool:
+    """Включена ли быстрая отдача списков.
+
+    Returns:
+        bool: истина/ложь
+    """
+    return getattr(settings, 'REST_FAST_PATH', False)
+
+
+def render_json(data: Any) -> bytes:
+    """Отрендерить JSON так же, как JSONRenderer DRF с настройками по умолчанию.
+
+    Args:
+        data (Any): данные
+
+    Returns:
+        bytes: JSON
+    """
+    if orjson is not None:
+        content = orjson.dumps(data, default=encoders.JSONEncoder().default)
+    else:
+        content = json.dumps(
+            data, cls=encoders.JSONEncoder, ensure_ascii=False, separators=(',', ':'),
+        ).encode()
+    # JSONRenderer экранирует разделители строк, чтобы ответ был подмножеством javascript
+    return content.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+def datetime_converter(field: serializers.DateTimeField) -> Converter:
+    """Получить преобразование даты и времени в строку ISO 8601.
+
+    Args:
+        field (serializers.DateTimeField): поле
+
+    Returns:
+        Converter: преобразование или None
+    """
+    if getattr(field, 'format', api_settings.DATETIME_FORMAT) != ISO_8601:
+        return None
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if field_timezone is None:
+        return None
+
+    def convert(value):
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def decimal_converter(field: serializers.DecimalField) -> Converter:
+    """Получить преобразование десятичного числа в строку.
+
+    Args:
+        field (serializers.DecimalField): поле
+
+    Returns:
+        Converter: преобразование или None
+    """
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize:
+        return None
+    quantize = field.quantize
+    return lambda value: '{:f}'.format(quantize(value))
+
+
+def url_converter(field: relations.HyperlinkedRelatedField, request: Any) -> Converter:
+    """Получить преобразование id связанного объекта в ссылку.
+
+    Ссылка собирается из префикса, вычисленного одним reverse на весь список.
+
+    Args:
+        field (relations.HyperlinkedRelatedField): поле
+        request (Any): запрос
+
+    Returns:
+        Converter: преобразование или None
+    """
+    if field.lookup_field != 'pk' or field.lookup_url_kwarg != 'pk' or field.format:
+        return None
+    try:
+        url = request.build_absolute_uri(reverse(field.view_name, kwargs={'pk': URL_PLACEHOLDER}))
+    except NoReverseMatch:
+        # пусть сериализатор сам сообщит об ошибке, если ссылка понадобится
+        return lambda pk: field.to_representation(relations.PKOnlyObject(pk))
+    prefix, suffix = url.split(URL_PLACEHOLDER)
+    return lambda pk: f'{prefix}{pk}{suffix}'
+
+
+def field_converter(field: serializers.Field, request: Any) -> Converter:
+    """Получить преобразование значения столбца в значение поля сериализатора.
+
+    Args:
+        field (serializers.Field): поле
+        request (Any): запрос
+
+    Returns:
+        Converter: преобразование или None, если поле не поддерживается
+    """
+    if isinstance(field, relations.HyperlinkedIdentityField):
+        return None
+    if isinstance(field, relations.HyperlinkedRelatedField):
+        return url_converter(field, request)
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        return (lambda pk: pk) if field.pk_field is None else field.pk_field.to_representation
+    if isinstance(field, (relations.RelatedField, relations.ManyRelatedField, serializers.BaseSerializer)):
+        return None
+    if isinstance(field, serializers.SerializerMethodField):
+        return None
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+        return str
+    if isinstance(field, serializers.DateTimeField):
+        return datetime_converter(field) or field.to_representation
+    if isinstance(field, serializers.DecimalField):
+        return decimal_converter(field) or field.to_representation
+    return field.to_representation
+
+
+def compile_fields(serializer: serializers.Serializer, request: Any) -> Optional[list[tuple[str, str, Converter]]]:
+    """Получить для полей сериализатора столбцы и преобразования.
+
+    Args:
+        serializer (serializers.Serializer): сериализатор
+        request (Any): запрос
+
+    Returns:
+        Optional[list[tuple[str, str, Converter]]]: поле, столбец, преобразование или None
+    """
+    columns = {field.name for field in serializer.Meta.model._meta.concrete_fields}
+    plan = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if field.source not in columns:
+            return None
+        converter = field_converter(field, request)
+        if converter is None:
+            return None
+        plan.append((name, field.source, converter))
+    return plan
+
+
+def to_rows(values: list[dict], plan: list[tuple[str, str, Converter]]) -> list[dict]:
+    """Преобразовать строки values() в данные ответа.
+
+    Args:
+        values (list[dict]): строки
+        plan (list[tuple[str, str, Converter]]): поля, столбцы и преобразования
+
+    Returns:
+        list[dict]: данные
+    """
+    return [
+        {name: None if row[column] is None else convert(row[column]) for name, column, convert in plan}
+        for row in values
+    ]
+
+
+def list_response(view: Any, queryset: QuerySet) -> Optional[HttpResponse]:
+    """Получить ответ списка в обход сериализатора.
+
+    Args:
+        view (Any): набор моделей
+        queryset (QuerySet): объекты
+
+    Returns:
+        Optional[HttpResponse]: ответ или None, если быстрый путь не подходит
+    """
+    request = view.request
+    if view.format_kwarg or request.accepted_renderer.format != 'json':
+        return None
+    if 'indent' in (request.accepted_media_type or ''):
+        return None
+    plan = compile_fields(view.get_serializer(), request)
+    if plan is None:
+        return None
+    columns = {column for _, column, _ in plan}
+    paginator = view.paginator
+    if hasattr(paginator, 'get_ordering'):
+        columns.update(name.lstrip('-') for name in paginator.get_ordering(request, queryset, view))
+    values = queryset.values(*columns)
+    page = view.paginate_queryset(values)
+    if page is None:
+        data = to_rows(values, plan)
+    else:
+        data = paginator.get_paginated_response(to_rows(page, plan)).data
+    return HttpResponse(render_json(data), content_type=JSON_MEDIA_TYPE)
@@ -1,8 +1,11 @@
 """Модуль для форм."""
 from django.contrib.auth import forms, models
 from django.core.exceptions import ValidationError
-from django.forms import (CharField, DateField, DateInput, DecimalField,
-                          EmailField, Form)
+from django.forms import (CharField, ChoiceField, DateField, DateInput,
+                          DecimalField, EmailField, Form, IntegerField,
+                          TextInput, UUIDField)
+
+from .models import NAMES_MAX_LENGTH, class_types
 
 DECIMAL_PACES = 2
 MAX_DIGITS = 11
@@ -66,3 +69,22 @@ class BookRoom(Form):
 
     start_date = DateField(label='start_date', widget=DateInputField)
     end_date = DateField(label='end_date', widget=DateInputField)
+
+
+class RoomSearchForm(BookRoom):
+    """Форма поиска свободных номеров."""
+
+    hotel = UUIDField(label='hotel', required=False)
+    city = CharField(label='city', max_length=NAMES_MAX_LENGTH, required=False)
+    category = ChoiceField(label='category', choices=(('', '---------'),) + class_types, required=False)
+    max_cost = DecimalField(label='max_cost', decimal_places=DECIMAL_PACES, max_digits=MAX_DIGITS, required=False)
+    floor = IntegerField(label='floor', required=False)
+
+
+class HotelSearchForm(Form):
+    """Форма поиска отелей."""
+
+    q = CharField(
+        label='search', max_length=NAMES_MAX_LENGTH,
+        widget=TextInput(attrs={'list': 'suggestions', 'autocomplete': 'off'}),
+    )
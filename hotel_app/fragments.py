@@ -0,0 +1,91 @@
+"""Модуль для кэша фрагментов шаблонов: карточек отелей и плиток номеров.
+
+Ключ фрагмента содержит id и дату изменения объекта, поэтому изменённый
+объект получает новый ключ, а старый фрагмент просто истекает. Фрагменты
+страницы читаются одним get_many.
+"""
+
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model
+from django.template.loader import render_to_string
+from django.utils.safestring import SafeString, mark_safe
+
+HOTEL_CARD = 'fragments/hotel_card.html'
+ROOM_TILE = 'fragments/room_tile.html'
+FRAGMENT_KEY = 'fragment:{template}:{id}:{stamps}'
+DEFAULT_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def stamp(instance: Optional[Model]) -> str:
+    """Получить метку версии объекта по дате изменения.
+
+    Args:
+        instance (Optional[Model]): объект или None
+
+    Returns:
+        str: метка
+    """
+    modified = getattr(instance, 'modified', None)
+    return str(modified.timestamp()) if modified else ''
+
+
+def hotel_card_key(hotel: Any) -> str:
+    """Получить ключ карточки отеля, которая показывает и город из адреса.
+
+    Args:
+        hotel (Any): отель с загруженным адресом
+
+    Returns:
+        str: ключ
+    """
+    stamps = f'{stamp(hotel)}:{stamp(hotel.hotel_address)}'
+    return FRAGMENT_KEY.format(template=HOTEL_CARD, id=hotel.id, stamps=stamps)
+
+
+def room_tile_key(room: Any) -> str:
+    """Получить ключ плитки номера.
+
+    Args:
+        room (Any): номер
+
+    Returns:
+        str: ключ
+    """
+    return FRAGMENT_KEY.format(template=ROOM_TILE, id=room.id, stamps=stamp(room))
+
+
+FRAGMENTS = {
+    HOTEL_CARD: ('hotel', hotel_card_key),
+    ROOM_TILE: ('room', room_tile_key),
+}
+
+
+def render_many(template: str, objects: Iterable[Any], force: bool = False) -> list[SafeString]:
+    """Получить фрагменты объектов: из кэша одним get_many, недостающие отрендерить.
+
+    Args:
+        template (str): HOTEL_CARD или ROOM_TILE
+        objects (Iterable[Any]): объекты
+        force (bool): отрендерить заново без чтения кэша. по умолчанию False.
+
+    Returns:
+        list[SafeString]: фрагменты в порядке объектов
+    """
+    name, make_key = FRAGMENTS[template]
+    objects = list(objects)
+    keys = [make_key(instance) for instance in objects]
+    cached = {} if force else cache.get_many(keys)
+    missing = {}
+    fragments = []
+    for key, instance in zip(keys, objects):
+        fragment = cached.get(key)
+        if fragment is None:
+            fragment = missing[key] = str(render_to_string(template, {name: instance}))
+        # в кэше лежат только фрагменты, отрендеренные шаблоном с экранированием
+        fragments.append(mark_safe(fragment))  # noqa: S308
+    if missing:
+        cache.set_many(missing, getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT))
+    return fragments
@@ -0,0 +1,440 @@
+"""Модуль для массового импорта отелей, адресов, номеров и услуг.
+
+Каждая строка входных данных описывает номер вместе с его отелем, адресом
+отеля и услугами отеля в виде "завтрак=500;парковка=200". Поля отеля
+берутся из первой строки отеля. Строки проверяются пачками векторными
+операциями NumPy, ссылки на адреса, отели и услуги разрешаются по словарям
+в памяти, а вставка идёт через bulk_create пачками в отдельных точках
+сохранения.
+"""
+
+import csv
+import json
+from collections import Counter
+from decimal import Decimal
+from functools import partial
+from itertools import islice
+from typing import Any, Iterable, Iterator, NamedTuple, Optional, TextIO
+
+import numpy as np
+from django.db import DatabaseError, transaction
+
+from . import autocomplete, availability_index, page_cache, pricing
+from .models import Address, Hotel, HotelService, Room, Service, class_types
+
+COLUMNS = (
+    'hotel', 'rating', 'city', 'street', 'house', 'hotel_image',
+    'category', 'floor', 'number', 'cost', 'room_image', 'services',
+)
+REQUIRED = ('hotel', 'category', 'floor', 'number')
+ADDRESS_COLUMNS = ('city', 'street', 'house')
+CATEGORIES = np.array([category for category, _ in class_types])
+MAX_RATING = 5
+RATING_STEP = Decimal('0.1')
+DEFAULT_CHUNK_SIZE = 1000
+SERVICES_SEPARATOR = ';'
+SERVICE_COST_SEPARATOR = '='
+# у номера и услуги отеля одинаковые столбцы стоимости
+_COST_FIELD = Room._meta.get_field('cost')
+MAX_COST = Decimal(10) ** (_COST_FIELD.max_digits - _COST_FIELD.decimal_places)
+PARSE_ERROR = '_error'
+
+MISSING = 'missing {column}'
+NOT_INTEGER = '{column} must be a non-negative integer'
+NOT_NUMBER = '{column} must be a non-negative number'
+BAD_RATING = 'rating must be between 0 and 5'
+BAD_CATEGORY = 'unknown category'
+PARTIAL_ADDRESS = 'city, street and house must be given together'
+BAD_SERVICES = 'services must look like "name=cost;name=cost"'
+COST_TOO_LARGE = f'cost must be less than {MAX_COST}'
+BAD_JSON = 'line is not valid JSON: {error}'
+NOT_OBJECT = 'line must be a JSON object'
+ROOM_EXISTS = 'room already exists'
+
+
+class Reject(NamedTuple):
+    """Отклонённая строка входных данных."""
+
+    line: int
+    error: str
+    row: dict
+
+
+class HotelRow(NamedTuple):
+    """Проверенная строка входных данных."""
+
+    line: int
+    hotel: str
+    rating: Decimal
+    address: Optional[tuple[str, str, int]]
+    hotel_image: Optional[str]
+    category: str
+    floor: int
+    number: int
+    cost: Decimal
+    room_image: Optional[str]
+    services: dict[str, Decimal]
+    source: dict
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[tuple[int, dict]]:
+    """Читать строки CSV или JSONL потоком.
+
+    Args:
+        stream (TextIO): входной поток
+        fmt (str): csv или jsonl
+
+    Строка JSONL, которая не разбирается в объект, не прерывает чтение:
+    вместо неё отдаётся строка с ошибкой в PARSE_ERROR, и проверка пачки
+    отклоняет её.
+
+    Yields:
+        Iterator[tuple[int, dict]]: номер строки и строка
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as error:
+            yield line, {PARSE_ERROR: BAD_JSON.format(error=error), 'text': text.strip()}
+            continue
+        if not isinstance(row, dict):
+            row = {PARSE_ERROR: NOT_OBJECT, 'text': text.strip()}
+        yield line, row
+
+
+def chunked(rows: Iterable, size: int) -> Iterator[list]:
+    """Разбить строки на пачки.
+
+    Args:
+        rows (Iterable): строки
+        size (int): размер пачки
+
+    Yields:
+        Iterator[list]: пачки
+    """
+    rows = iter(rows)
+    chunk = list(islice(rows, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(rows, size))
+
+
+def to_numbers(values: np.ndarray) -> np.ndarray:
+    """Преобразовать строки в числа, некорректные и пустые значения в nan.
+
+    Args:
+        values (np.ndarray): строки
+
+    Returns:
+        np.ndarray: числа
+    """
+    numbers = np.full(len(values), np.nan)
+    for position, value in enumerate(values):
+        try:
+            numbers[position] = float(value)
+        except ValueError:
+            continue
+    return numbers
+
+
+def parse_services(text: str) -> Optional[dict[str, Decimal]]:
+    """Разобрать услуги отеля.
+
+    Args:
+        text (str): услуги в виде "name=cost;name=cost"
+
+    Returns:
+        Optional[dict[str, Decimal]]: стоимость по названию или None, если формат или стоимость неверны
+    """
+    services = {}
+    for item in filter(None, (part.strip() for part in text.split(SERVICES_SEPARATOR))):
+        name, separator, cost = item.partition(SERVICE_COST_SEPARATOR)
+        try:
+            cost = Decimal(cost.strip())
+            if not cost.is_finite() or not 0 <= cost < MAX_COST:
+                return None
+        except ArithmeticError:
+            return None
+        if not separator or not name.strip():
+            return None
+        services[name.strip()] = cost
+    return services
+
+
+def column(chunk: list[tuple[int, dict]], name: str) -> np.ndarray:
+    """Получить столбец пачки в виде массива строк без пробелов по краям.
+
+    Args:
+        chunk (list[tuple[int, dict]]): пачка
+        name (str): столбец
+
+    Returns:
+        np.ndarray: значения
+    """
+    values = (row.get(name) for _, row in chunk)
+    return np.char.strip(np.array(['' if value is None else str(value) for value in values], dtype=str))
+
+
+def is_integer(numbers: np.ndarray) -> np.ndarray:
+    """Проверить, что числа целые и неотрицательные.
+
+    Args:
+        numbers (np.ndarray): числа
+
+    Returns:
+        np.ndarray: маска
+    """
+    return ~np.isnan(numbers) & (numbers >= 0) & (numbers == np.floor(numbers))
+
+
+def validate(chunk: list[tuple[int, dict]]) -> tuple[list[HotelRow], list[Reject]]:
+    """Проверить пачку строк векторными операциями.
+
+    Args:
+        chunk (list[tuple[int, dict]]): пачка
+
+    Returns:
+        tuple[list[HotelRow], list[Reject]]: принятые и отклонённые строки
+    """
+    values = {name: column(chunk, name) for name in COLUMNS}
+    empty = {name: np.char.str_len(values[name]) == 0 for name in COLUMNS}
+    numbers = {name: to_numbers(values[name]) for name in ('rating', 'floor', 'number', 'cost', 'house')}
+    text = {name: values[name].tolist() for name in COLUMNS}
+    address_given = ~empty['city'] | ~empty['street'] | ~empty['house']
+    services = [parse_services(text) for text in values['services']]
+
+    checks = [(empty[name], MISSING.format(column=name)) for name in REQUIRED]
+    checks += [(~is_integer(numbers[name]), NOT_INTEGER.format(column=name)) for name in ('floor', 'number')]
+    checks += [
+        (~empty['cost'] & ~(np.isfinite(numbers['cost']) & (numbers['cost'] >= 0)), NOT_NUMBER.format(column='cost')),
+        (~empty['cost'] & (numbers['cost'] >= float(MAX_COST)), COST_TOO_LARGE),
+        (~empty['rating'] & ~((numbers['rating'] >= 0) & (numbers['rating'] <= MAX_RATING)), BAD_RATING),
+        (~np.isin(values['category'], CATEGORIES), BAD_CATEGORY),
+        (address_given & (empty['city'] | empty['street'] | ~is_integer(numbers['house'])), PARTIAL_ADDRESS),
+        (np.array([parsed is None for parsed in services]), BAD_SERVICES),
+    ]
+    errors = np.array([row.get(PARSE_ERROR, '') for _, row in chunk], dtype=object)
+    for mask, message in checks:
+        errors[mask & (errors == '')] = message
+
+    accepted, rejected = [], []
+    for position, (line, row) in enumerate(chunk):
+        if errors[position]:
+            rejected.append(Reject(line, errors[position], row))
+            continue
+        accepted.append(HotelRow(
+            line=line,
+            hotel=text['hotel'][position],
+            rating=Decimal(text['rating'][position] or 0).quantize(RATING_STEP),
+            address=(
+                text['city'][position], text['street'][position], int(numbers['house'][position]),
+            ) if address_given[position] else None,
+            hotel_image=text['hotel_image'][position] or None,
+            category=text['category'][position],
+            floor=int(numbers['floor'][position]),
+            number=int(numbers['number'][position]),
+            cost=Decimal(text['cost'][position] or 0),
+            room_image=text['room_image'][position] or None,
+            services=services[position],
+            source=row,
+        ))
+    return accepted, rejected
+
+
+class InventoryImporter:
+    """Импорт пачек строк со словарями уже известных адресов, отелей и услуг."""
+
+    def __init__(self) -> None:
+        """Загрузить ключи существующих адресов, отелей и услуг."""
+        self.addresses = {
+            (city, street, number): address_id
+            for address_id, city, street, number in Address.objects.values_list('id', 'city', 'street', 'number')
+        }
+        self.hotels = {
+            (name, address_id): hotel_id
+            for hotel_id, name, address_id in Hotel.objects.values_list('id', 'name', 'hotel_address_id')
+        }
+        self.services = dict(Service.objects.values_list('name', 'id'))
+        self.loaded_hotels = set()
+        self.rooms = set()
+        self.hotel_services = set()
+        self.stats = Counter()
+        self.new_room_ids = []
+        self.touched_hotels = set()
+        self.priced_hotels = set()
+
+    def load_hotels(self, hotel_ids: set) -> None:
+        """Загрузить номера и услуги существующих отелей пачки.
+
+        Args:
+            hotel_ids (set): id отелей
+        """
+        hotel_ids = hotel_ids - self.loaded_hotels
+        if not hotel_ids:
+            return
+        self.rooms.update(Room.objects.filter(hotel__in=hotel_ids).values_list('hotel_id', 'number'))
+        self.hotel_services.update(
+            HotelService.objects.filter(hotel__in=hotel_ids).values_list('hotel_id', 'service_id'),
+        )
+        self.loaded_hotels |= hotel_ids
+
+    def import_chunk(self, chunk: list[tuple[int, dict]]) -> list[Reject]:
+        """Проверить и вставить пачку в отдельной точке сохранения.
+
+        Если вставка пачки падает, пачка откатывается целиком, а её строки
+        отклоняются с текстом ошибки базы данных.
+
+        Args:
+            chunk (list[tuple[int, dict]]): пачка
+
+        Returns:
+            list[Reject]: отклонённые строки
+        """
+        accepted, rejected = validate(chunk)
+        known = {self.hotels.get((row.hotel, self.addresses.get(row.address))) for row in accepted}
+        self.load_hotels(known - {None})
+        plan = ChunkPlan(self)
+        planned = []
+        for row in accepted:
+            if plan.add(row):
+                planned.append(row)
+            else:
+                rejected.append(Reject(row.line, ROOM_EXISTS, row.source))
+        try:
+            with transaction.atomic():
+                plan.save()
+        except DatabaseError as error:
+            return rejected + [Reject(row.line, str(error).strip(), row.source) for row in planned]
+        plan.merge()
+        return rejected
+
+    def notify(self) -> None:
+        """После коммита сообщить кэшам, индексу занятости и подсказкам о новых объектах."""
+        if availability_index.is_enabled() and self.new_room_ids:
+            transaction.on_commit(partial(availability_index.index.rooms_added, list(self.new_room_ids)))
+        transaction.on_commit(partial(page_cache.invalidate, page_cache.HOTEL, list(self.touched_hotels)))
+        for hotel_id in self.priced_hotels:
+            transaction.on_commit(partial(pricing.invalidate, hotel_id))
+        if self.stats['hotels']:
+            transaction.on_commit(autocomplete.index.invalidate)
+
+
+class ChunkPlan:
+    """Новые объекты пачки, которые попадут в словари импорта только после вставки."""
+
+    def __init__(self, importer: InventoryImporter) -> None:
+        """Создать пустой план.
+
+        Args:
+            importer (InventoryImporter): импорт
+        """
+        self.importer = importer
+        self.addresses = {}
+        self.hotels = {}
+        self.services = {}
+        self.rooms = {}
+        self.hotel_services = {}
+
+    def address_id(self, key: Optional[tuple[str, str, int]]) -> Any:
+        """Получить id адреса, создав его при необходимости.
+
+        Args:
+            key (Optional[tuple[str, str, int]]): город, улица, дом или None
+
+        Returns:
+            Any: id адреса или None
+        """
+        if key is None:
+            return None
+        address_id = self.importer.addresses.get(key) or getattr(self.addresses.get(key), 'id', None)
+        if address_id is None:
+            city, street, number = key
+            address_id = self.addresses.setdefault(key, Address(city=city, street=street, number=number)).id
+        return address_id
+
+    def hotel_id(self, row: HotelRow) -> Any:
+        """Получить id отеля строки, создав его при необходимости.
+
+        Args:
+            row (HotelRow): строка
+
+        Returns:
+            Any: id отеля
+        """
+        key = (row.hotel, self.address_id(row.address))
+        hotel_id = self.importer.hotels.get(key) or getattr(self.hotels.get(key), 'id', None)
+        if hotel_id is None:
+            hotel = Hotel(name=row.hotel, rating=row.rating, hotel_address_id=key[1], image=row.hotel_image)
+            hotel_id = self.hotels.setdefault(key, hotel).id
+        return hotel_id
+
+    def service_id(self, name: str) -> Any:
+        """Получить id услуги, создав её при необходимости.
+
+        Args:
+            name (str): название
+
+        Returns:
+            Any: id услуги
+        """
+        service_id = self.importer.services.get(name) or getattr(self.services.get(name), 'id', None)
+        if service_id is None:
+            service_id = self.services.setdefault(name, Service(name=name)).id
+        return service_id
+
+    def add(self, row: HotelRow) -> bool:
+        """Добавить строку в план.
+
+        Args:
+            row (HotelRow): строка
+
+        Returns:
+            bool: False, если такой номер в отеле уже есть
+        """
+        hotel_id = self.hotel_id(row)
+        for name, cost in row.services.items():
+            key = (hotel_id, self.service_id(name))
+            if key not in self.importer.hotel_services and key not in self.hotel_services:
+                self.hotel_services[key] = HotelService(hotel_id=key[0], service_id=key[1], cost=cost)
+        room_key = (hotel_id, row.number)
+        if room_key in self.importer.rooms or room_key in self.rooms:
+            return False
+        self.rooms[room_key] = Room(
+            hotel_id=hotel_id, category=row.category, floor=row.floor, number=row.number,
+            cost=row.cost, image=row.room_image,
+        )
+        return True
+
+    def save(self) -> None:
+        """Вставить новые объекты в порядке зависимостей и заполнить поиск по новым отелям."""
+        for objects in (self.addresses, self.hotels, self.services, self.hotel_services, self.rooms):
+            objects_list = list(objects.values())
+            if objects_list:
+                type(objects_list[0]).objects.bulk_create(objects_list)
+        if self.hotels:
+            Hotel.objects.refresh_search([hotel.id for hotel in self.hotels.values()])
+
+    def merge(self) -> None:
+        """Добавить вставленные объекты в словари импорта и статистику."""
+        importer = self.importer
+        importer.addresses.update((key, address.id) for key, address in self.addresses.items())
+        importer.hotels.update((key, hotel.id) for key, hotel in self.hotels.items())
+        importer.services.update((name, service.id) for name, service in self.services.items())
+        importer.loaded_hotels.update(hotel.id for hotel in self.hotels.values())
+        importer.rooms.update(self.rooms)
+        importer.hotel_services.update(self.hotel_services)
+        importer.new_room_ids.extend(room.id for room in self.rooms.values())
+        importer.touched_hotels.update(hotel_id for hotel_id, _ in self.rooms)
+        importer.priced_hotels.update(hotel_id for hotel_id, _ in self.hotel_services)
+        importer.touched_hotels |= importer.priced_hotels
+        importer.stats.update({
+            'addresses': len(self.addresses), 'hotels': len(self.hotels), 'services': len(self.services),
+            'hotel services': len(self.hotel_services), 'rooms': len(self.rooms),
+        })
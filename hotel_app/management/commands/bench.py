@@ -0,0 +1,80 @@
+"""Модуль команды замера страниц и REST API."""
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (get_runner, setup_test_environment,
+                               teardown_test_environment)
+
+from hotel_app import benchmark
+
+
+class Command(BaseCommand):
+    """Замерить ссылки во временной тестовой базе и сравнить с базовым отчётом."""
+
+    help = 'Seed a test database, time every URL and compare p50/p95/p99 and SQL queries with a baseline'
+
+    def add_arguments(self, parser) -> None:
+        """Добавить аргументы.
+
+        Args:
+            parser (_type_): парсер аргументов
+        """
+        parser.add_argument('--hotels', type=int, default=50, help='hotels to seed')
+        parser.add_argument('--rooms', type=int, default=20, help='rooms per hotel')
+        parser.add_argument('--reserves', type=int, default=5, help='reserves per room')
+        parser.add_argument('--requests', type=int, default=50, help='timed requests per URL')
+        parser.add_argument('--warmup', type=int, default=5, help='untimed requests per URL')
+        parser.add_argument('--endpoint', action='append', dest='endpoints', help='URL name, may be repeated')
+        parser.add_argument('--output', type=Path, help='write the JSON report to this file')
+        parser.add_argument('--baseline', type=Path, help='JSON report to compare with')
+        parser.add_argument('--metric', choices=benchmark.METRICS, default='p95_ms', help='percentile to compare')
+        parser.add_argument('--max-slowdown', type=float, default=20, help='allowed slowdown, percent')
+        parser.add_argument('--max-extra-queries', type=float, default=0, help='allowed extra SQL queries per request')
+
+    def handle(self, *args, **options) -> None:
+        """Замерить ссылки.
+
+        Args:
+            args (Any): аргументы
+            options (Any): параметры
+
+        Raises:
+            CommandError: неверные параметры или регрессия относительно базового отчёта
+        """
+        if options['hotels'] * options['rooms'] < 3 or options['requests'] < 2:
+            raise CommandError('need at least 3 rooms and 2 requests')
+        names = set(options['endpoints'] or ()) or None
+        unknown = (names or set()) - {endpoint.name for endpoint in benchmark.ENDPOINTS}
+        if unknown:
+            raise CommandError(f'unknown endpoints: {", ".join(sorted(unknown))}')
+        baseline = json.loads(options['baseline'].read_text()) if options['baseline'] else None
+
+        setup_test_environment()
+        runner = get_runner(settings)(verbosity=0, interactive=False)
+        old_config = runner.setup_databases()
+        try:
+            dataset = benchmark.seed(options['hotels'], options['rooms'], options['reserves'])
+            results = benchmark.run(dataset, options['requests'], options['warmup'], names)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        report = {
+            'dataset': {key: options[key] for key in ('hotels', 'rooms', 'reserves')},
+            'endpoints': results,
+        }
+        text = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            options['output'].write_text(text)
+        self.stdout.write(text)
+        if baseline is None:
+            return
+        found = benchmark.regressions(
+            results, baseline['endpoints'], options['metric'], options['max_slowdown'], options['max_extra_queries'],
+        )
+        if found:
+            raise CommandError('regressions:\n' + '\n'.join(found))
+        self.stdout.write(f'no regressions against {options["baseline"]}')
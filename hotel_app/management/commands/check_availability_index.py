@@ -0,0 +1,56 @@
+"""Модуль команды проверки индекса занятости."""
+
+from datetime import timedelta
+from random import Random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hotel_app.availability import unreserved_rooms
+from hotel_app.availability_index import index
+
+MAX_NIGHTS = 14
+
+
+class Command(BaseCommand):
+    """Сравнить индекс занятости с запросом к базе данных."""
+
+    help = 'Build the availability index and compare it with SQL on random date windows'
+
+    def add_arguments(self, parser) -> None:
+        """Добавить аргументы.
+
+        Args:
+            parser (_type_): парсер аргументов
+        """
+        parser.add_argument('--samples', type=int, default=100, help='number of random date windows')
+        parser.add_argument('--seed', type=int, default=0, help='random seed for date windows')
+
+    def handle(self, *args, **options) -> None:
+        """Выполнить проверку.
+
+        Args:
+            args (Any): аргументы
+            options (Any): параметры
+
+        Raises:
+            CommandError: индекс расходится с базой данных
+        """
+        index.build()
+        self.stdout.write(f'index: {len(index.room_ids)} rooms, {len(index.spans)} reserves, origin {index.origin}')
+        random = Random(options['seed'])
+        mismatches = 0
+        for _ in range(options['samples']):
+            start = random.randrange(index.horizon - 1)
+            nights = random.randint(1, min(MAX_NIGHTS, index.horizon - start))
+            start_date = index.origin + timedelta(days=start)
+            end_date = start_date + timedelta(days=nights)
+            expected = set(unreserved_rooms(start_date, end_date).values_list('id', flat=True))
+            actual = set(index.free_room_ids(start_date, end_date))
+            if expected != actual:
+                mismatches += 1
+                self.stderr.write(
+                    f'{start_date} - {end_date}: missing {len(expected - actual)}, extra {len(actual - expected)}',
+                )
+        if mismatches:
+            raise CommandError(f'{mismatches} of {options["samples"]} windows differ from the database')
+        self.stdout.write(self.style.SUCCESS(f'{options["samples"]} windows match the database'))
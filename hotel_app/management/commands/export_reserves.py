@@ -0,0 +1,52 @@
+"""Модуль команды потоковой выгрузки бронирований."""
+
+import sys
+from contextlib import ExitStack
+from datetime import date
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hotel_app import export
+
+
+class Command(BaseCommand):
+    """Выгрузить бронирования с номером, отелем, клиентом и услугами в CSV или NDJSON."""
+
+    help = 'Stream reserves joined with room, hotel, client and services as CSV or NDJSON'
+
+    def add_arguments(self, parser) -> None:
+        """Добавить аргументы.
+
+        Args:
+            parser (_type_): парсер аргументов
+        """
+        parser.add_argument('--format', choices=export.FORMATS, default=export.CSV, help='output format')
+        parser.add_argument('--start', type=date.fromisoformat, help='first check-in day, YYYY-MM-DD')
+        parser.add_argument('--end', type=date.fromisoformat, help='day after the last check-in day, YYYY-MM-DD')
+        parser.add_argument('--hotel', type=UUID, help='hotel id')
+        parser.add_argument('--gzip', action='store_true', help='gzip the output')
+        parser.add_argument('--output', default='-', help='output file, "-" for stdout')
+
+    def handle(self, *args, **options) -> None:
+        """Выгрузить бронирования.
+
+        Args:
+            args (Any): аргументы
+            options (Any): параметры
+
+        Raises:
+            CommandError: конец периода не позже начала
+        """
+        if options['start'] and options['end'] and options['end'] <= options['start']:
+            raise CommandError('--end must be after --start')
+        queryset = export.reserves(options['start'], options['end'], options['hotel'])
+        with ExitStack() as stack:
+            # выгрузка двоичная, а self.stdout пишет текст, поэтому в stdout пишем напрямую
+            if options['output'] == '-':
+                output = sys.stdout.buffer
+            else:
+                output = stack.enter_context(open(options['output'], 'wb'))
+            for chunk in export.stream(options['format'], queryset, gzip=options['gzip']):
+                output.write(chunk)
+            output.flush()
@@ -0,0 +1,73 @@
+"""Модуль команды массового импорта отелей, адресов, номеров и услуг."""
+
+import json
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from hotel_app import inventory
+
+FORMATS = ('csv', 'jsonl')
+
+
+class Command(BaseCommand):
+    """Импортировать номера вместе с отелями, адресами и услугами из CSV или JSONL."""
+
+    help = 'Stream hotels, addresses, rooms and services from a CSV or JSONL file, one room per row'
+
+    def add_arguments(self, parser) -> None:
+        """Добавить аргументы.
+
+        Args:
+            parser (_type_): парсер аргументов
+        """
+        parser.add_argument('path', help='input file, "-" for stdin')
+        parser.add_argument('--format', choices=FORMATS, help='input format, by default taken from the extension')
+        parser.add_argument(
+            '--chunk-size', type=int, default=inventory.DEFAULT_CHUNK_SIZE, help='rows validated and inserted at once',
+        )
+        parser.add_argument('--errors', help='file for rejected rows, by default <path>.rejects')
+        parser.add_argument('--atomic', action='store_true', help='roll back the whole import if any row is rejected')
+
+    def handle(self, *args, **options) -> None:
+        """Импортировать файл.
+
+        Args:
+            args (Any): аргументы
+            options (Any): параметры
+
+        Raises:
+            CommandError: неизвестный формат, неверный размер пачки или отклонённые строки при --atomic
+        """
+        path = options['path']
+        fmt = options['format'] or Path(path).suffix.lstrip('.').lower()
+        if fmt not in FORMATS:
+            raise CommandError(f'unknown format {fmt!r}, use --format')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+        errors_path = options['errors'] or ('rejects.jsonl' if path == '-' else f'{path}.rejects')
+        started = perf_counter()
+        with ExitStack() as stack:
+            stream = sys.stdin if path == '-' else stack.enter_context(open(path, newline='', encoding='utf-8'))
+            errors = stack.enter_context(open(errors_path, 'w', encoding='utf-8'))
+            if options['atomic']:
+                stack.enter_context(transaction.atomic())
+            importer = inventory.InventoryImporter()
+            rows = rejected = 0
+            for chunk in inventory.chunked(inventory.read_rows(stream, fmt), options['chunk_size']):
+                rows += len(chunk)
+                for reject in importer.import_chunk(chunk):
+                    rejected += 1
+                    errors.write(json.dumps(reject._asdict(), ensure_ascii=False, default=str) + '\n')
+            if options['atomic'] and rejected:
+                raise CommandError(f'{rejected} of {rows} rows rejected, nothing imported, see {errors_path}')
+            importer.notify()
+        elapsed = perf_counter() - started
+        for name, count in importer.stats.items():
+            self.stdout.write(f'{name}: {count}')
+        self.stdout.write(f'rejected: {rejected}, see {errors_path}' if rejected else 'rejected: 0')
+        self.stdout.write(f'{rows} rows in {elapsed:.2f}s, {rows / elapsed if elapsed else 0:.0f} rows/s')
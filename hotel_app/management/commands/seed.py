@@ -0,0 +1,63 @@
+"""Модуль команды генерации больших синтетических данных."""
+
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from hotel_app import seed
+
+
+class Command(BaseCommand):
+    """Сгенерировать отели, номера, клиентов и непересекающиеся брони и загрузить их COPY."""
+
+    help = 'Generate a deterministic synthetic dataset with NumPy and load it with COPY in parallel chunks'
+
+    def add_arguments(self, parser) -> None:
+        """Добавить аргументы.
+
+        Args:
+            parser (_type_): парсер аргументов
+        """
+        defaults = seed.SeedConfig()
+        parser.add_argument('--hotels', type=int, default=defaults.hotels, help='hotels')
+        parser.add_argument('--rooms', type=int, default=defaults.rooms, help='rooms per hotel')
+        parser.add_argument('--reserves', type=int, default=defaults.reserves, help='reserves in total')
+        parser.add_argument('--clients', type=int, default=defaults.clients, help='clients')
+        parser.add_argument('--services', type=int, default=defaults.services, help='services offered by every hotel')
+        parser.add_argument(
+            '--service-ratio', type=float, default=defaults.service_ratio, help='share of reserves with a service',
+        )
+        parser.add_argument('--history', type=int, default=defaults.history, help='days of reserves before today')
+        parser.add_argument('--seed', type=int, default=defaults.seed, help='random seed')
+        parser.add_argument('--chunk-size', type=int, default=100_000, help='rows per COPY chunk')
+        parser.add_argument('--workers', type=int, default=4, help='parallel COPY connections')
+        parser.add_argument('--no-stats', action='store_true', help='do not rebuild hotel daily stats')
+
+    def handle(self, *args, **options) -> None:
+        """Сгенерировать и загрузить данные.
+
+        Args:
+            args (Any): аргументы
+            options (Any): параметры
+
+        Raises:
+            CommandError: неверные параметры или данные с этим seed уже загружены
+        """
+        config = seed.SeedConfig(**{name: options[name] for name in seed.SeedConfig._fields})
+        if min(config.hotels, config.rooms, config.clients, config.services, options['chunk_size'],
+               options['workers']) < 1 or config.reserves < 0 or config.history < 0:
+            raise CommandError('counts, --chunk-size and --workers must be positive')
+        if not 0 <= config.service_ratio <= 1:
+            raise CommandError('--service-ratio must be between 0 and 1')
+        if seed.loaded(config):
+            raise CommandError(f'dataset with --seed {config.seed} is already loaded')
+
+        started = perf_counter()
+        dataset = seed.generate(config)
+        generated = perf_counter()
+        self.stdout.write(f'generated in {generated - started:.2f}s')
+        counts = seed.load(dataset, options['chunk_size'], options['workers'], not options['no_stats'])
+        for name, count in counts.items():
+            self.stdout.write(f'{name}: {count}')
+        elapsed = perf_counter() - generated
+        self.stdout.write(f'loaded in {elapsed:.2f}s, {counts["reserves"] / elapsed if elapsed else 0:.0f} reserves/s')
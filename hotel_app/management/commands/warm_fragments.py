@@ -0,0 +1,43 @@
+"""Модуль команды прогрева кэша фрагментов."""
+
+from django.core.management.base import BaseCommand
+
+from hotel_app import fragments
+from hotel_app.models import Hotel, Room
+
+
+class Command(BaseCommand):
+    """Отрендерить и положить в кэш карточки отелей и плитки номеров."""
+
+    help = 'Render hotel cards and room tiles into the cache, e.g. after an import'
+
+    def add_arguments(self, parser) -> None:
+        """Добавить аргументы.
+
+        Args:
+            parser (_type_): парсер аргументов
+        """
+        parser.add_argument('--batch-size', type=int, default=1000, help='objects rendered per cache round trip')
+        parser.add_argument('--force', action='store_true', help='re-render fragments that are already cached')
+
+    def handle(self, *args, **options) -> None:
+        """Прогреть кэш.
+
+        Args:
+            args (Any): аргументы
+            options (Any): параметры
+        """
+        querysets = (
+            (fragments.HOTEL_CARD, Hotel.objects.select_related('hotel_address').order_by()),
+            (fragments.ROOM_TILE, Room.objects.order_by()),
+        )
+        for template, queryset in querysets:
+            count = 0
+            batch = []
+            for instance in queryset.iterator(chunk_size=options['batch_size']):
+                batch.append(instance)
+                if len(batch) == options['batch_size']:
+                    count += len(fragments.render_many(template, batch, force=options['force']))
+                    batch = []
+            count += len(fragments.render_many(template, batch, force=options['force']))
+            self.stdout.write(f'{template}: {count} fragments')
@@ -0,0 +1,22 @@
+# Generated by Django 4.1.7 on 2026-10-17 01:05
+
+import django.contrib.postgres.constraints
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations
+
+import hotel_app.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotel_app', '0003_address_remove_hotel_address_hotel_hotel_address'),
+    ]
+
+    operations = [
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name='reserve',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(expressions=[('room', '='), (hotel_app.models.DateRange('start_date', 'end_date'), '&&')], name='reserve_room_period_excl'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.1.7 on 2026-10-17 01:11
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('hotel_app', '0004_reserve_room_period_excl'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='hotel',
+            index=models.Index(fields=['name', 'rating'], name='hotel_order_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='hotelservice',
+            index=models.Index(fields=['hotel', 'service'], include=('cost',), name='hotel_service_cost_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='reserve',
+            index=models.Index(fields=['room', 'start_date', 'end_date'], name='reserve_room_period_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='reserve',
+            index=models.Index(fields=['user', 'start_date'], name='reserve_user_start_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='room',
+            index=models.Index(fields=['hotel', 'category', 'floor'], name='room_hotel_order_idx'),
+        ),
+    ]
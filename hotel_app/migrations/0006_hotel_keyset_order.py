@@ -0,0 +1,29 @@
+# Generated by Django 4.1.7 on 2026-10-17 01:12
+
+from django.contrib.postgres.operations import (AddIndexConcurrently,
+                                                RemoveIndexConcurrently)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('hotel_app', '0005_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='hotel',
+            options={'ordering': ['name', 'rating', 'id'], 'verbose_name': 'hotel', 'verbose_name_plural': 'hotels'},
+        ),
+        AddIndexConcurrently(
+            model_name='hotel',
+            index=models.Index(fields=['name', 'rating', 'id'], name='hotel_keyset_idx'),
+        ),
+        RemoveIndexConcurrently(
+            model_name='hotel',
+            name='hotel_order_idx',
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.1.7 on 2026-10-17 02:05
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('hotel_app', '0006_hotel_keyset_order'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='hotel',
+            index=models.Index(fields=['created'], name='hotel_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='reserve',
+            index=models.Index(fields=['created'], name='reserve_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='room',
+            index=models.Index(fields=['created'], name='room_created_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.1.7 on 2026-10-17 01:21
+
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def fill_summary(apps, schema_editor):
+    Client = apps.get_model('hotel_app', 'Client')
+    Reserve = apps.get_model('hotel_app', 'Reserve')
+    today = datetime.now(timezone.utc).date()
+    reserves = Reserve.objects.filter(user=OuterRef('pk')).order_by().values('user')
+    active = reserves.filter(end_date__gt=today)
+    Client.objects.update(
+        active_reserves=Coalesce(Subquery(active.annotate(count=Count('id')).values('count')), 0),
+        total_spent=Coalesce(Subquery(reserves.annotate(total=Sum('price')).values('total')), Decimal(0)),
+        next_check_in=Subquery(active.filter(start_date__gte=today).annotate(first=Min('start_date')).values('first')),
+        next_check_out=Subquery(active.annotate(first=Min('end_date')).values('first')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotel_app', '0007_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='client',
+            name='active_reserves',
+            field=models.PositiveIntegerField(default=0, verbose_name='active reserves'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='next_check_in',
+            field=models.DateField(blank=True, null=True, verbose_name='next check-in'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='next_check_out',
+            field=models.DateField(blank=True, null=True, verbose_name='next check-out'),
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='total_spent',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=13, verbose_name='total spent'),
+        ),
+        migrations.RunPython(fill_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.7 on 2026-10-17 04:10
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('hotel_app', '0008_client_summary'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='reserve',
+            index=models.Index(fields=['start_date', 'id'], name='reserve_start_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.1.7 on 2026-10-17 04:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import hotel_app.models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotel_app', '0009_reserve_start_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HotelDailyStats',
+            fields=[
+                ('id', models.UUIDField(blank=True, default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(blank=True, default=hotel_app.models.get_datetime, null=True, validators=[hotel_app.models.check_created], verbose_name='created')),
+                ('modified', models.DateTimeField(auto_now=True, null=True, validators=[hotel_app.models.check_modified], verbose_name='modified')),
+                ('day', models.DateField(verbose_name='day')),
+                ('rooms_sold', models.PositiveIntegerField(default=0, verbose_name='rooms sold')),
+                ('revenue', models.DecimalField(decimal_places=4, default=0, max_digits=15, verbose_name='revenue')),
+                ('service_revenue', models.DecimalField(decimal_places=4, default=0, max_digits=15, verbose_name='service revenue')),
+                ('hotel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='hotel_app.hotel', verbose_name='hotel')),
+            ],
+            options={
+                'verbose_name': 'hotel daily stats',
+                'verbose_name_plural': 'hotel daily stats',
+                'db_table': '"hotel"."hotel_daily_stats"',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='hoteldailystats',
+            index=models.Index(fields=['day'], name='hotel_daily_stats_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='hoteldailystats',
+            constraint=models.UniqueConstraint(fields=('hotel', 'day'), name='hotel_daily_stats_hotel_day_uniq'),
+        ),
+    ]
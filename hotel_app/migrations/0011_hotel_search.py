@@ -0,0 +1,57 @@
+# Generated by Django 4.1.7 on 2026-10-17 05:20
+
+import django.contrib.postgres.search
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import (AddIndexConcurrently,
+                                                TrigramExtension)
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+from django.db.models import Func, OuterRef, Subquery, Value
+
+
+def fill_search(apps, schema_editor):
+    Address = apps.get_model('hotel_app', 'Address')
+    Hotel = apps.get_model('hotel_app', 'Hotel')
+    address = Address.objects.filter(pk=OuterRef('hotel_address'))
+    city = Subquery(address.values('city'))
+    street = Subquery(address.values('street'))
+    Hotel.objects.update(
+        search_vector=(
+            SearchVector('name', weight='A', config='simple')
+            + SearchVector(city, weight='B', config='simple')
+            + SearchVector(street, weight='C', config='simple')
+        ),
+        search_text=Func(Value(' '), 'name', city, street, function='concat_ws', output_field=models.TextField()),
+    )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('hotel_app', '0010_hotel_daily_stats'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='hotel',
+            name='search_text',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='hotel',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_search, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='hotel',
+            index=GinIndex(fields=['search_vector'], name='hotel_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='hotel',
+            index=GinIndex(fields=['search_text'], name='hotel_search_text_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.1.7 on 2026-10-17 02:03
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Now
+
+import hotel_app.models
+
+MODELS = (
+    'address', 'client', 'hotel', 'hoteldailystats', 'hotelservice', 'reserve', 'reserveservice', 'room', 'service',
+)
+
+
+def fill_created(apps, schema_editor):
+    for name in MODELS:
+        model = apps.get_model('hotel_app', name)
+        fields = {field.name for field in model._meta.fields}
+        created = Coalesce('modified', Now()) if 'modified' in fields else Now()
+        model.objects.filter(created__isnull=True).update(created=created)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotel_app', '0011_hotel_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_created, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='address',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='client',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='hotel',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='hoteldailystats',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='hotelservice',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='reserve',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='reserveservice',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='room',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='created',
+            field=models.DateTimeField(default=hotel_app.models.get_datetime, editable=False, validators=[hotel_app.models.check_created], verbose_name='created'),
+        ),
+    ]
@@ -1,20 +1,34 @@
 """Модуль для модулей."""
 
-from datetime import datetime, timezone
-from typing import Any
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import Any, Optional
 from uuid import uuid4
 
 from django.conf.global_settings import AUTH_USER_MODEL
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField, RangeOperators
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector, SearchVectorField,
+                                            TrigramWordSimilarity)
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
-from django.db.models import Q
+from django.db.models import (Case, Count, Exists, F, Func, Min, OuterRef, Q,
+                              Subquery, Sum, Value, When)
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 
 NAMES_MAX_LENGTH = 100
 IMAGE_MAX_LENGTH = 500
 ADDRESS_MAX_LENGTH = 250
 DESCRIPTION_MAX_LENGTH = 1000
+SUMMARY_FIELDS = ('active_reserves', 'total_spent', 'next_check_in', 'next_check_out')
+# без стемминга: названия отелей и городов бывают и на русском, и на английском
+SEARCH_CONFIG = 'simple'
+# поисковые поля нужны только запросам поиска, а вектор занимает больше самой строки отеля
+SEARCH_FIELDS = ('search_vector', 'search_text')
 
 
 def get_datetime() -> datetime:
@@ -84,9 +98,49 @@ DATE_END_ERROR = 'Дата окончания брони не может быт
 DATE_EQUALLY = 'Забронировать можно минимум на один день'
 
 
+def overlapping_reserves(room: Any, start_date: date, end_date: date, reserve_id: Any = None) -> models.QuerySet:
+    """Получить брони номера, пересекающиеся с полуинтервалом [start_date, end_date).
+
+    День выезда одной брони может совпадать с днём заезда другой.
+
+    Args:
+        room (Any): номер, его id или OuterRef
+        start_date (date): дата заезда
+        end_date (date): дата выезда
+        reserve_id (Any): id брони, которую не нужно учитывать. по умолчанию None.
+
+    Returns:
+        models.QuerySet: пересекающиеся брони
+    """
+    reserves = Reserve.objects.filter(room=room, start_date__lt=end_date, end_date__gt=start_date)
+    if reserve_id is not None:
+        reserves = reserves.exclude(id=reserve_id)
+    return reserves
+
+
+def upcoming_first(reserves: models.QuerySet) -> models.QuerySet:
+    """Упорядочить брони: сначала текущие и будущие по дате заезда, затем прошедшие от новых к старым.
+
+    Номер и отель загружаются тем же запросом.
+
+    Args:
+        reserves (models.QuerySet): брони
+
+    Returns:
+        models.QuerySet: брони
+    """
+    today = get_datetime().date()
+    upcoming_start = Case(When(end_date__gt=today, then=F('start_date')))
+    return reserves.select_related('room__hotel').order_by(
+        upcoming_start.asc(nulls_last=True), F('start_date').desc(), 'id',
+    )
+
+
 def msg_error_reserve(data: dict) -> list[str]:
     """Получить сообщение ошибки бронирования.
 
+    Существование номера и пересечение с другими бронями проверяются одним запросом.
+
     Args:
         data (dict): словарь с данными о бронировании
 
@@ -103,13 +157,15 @@ def msg_error_reserve(data: dict) -> list[str]:
     if end_date == start_date:
         msg.append(DATE_EQUALLY)
     try:
-        room = Room.objects.get(id=data['room'])
-    except Exception:
-        msg.append(ROOM_NOT_EXIST)
+        busy = Room.objects.filter(id=data['room']).annotate(
+            busy=Exists(overlapping_reserves(OuterRef('pk'), start_date, end_date, reserve_id)),
+        ).values_list('busy', flat=True).first()
+    except (ValidationError, ValueError):
+        busy = None
 
-    if Reserve.objects.filter(~Q(id=reserve_id), room=room, start_date__lte=start_date, end_date__gte=end_date)\
-        or Reserve.objects.filter(~Q(id=reserve_id), room=room, start_date__gte=start_date, start_date__lte=end_date)\
-            or Reserve.objects.filter(~Q(id=reserve_id), room=room, end_date__gte=start_date, end_date__lte=end_date):
+    if busy is None:
+        msg.append(ROOM_NOT_EXIST)
+    elif busy:
         msg.append(RESERVE_EXIST)
 
     return msg
@@ -141,9 +197,10 @@ class UUIDMixin(models.Model):
 class CreatedMixin(models.Model):
     """Класс, для добавления даты создания."""
 
+    # дата создания - ключ курсорной пагинации REST API, поэтому она обязательна и не меняется
     created = models.DateTimeField(
         _('created'),
-        null=True, blank=True,
+        editable=False,
         default=get_datetime,
         validators=[check_created, ]
     )
@@ -166,6 +223,51 @@ class ModifiedMixin(models.Model):
         abstract = True
 
 
+class LoadedValuesMixin(models.Model):
+    """Класс, запоминающий значения полей, загруженные из базы данных."""
+
+    @classmethod
+    def from_db(cls, db: str, field_names: list, values: list) -> Any:
+        """Создать объект из строки базы данных и запомнить загруженные значения.
+
+        Args:
+            db (str): псевдоним базы данных
+            field_names (list): имена загруженных полей
+            values (list): значения
+
+        Returns:
+            Any: объект
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def changed_fields(self, names: tuple) -> Optional[set]:
+        """Получить поля, изменённые после загрузки или последнего сохранения.
+
+        Args:
+            names (tuple): имена полей в базе данных (attname)
+
+        Returns:
+            Optional[set]: изменённые поля или None, если прежние значения неизвестны
+        """
+        loaded = getattr(self, '_loaded_values', {})
+        if not all(name in loaded for name in names):
+            return None
+        return {name for name in names if loaded[name] != getattr(self, name)}
+
+    def remember_values(self) -> None:
+        """Запомнить текущие значения загруженных полей, например после сохранения."""
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields if field.attname not in deferred
+        }
+
+    class Meta:
+        abstract = True
+
+
 class Address(UUIDMixin, CreatedMixin, ModifiedMixin):
     """Модель для адресса."""
 
@@ -190,6 +292,14 @@ class Address(UUIDMixin, CreatedMixin, ModifiedMixin):
 class HotelManager(models.Manager):
     """Менеджер для отеля."""
 
+    def get_queryset(self) -> models.QuerySet:
+        """Получить отели без поисковых полей.
+
+        Returns:
+            models.QuerySet: отели
+        """
+        return super().get_queryset().defer(*SEARCH_FIELDS)
+
     def create(self, **kwargs: Any) -> Any:
         """Создать.
 
@@ -208,8 +318,60 @@ class HotelManager(models.Manager):
                 raise ValidationError(_('value should not be more than five'))
         return super().create(**kwargs)
 
+    def refresh_search(self, hotel_ids: Optional[list] = None) -> int:
+        """Пересчитать поисковые поля отелей одним UPDATE.
+
+        Args:
+            hotel_ids (Optional[list]): id отелей, все отели, если None. по умолчанию None.
+
+        Returns:
+            int: количество обновлённых строк
+        """
+        hotels = self.all() if hotel_ids is None else self.filter(pk__in=hotel_ids)
+        return hotels.update(**self.search_values())
+
+    def search_values(self) -> dict:
+        """Получить выражения поисковых полей для UPDATE.
+
+        Название весит больше города, город больше улицы.
 
-class Hotel(UUIDMixin, CreatedMixin, ModifiedMixin):
+        Returns:
+            dict: выражения по именам полей
+        """
+        address = Address.objects.filter(pk=OuterRef('hotel_address'))
+        city = Subquery(address.values('city'))
+        street = Subquery(address.values('street'))
+        return {
+            'search_vector': (
+                SearchVector('name', weight='A', config=SEARCH_CONFIG)
+                + SearchVector(city, weight='B', config=SEARCH_CONFIG)
+                + SearchVector(street, weight='C', config=SEARCH_CONFIG)
+            ),
+            'search_text': Func(
+                Value(' '), 'name', city, street, function='concat_ws', output_field=models.TextField(),
+            ),
+        }
+
+    def search(self, text: str) -> models.QuerySet:
+        """Найти отели по названию, городу и улице.
+
+        Отель подходит, если совпал полнотекстовый запрос или слова запроса
+        похожи на слова отеля по триграммам, так что находятся и запросы
+        с опечатками. Оба условия проверяются по GIN-индексам.
+
+        Args:
+            text (str): запрос
+
+        Returns:
+            models.QuerySet: отели с полем score, лучшие первыми
+        """
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        return self.filter(Q(search_vector=query) | Q(search_text__trigram_word_similar=text)).annotate(
+            score=SearchRank(F('search_vector'), query) + TrigramWordSimilarity(text, 'search_text'),
+        ).order_by('-score', 'name', 'id')
+
+
+class Hotel(UUIDMixin, CreatedMixin, ModifiedMixin, LoadedValuesMixin):
     """Модель отеля."""
 
     name = models.TextField(_('name'), null=False, blank=False, max_length=NAMES_MAX_LENGTH)
@@ -220,6 +382,8 @@ class Hotel(UUIDMixin, CreatedMixin, ModifiedMixin):
         default=0,
     )
     image = models.TextField(_('image'), null=True, blank=True, max_length=IMAGE_MAX_LENGTH)
+    search_vector = SearchVectorField(null=True, editable=False)
+    search_text = models.TextField(default='', editable=False)
 
     services = models.ManyToManyField(
         'Service', through='HotelService', verbose_name=_('services')
@@ -236,7 +400,13 @@ class Hotel(UUIDMixin, CreatedMixin, ModifiedMixin):
 
     class Meta:
         db_table = '"hotel"."hotel"'
-        ordering = ['name', 'rating']
+        ordering = ['name', 'rating', 'id']
+        indexes = [
+            models.Index(fields=['name', 'rating', 'id'], name='hotel_keyset_idx'),
+            models.Index(fields=['created'], name='hotel_created_idx'),
+            GinIndex(fields=['search_vector'], name='hotel_search_vector_idx'),
+            GinIndex(fields=['search_text'], opclasses=['gin_trgm_ops'], name='hotel_search_text_trgm_idx'),
+        ]
         verbose_name = _('hotel')
         verbose_name_plural = _('hotels')
 
@@ -306,6 +476,7 @@ class HotelService(UUIDMixin, CreatedMixin):
     class Meta:
         db_table = '"hotel"."hotel_service"'
         unique_together = (('hotel', 'service'),)
+        indexes = [models.Index(fields=['hotel', 'service'], include=['cost'], name='hotel_service_cost_idx')]
         verbose_name = _('Relationship hotel service')
         verbose_name_plural = _('Relationships hotel service')
 
@@ -377,6 +548,10 @@ class Room(UUIDMixin, CreatedMixin, ModifiedMixin):
     class Meta:
         db_table = '"hotel"."room"'
         ordering = ['category', 'floor']
+        indexes = [
+            models.Index(fields=['hotel', 'category', 'floor'], name='room_hotel_order_idx'),
+            models.Index(fields=['created'], name='room_created_idx'),
+        ]
         verbose_name = _('room')
         verbose_name_plural = _('rooms')
 
@@ -397,6 +572,47 @@ class ClientManager(models.Manager):
             check_positive(kwargs['money'])
         return super().create(**kwargs)
 
+    def refresh_summary(self, client_id: Any) -> int:
+        """Пересчитать сводку броней клиента одним UPDATE.
+
+        Вызывается в транзакции бронирования или отмены после изменения
+        баланса, которое блокирует строку клиента, поэтому конкурентные
+        брони одного клиента пересчитывают сводку по очереди.
+
+        Args:
+            client_id (Any): id клиента
+
+        Returns:
+            int: количество обновлённых строк
+        """
+        return self.filter(pk=client_id).update(**self.summary_values())
+
+    def refresh_summaries(self) -> int:
+        """Пересчитать сводку броней всех клиентов одним UPDATE, например после массовой загрузки броней.
+
+        Returns:
+            int: количество обновлённых строк
+        """
+        return self.update(**self.summary_values())
+
+    def summary_values(self) -> dict:
+        """Получить выражения полей сводки броней для UPDATE.
+
+        Returns:
+            dict: выражения по именам полей
+        """
+        today = get_datetime().date()
+        reserves = Reserve.objects.filter(user=OuterRef('pk')).order_by().values('user')
+        active = reserves.filter(end_date__gt=today)
+        return {
+            'active_reserves': Coalesce(Subquery(active.annotate(count=Count('id')).values('count')), 0),
+            'total_spent': Coalesce(Subquery(reserves.annotate(total=Sum('price')).values('total')), Decimal(0)),
+            'next_check_in': Subquery(
+                active.filter(start_date__gte=today).annotate(first=Min('start_date')).values('first'),
+            ),
+            'next_check_out': Subquery(active.annotate(first=Min('end_date')).values('first')),
+        }
+
 
 class Client(UUIDMixin, CreatedMixin, ModifiedMixin):
     """Модель клиента."""
@@ -409,9 +625,34 @@ class Client(UUIDMixin, CreatedMixin, ModifiedMixin):
         validators=[MinValueValidator(0)]
     )
 
+    active_reserves = models.PositiveIntegerField(_('active reserves'), default=0)
+    total_spent = models.DecimalField(_('total spent'), default=0, max_digits=13, decimal_places=2)
+    next_check_in = models.DateField(_('next check-in'), null=True, blank=True)
+    next_check_out = models.DateField(_('next check-out'), null=True, blank=True)
+
     rooms = models.ManyToManyField(Room, through='Reserve', verbose_name=_('rooms'))
     objects = ClientManager()
 
+    def summary_stale(self) -> bool:
+        """Устарела ли сводка броней со сменой дня.
+
+        Сводка меняется без изменения броней, когда наступает дата заезда
+        или выезда, поэтому её нужно пересчитать после этих дат.
+
+        Returns:
+            bool: истина/ложь
+        """
+        today = get_datetime().date()
+        return bool(
+            (self.next_check_in and self.next_check_in < today)
+            or (self.next_check_out and self.next_check_out <= today),
+        )
+
+    def refresh_summary(self) -> None:
+        """Пересчитать сводку броней и перечитать её из базы."""
+        Client.objects.refresh_summary(self.pk)
+        self.refresh_from_db(fields=SUMMARY_FIELDS)
+
     def __str__(self) -> str:
         """Метод строкового представления.
 
@@ -426,6 +667,13 @@ class Client(UUIDMixin, CreatedMixin, ModifiedMixin):
         verbose_name_plural = _('clients')
 
 
+class DateRange(models.Func):
+    """Диапазон дат [start, end) в базе данных."""
+
+    function = 'DATERANGE'
+    output_field = DateRangeField()
+
+
 class ReserveManager(models.Manager):
     """Менеджер для бронирования."""
 
@@ -443,7 +691,7 @@ class ReserveManager(models.Manager):
         return super().create(**kwargs)
 
 
-class Reserve(UUIDMixin, CreatedMixin, ModifiedMixin):
+class Reserve(UUIDMixin, CreatedMixin, ModifiedMixin, LoadedValuesMixin):
     """Модель бронирование."""
 
     user = models.ForeignKey(Client, on_delete=models.CASCADE, verbose_name=_('reserved_user'))
@@ -471,6 +719,21 @@ class Reserve(UUIDMixin, CreatedMixin, ModifiedMixin):
         db_table = '"hotel"."reserve"'
         verbose_name = _('reserve')
         verbose_name_plural = _('reserves')
+        indexes = [
+            models.Index(fields=['room', 'start_date', 'end_date'], name='reserve_room_period_idx'),
+            models.Index(fields=['user', 'start_date'], name='reserve_user_start_idx'),
+            models.Index(fields=['created'], name='reserve_created_idx'),
+            models.Index(fields=['start_date', 'id'], name='reserve_start_idx'),
+        ]
+        constraints = [
+            ExclusionConstraint(
+                name='reserve_room_period_excl',
+                expressions=[
+                    ('room', RangeOperators.EQUAL),
+                    (DateRange('start_date', 'end_date'), RangeOperators.OVERLAPS),
+                ],
+            ),
+        ]
 
     def get_price(self) -> float:
         """Получить цену.
@@ -478,14 +741,15 @@ class Reserve(UUIDMixin, CreatedMixin, ModifiedMixin):
         Returns:
             float: цена
         """
-        return (self.end_date - self.start_date).days * self.room.cost
+        from .pricing import quote  # pricing импортирует модели
+        return quote(self.room, self.start_date, self.end_date)
 
     def clean(self):
         """Чистка."""
         data = {
             'start_date': self.start_date,
             'end_date': self.end_date,
-            'room': self.room.id,
+            'room': self.room_id,
             'reserve': self.id
         }
         validate_reserve(data)
@@ -500,7 +764,9 @@ class Reserve(UUIDMixin, CreatedMixin, ModifiedMixin):
         Returns:
             Any: сохранить
         """
-        self.full_clean()
+        # номер и пересечения проверяет clean, уникальность id и пересечения
+        # дублирует ограничение в базе данных, поэтому лишние запросы не нужны
+        self.full_clean(exclude=['room'], validate_unique=False, validate_constraints=False)
         if not self.price:
             self.price = self.get_price()
         return super().save(*args, **kwargs)
@@ -517,3 +783,28 @@ class ReserveService(UUIDMixin, CreatedMixin, ModifiedMixin):
         unique_together = (('reserve', 'service'),)
         verbose_name = _('Relationship reserve service')
         verbose_name_plural = _('Relationships reserve service')
+
+
+class HotelDailyStats(UUIDMixin, CreatedMixin, ModifiedMixin):
+    """Модель дневной сводки отеля: проданные номера и выручка за ночь."""
+
+    hotel = models.ForeignKey(Hotel, on_delete=models.CASCADE, verbose_name=_('hotel'))
+    day = models.DateField(_('day'))
+    rooms_sold = models.PositiveIntegerField(_('rooms sold'), default=0)
+    revenue = models.DecimalField(_('revenue'), default=0, max_digits=15, decimal_places=4)
+    service_revenue = models.DecimalField(_('service revenue'), default=0, max_digits=15, decimal_places=4)
+
+    def __str__(self) -> str:
+        """Метод строкового представления.
+
+        Returns:
+            str: строка
+        """
+        return f'{self.hotel_id} {self.day}'
+
+    class Meta:
+        db_table = '"hotel"."hotel_daily_stats"'
+        verbose_name = _('hotel daily stats')
+        verbose_name_plural = _('hotel daily stats')
+        constraints = [models.UniqueConstraint(fields=['hotel', 'day'], name='hotel_daily_stats_hotel_day_uniq')]
+        indexes = [models.Index(fields=['day'], name='hotel_daily_stats_day_idx')]
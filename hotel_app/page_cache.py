@@ -0,0 +1,129 @@
+"""Модуль для кэша страниц отелей и номеров.
+
+Отрендеренное содержимое страницы хранится под ключом с версией объекта.
+Версию меняют сигналы при изменении отеля, номера, адреса или услуг
+отеля, так что устаревшая страница больше не находится, а чтение
+страницы не делает запросов к базе.
+
+Версия живёт столько же, сколько страница: истёкшая версия заменяется
+новой, а страница со старой версией просто не находится. Сброс виден
+другим процессам, только если кэш у них общий, поэтому с LocMemCache
+кэш страниц по умолчанию выключен.
+"""
+
+from collections import Counter
+from time import time_ns
+from typing import Any, Awaitable, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.safestring import SafeString, mark_safe
+
+HOTEL = 'hotel'
+ROOM = 'room'
+VERSION_KEY = 'page:{kind}:{id}:version'
+CONTENT_KEY = 'page:{kind}:{id}:{version}'
+DEFAULT_CACHE_TIMEOUT = 600
+
+stats = Counter()
+
+
+def is_enabled() -> bool:
+    """Включён ли кэш страниц.
+
+    Returns:
+        bool: истина/ложь
+    """
+    return getattr(settings, 'PAGE_CACHE', False)
+
+
+def timeout() -> int:
+    """Получить время жизни страницы в кэше.
+
+    Returns:
+        int: секунды
+    """
+    return getattr(settings, 'PAGE_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT)
+
+
+def get_or_render(kind: str, id_: Any, render: Callable[[], str]) -> SafeString:
+    """Получить содержимое страницы из кэша или отрендерить и сохранить его.
+
+    Args:
+        kind (str): HOTEL или ROOM
+        id_ (Any): id объекта
+        render (Callable[[], str]): рендеринг содержимого
+
+    Returns:
+        SafeString: содержимое страницы
+    """
+    if not is_enabled():
+        return render()
+    version_key = VERSION_KEY.format(kind=kind, id=id_)
+    version = cache.get(version_key)
+    if version is None:
+        version = time_ns()
+        # add не перезапишет версию, которую сигнал успел поставить раньше
+        if not cache.add(version_key, version, timeout()):
+            version = cache.get(version_key, version)
+    content_key = CONTENT_KEY.format(kind=kind, id=id_, version=version)
+    content = cache.get(content_key)
+    if content is not None:
+        stats['hit'] += 1
+        # в кэше лежит только содержимое, отрендеренное шаблоном с экранированием
+        return mark_safe(content)  # noqa: S308
+    stats['miss'] += 1
+    content = render()
+    cache.set(content_key, str(content), timeout())
+    return content
+
+
+async def aget_or_render(kind: str, id_: Any, render: Callable[[], Awaitable[str]]) -> SafeString:
+    """Получить содержимое страницы асинхронно, как get_or_render.
+
+    Args:
+        kind (str): HOTEL или ROOM
+        id_ (Any): id объекта
+        render (Callable[[], Awaitable[str]]): асинхронный рендеринг содержимого
+
+    Returns:
+        SafeString: содержимое страницы
+    """
+    if not is_enabled():
+        return await render()
+    version_key = VERSION_KEY.format(kind=kind, id=id_)
+    version = await cache.aget(version_key)
+    if version is None:
+        version = time_ns()
+        if not await cache.aadd(version_key, version, timeout()):
+            version = await cache.aget(version_key, version)
+    content_key = CONTENT_KEY.format(kind=kind, id=id_, version=version)
+    content = await cache.aget(content_key)
+    if content is not None:
+        stats['hit'] += 1
+        return mark_safe(content)  # noqa: S308
+    stats['miss'] += 1
+    content = await render()
+    await cache.aset(content_key, str(content), timeout())
+    return content
+
+
+def invalidate(kind: str, ids: Iterable[Any]) -> None:
+    """Сменить версию страниц объектов.
+
+    Args:
+        kind (str): HOTEL или ROOM
+        ids (Iterable[Any]): id объектов
+    """
+    version = time_ns()
+    cache.set_many({VERSION_KEY.format(kind=kind, id=id_): version for id_ in ids}, timeout())
+
+
+def hit_ratio() -> float:
+    """Получить долю попаданий в кэш.
+
+    Returns:
+        float: доля попаданий
+    """
+    total = stats['hit'] + stats['miss']
+    return stats['hit'] / total if total else 0.0
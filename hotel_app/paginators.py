@@ -0,0 +1,381 @@
+"""Модуль для пагинации больших таблиц."""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from typing import Optional
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connection, models
+from django.db.models import Func, QuerySet, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from django.utils.functional import cached_property
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+DEFAULT_REST_PAGE_SIZE = 50
+DEFAULT_REST_MAX_PAGE_SIZE = 500
+DEFAULT_SEARCH_PAGE_SIZE = 20
+ESTIMATE_THRESHOLD = 10000
+
+
+class Row(Func):
+    """Конструктор строки ROW(...) для сравнения составных ключей."""
+
+    function = 'ROW'
+    output_field = models.Field()
+
+
+def approximate_count(model: type[models.Model]) -> Optional[int]:
+    """Получить оценку количества строк таблицы из статистики планировщика.
+
+    Args:
+        model (type[models.Model]): класс модели
+
+    Returns:
+        Optional[int]: количество строк или None, если статистики ещё нет
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('select reltuples::bigint from pg_class where oid = %s::regclass', [model._meta.db_table])
+        row = cursor.fetchone()
+    if not row or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор, который для большой таблицы без фильтров берёт оценку количества строк.
+
+    Для отфильтрованных запросов и небольших таблиц считается точный COUNT(*).
+    """
+
+    @cached_property
+    def count(self) -> int:
+        """Количество объектов.
+
+        Returns:
+            int: количество
+        """
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = approximate_count(self.object_list.model)
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class KeysetPage:
+    """Страница, полученная поиском по ключу сортировки."""
+
+    def __init__(self, object_list: list, next_cursor: Optional[str], previous_cursor: Optional[str]) -> None:
+        """Создать страницу.
+
+        Args:
+            object_list (list): объекты страницы
+            next_cursor (Optional[str]): курсор следующей страницы
+            previous_cursor (Optional[str]): курсор предыдущей страницы
+        """
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self) -> bool:
+        """Есть ли следующая страница.
+
+        Returns:
+            bool: истина/ложь
+        """
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        """Есть ли предыдущая страница.
+
+        Returns:
+            bool: истина/ложь
+        """
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        """Итерироваться по объектам страницы.
+
+        Returns:
+            _type_: итератор
+        """
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        """Количество объектов на странице.
+
+        Returns:
+            int: количество
+        """
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Пагинатор по уникальному ключу сортировки.
+
+    Страница ищется условием ROW(ключ) > ROW(курсор) по индексу, поэтому
+    любая страница стоит столько же, сколько первая, и не нужен COUNT(*).
+    """
+
+    def __init__(self, queryset: QuerySet, ordering: tuple[str, ...], per_page: int) -> None:
+        """Создать пагинатор.
+
+        Args:
+            queryset (QuerySet): объекты
+            ordering (tuple[str, ...]): поля сортировки, последнее уникально
+            per_page (int): объектов на странице
+        """
+        self.queryset = queryset
+        self.ordering = ordering
+        self.per_page = per_page
+        self.fields = [queryset.model._meta.get_field(name) for name in ordering]
+
+    def encode(self, instance: models.Model) -> str:
+        """Получить курсор объекта.
+
+        Args:
+            instance (models.Model): объект
+
+        Returns:
+            str: курсор
+        """
+        key = [str(getattr(instance, field.attname)) for field in self.fields]
+        return urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    def decode(self, cursor: str) -> list:
+        """Получить значения ключа из курсора.
+
+        Args:
+            cursor (str): курсор
+
+        Raises:
+            ValueError: некорректный курсор
+
+        Returns:
+            list: значения ключа
+        """
+        try:
+            key = json.loads(urlsafe_b64decode(cursor.encode()))
+            if len(key) != len(self.fields):
+                raise ValueError('cursor does not match ordering')
+            return [field.to_python(value) for field, value in zip(self.fields, key)]
+        except Exception as error:
+            raise ValueError(f'invalid cursor: {cursor}') from error
+
+    def _seek(self, cursor: str, lookup: type, ordering: list[str]) -> QuerySet:
+        """Получить запрос per_page + 1 объектов после курсора.
+
+        Args:
+            cursor (str): курсор
+            lookup (type): GreaterThan или LessThan
+            ordering (list[str]): сортировка
+
+        Returns:
+            QuerySet: объекты
+        """
+        key = Row(*[Value(value, output_field=field) for field, value in zip(self.fields, self.decode(cursor))])
+        condition = lookup(Row(*self.ordering), key)
+        return self.queryset.filter(condition).order_by(*ordering)[:self.per_page + 1]
+
+    def _query(self, after: Optional[str], before: Optional[str]) -> QuerySet:
+        """Получить запрос страницы.
+
+        Args:
+            after (Optional[str]): курсор вперёд
+            before (Optional[str]): курсор назад
+
+        Returns:
+            QuerySet: объекты, при before в обратном порядке
+        """
+        if before:
+            return self._seek(before, LessThan, [f'-{name}' for name in self.ordering])
+        if after:
+            return self._seek(after, GreaterThan, list(self.ordering))
+        return self.queryset.order_by(*self.ordering)[:self.per_page + 1]
+
+    def _make_page(self, objects: list, after: Optional[str], before: Optional[str]) -> KeysetPage:
+        """Собрать страницу из результата запроса _query.
+
+        Args:
+            objects (list): объекты
+            after (Optional[str]): курсор вперёд
+            before (Optional[str]): курсор назад
+
+        Returns:
+            KeysetPage: страница
+        """
+        has_more = len(objects) > self.per_page
+        if before:
+            objects = objects[:self.per_page][::-1]
+            previous_cursor = self.encode(objects[0]) if has_more else None
+            next_cursor = self.encode(objects[-1]) if objects else None
+            return KeysetPage(objects, next_cursor, previous_cursor)
+        objects = objects[:self.per_page]
+        next_cursor = self.encode(objects[-1]) if has_more else None
+        previous_cursor = self.encode(objects[0]) if after and objects else None
+        return KeysetPage(objects, next_cursor, previous_cursor)
+
+    def page(self, after: Optional[str] = None, before: Optional[str] = None) -> KeysetPage:
+        """Получить страницу после или перед курсором.
+
+        Args:
+            after (Optional[str]): курсор последнего объекта предыдущей страницы. по умолчанию None.
+            before (Optional[str]): курсор первого объекта следующей страницы. по умолчанию None.
+
+        Returns:
+            KeysetPage: страница
+        """
+        return self._make_page(list(self._query(after, before)), after, before)
+
+    async def apage(self, after: Optional[str] = None, before: Optional[str] = None) -> KeysetPage:
+        """Получить страницу асинхронно.
+
+        Args:
+            after (Optional[str]): курсор последнего объекта предыдущей страницы. по умолчанию None.
+            before (Optional[str]): курсор первого объекта следующей страницы. по умолчанию None.
+
+        Returns:
+            KeysetPage: страница
+        """
+        return self._make_page([instance async for instance in self._query(after, before)], after, before)
+
+
+def page_or_first(paginator: KeysetPaginator, after: Optional[str], before: Optional[str]) -> KeysetPage:
+    """Получить страницу, а при некорректном курсоре первую страницу.
+
+    Args:
+        paginator (KeysetPaginator): пагинатор
+        after (Optional[str]): курсор вперёд
+        before (Optional[str]): курсор назад
+
+    Returns:
+        KeysetPage: страница
+    """
+    try:
+        return paginator.page(after=after, before=before)
+    except ValueError:
+        return paginator.page()
+
+
+async def apage_or_first(paginator: KeysetPaginator, after: Optional[str], before: Optional[str]) -> KeysetPage:
+    """Получить страницу асинхронно, а при некорректном курсоре первую страницу.
+
+    Args:
+        paginator (KeysetPaginator): пагинатор
+        after (Optional[str]): курсор вперёд
+        before (Optional[str]): курсор назад
+
+    Returns:
+        KeysetPage: страница
+    """
+    try:
+        return await paginator.apage(after=after, before=before)
+    except ValueError:
+        return await paginator.apage()
+
+
+class RestCursorPagination(pagination.CursorPagination):
+    """Курсорная пагинация REST API по дате создания.
+
+    Размер страницы задаётся параметром page_size, но не больше
+    REST_MAX_PAGE_SIZE, так что ответ всегда ограничен. Объекты с одной
+    датой создания упорядочены по id.
+    """
+
+    ordering = ('-created', '-id')
+    page_size = getattr(settings, 'REST_PAGE_SIZE', DEFAULT_REST_PAGE_SIZE)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'REST_MAX_PAGE_SIZE', DEFAULT_REST_MAX_PAGE_SIZE)
+
+
+def uncounted_page(queryset: QuerySet, number: int, per_page: int) -> tuple[list, bool]:
+    """Получить страницу без COUNT(*): есть ли следующая, видно по лишней строке.
+
+    Args:
+        queryset (QuerySet): упорядоченные объекты
+        number (int): номер страницы с единицы
+        per_page (int): объектов на странице
+
+    Returns:
+        tuple[list, bool]: объекты страницы и есть ли следующая страница
+    """
+    offset = (number - 1) * per_page
+    rows = list(queryset[offset:offset + per_page + 1])
+    return rows[:per_page], len(rows) > per_page
+
+
+class UncountedPagination(pagination.PageNumberPagination):
+    """Пагинация REST API по номеру страницы без подсчёта всех объектов.
+
+    Для ранжированной выдачи, где курсор по полю невозможен, а COUNT(*)
+    стоил бы столько же, сколько сам поиск.
+    """
+
+    page_size = getattr(settings, 'SEARCH_PAGE_SIZE', DEFAULT_SEARCH_PAGE_SIZE)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'REST_MAX_PAGE_SIZE', DEFAULT_REST_MAX_PAGE_SIZE)
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None) -> list:
+        """Получить объекты страницы.
+
+        Args:
+            queryset (QuerySet): упорядоченные объекты
+            request (_type_): запрос
+            view (_type_): просмотр. по умолчанию None.
+
+        Raises:
+            NotFound: неверный номер страницы
+
+        Returns:
+            list: объекты страницы
+        """
+        self.request = request
+        page_number = request.query_params.get(self.page_query_param, 1)
+        try:
+            self.number = int(page_number)
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message='not a number'))
+        if self.number < 1:
+            raise NotFound(self.invalid_page_message.format(page_number=self.number, message='less than 1'))
+        page, self.has_next = uncounted_page(queryset, self.number, self.get_page_size(request))
+        return page
+
+    def get_paginated_response(self, data) -> Response:
+        """Получить ответ со ссылками на соседние страницы.
+
+        Args:
+            data (_type_): данные страницы
+
+        Returns:
+            Response: ответ
+        """
+        return Response({'next': self.get_next_link(), 'previous': self.get_previous_link(), 'results': data})
+
+    def get_next_link(self) -> Optional[str]:
+        """Получить ссылку на следующую страницу.
+
+        Returns:
+            Optional[str]: ссылка или None
+        """
+        if not self.has_next:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.number + 1)
+
+    def get_previous_link(self) -> Optional[str]:
+        """Получить ссылку на предыдущую страницу.
+
+        Returns:
+            Optional[str]: ссылка или None
+        """
+        if self.number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.number - 1)
@@ -0,0 +1,89 @@
+"""Модуль для расчёта стоимости проживания."""
+
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, NamedTuple
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import HotelService
+
+CACHE_KEY = 'pricing:hotel_services:{hotel_id}'
+DEFAULT_CACHE_TIMEOUT = 300
+
+
+class ServicePrice(NamedTuple):
+    """Услуга отеля и её стоимость за сутки."""
+
+    id: UUID
+    name: str
+    cost: Decimal
+
+
+def hotel_services(hotel_id: Any) -> list[ServicePrice]:
+    """Получить услуги отеля со стоимостью одним запросом.
+
+    Результат кэшируется на отель и сбрасывается сигналами при изменении
+    услуг отеля.
+
+    Args:
+        hotel_id (Any): id отеля
+
+    Returns:
+        list[ServicePrice]: услуги отеля
+    """
+    key = CACHE_KEY.format(hotel_id=hotel_id)
+    services = cache.get(key)
+    if services is None:
+        rows = HotelService.objects.filter(hotel=hotel_id).order_by('service__name').values_list(
+            'service_id', 'service__name', 'cost',
+        )
+        services = [ServicePrice(service_id, name, cost or 0) for service_id, name, cost in rows]
+        cache.set(key, services, getattr(settings, 'PRICING_CACHE_TIMEOUT', DEFAULT_CACHE_TIMEOUT))
+    return services
+
+
+def invalidate(hotel_id: Any) -> None:
+    """Сбросить кэш услуг отеля.
+
+    Args:
+        hotel_id (Any): id отеля
+    """
+    cache.delete(CACHE_KEY.format(hotel_id=hotel_id))
+
+
+def nights(start_date: date, end_date: date) -> int:
+    """Получить количество ночей.
+
+    Args:
+        start_date (date): дата заезда
+        end_date (date): дата выезда
+
+    Returns:
+        int: количество ночей
+    """
+    return (end_date - start_date).days
+
+
+def quote(room: Any, start_date: date, end_date: date, service_ids: Iterable[Any] = ()) -> Decimal:
+    """Рассчитать стоимость проживания в номере с услугами.
+
+    Стоимость услуг берётся из кэша отеля, поэтому расчёт не делает
+    запросов на каждую услугу.
+
+    Args:
+        room (Any): номер
+        start_date (date): дата заезда
+        end_date (date): дата выезда
+        service_ids (Iterable[Any]): id услуг отеля. по умолчанию ().
+
+    Returns:
+        Decimal: стоимость
+    """
+    service_ids = set(service_ids)
+    daily = room.cost or 0
+    if service_ids:
+        daily += sum(service.cost for service in hotel_services(room.hotel_id) if service.id in service_ids)
+    return daily * nights(start_date, end_date)
@@ -0,0 +1,335 @@
+"""Модуль для генерации больших синтетических данных для нагрузочных тестов.
+
+Адреса, отели, услуги, номера, клиенты и брони генерируются векторными
+операциями NumPy из одного seed, поэтому одинаковые параметры дают
+одинаковые данные вместе с id. Брони номера идут подряд с неотрицательными
+промежутками между выездом и следующим заездом и не пересекаются. Номера,
+брони и услуги броней загружаются COPY пачками в несколько потоков, у
+каждого потока своё соединение; остальные таблицы малы и вставляются
+через bulk_create.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.db import connection, models
+from django.utils import timezone
+
+from . import analytics, autocomplete
+from .models import (Address, Client, Hotel, HotelService, Reserve,
+                     ReserveService, Room, Service, class_types)
+
+CATEGORIES = np.array([category for category, _ in class_types])
+BASE_COSTS = {
+    'apartment': 8000, 'business': 6000, 'de luxe': 12000, 'duplex': 9000, 'standart': 3000,
+    'studio': 3500, 'suite': 10000, 'family': 7000, 'single': 2500, 'double': 4000,
+}
+DEFAULT_COST = 5000
+# базовая цена ночи в порядке CATEGORIES
+CATEGORY_COSTS = np.array([BASE_COSTS.get(category, DEFAULT_COST) for category in CATEGORIES])
+CITIES = (
+    'Moscow', 'Saint Petersburg', 'Sochi', 'Kazan', 'Kaliningrad', 'Yekaterinburg',
+    'Novosibirsk', 'Vladivostok', 'Nizhny Novgorod', 'Murmansk', 'Irkutsk', 'Yaroslavl',
+)
+STREETS = ('Lenina', 'Mira', 'Sovetskaya', 'Naberezhnaya', 'Kurortny', 'Sadovaya', 'Pushkina', 'Gagarina')
+SERVICES = (
+    'breakfast', 'dinner', 'parking', 'spa', 'transfer', 'gym', 'laundry', 'late check-out',
+    'pool', 'sauna', 'bike rental', 'pet stay',
+)
+ROOMS_PER_FLOOR = 10
+MAX_NIGHTS = 14
+USERNAME = 'seed-{seed}-{number}'
+
+
+class SeedConfig(NamedTuple):
+    """Параметры данных."""
+
+    hotels: int = 1000
+    rooms: int = 20
+    reserves: int = 1_000_000
+    clients: int = 10_000
+    services: int = 8
+    service_ratio: float = 0.3
+    history: int = 365
+    seed: int = 0
+
+
+class Dataset(NamedTuple):
+    """Сгенерированные данные: столбцы таблиц строками для COPY."""
+
+    addresses: list[Address]
+    hotels: list[Hotel]
+    services: list[Service]
+    hotel_services: list[HotelService]
+    users: list[User]
+    clients: list[Client]
+    rooms: dict[str, list[str]]
+    reserves: dict[str, list[str]]
+    reserve_services: dict[str, list[str]]
+
+
+def uuids(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Сгенерировать UUID версии 4 из генератора.
+
+    Args:
+        rng (np.random.Generator): генератор
+        count (int): количество
+
+    Returns:
+        np.ndarray: UUID строками из 32 шестнадцатеричных цифр
+    """
+    raw = rng.integers(0, 256, size=(count, 16), dtype=np.uint8)
+    raw[:, 6] = raw[:, 6] & 0x0F | 0x40
+    raw[:, 8] = raw[:, 8] & 0x3F | 0x80
+    return np.frombuffer(raw.tobytes().hex().encode(), dtype='S32').astype(str)
+
+
+def strings(values: np.ndarray) -> list[str]:
+    """Получить значения столбца строками для COPY.
+
+    Args:
+        values (np.ndarray): значения
+
+    Returns:
+        list[str]: строки
+    """
+    return values.astype(str).tolist()
+
+
+def service_name(number: int) -> str:
+    """Получить название услуги; после исчерпания списка названия повторяются с номером.
+
+    Args:
+        number (int): номер услуги
+
+    Returns:
+        str: название
+    """
+    name = SERVICES[number % len(SERVICES)]
+    return name if number < len(SERVICES) else f'{name} {number // len(SERVICES)}'
+
+
+def timelines(rng: np.random.Generator, rooms: int, reserves: int, first_day: date) -> tuple[np.ndarray, ...]:
+    """Сгенерировать непересекающиеся брони номеров.
+
+    Каждый номер получает одинаковое число слотов; заезд слота - сумма
+    промежутков и ночей предыдущих слотов, поэтому брони номера идут по
+    порядку и не пересекаются. Лишние слоты последних номеров отбрасываются.
+
+    Args:
+        rng (np.random.Generator): генератор
+        rooms (int): количество номеров
+        reserves (int): количество броней
+        first_day (date): первый день
+
+    Returns:
+        tuple[np.ndarray, ...]: индексы номеров, даты заезда, даты выезда и ночи
+    """
+    slots = -(-reserves // rooms)
+    gaps = rng.geometric(0.4, size=(rooms, slots)) - 1
+    nights = np.minimum(1 + rng.poisson(2, size=(rooms, slots)), MAX_NIGHTS)
+    offsets = np.cumsum(gaps + nights, axis=1) - nights
+    room_index = np.repeat(np.arange(rooms), slots)[:reserves]
+    starts = np.datetime64(first_day, 'D') + offsets.ravel()[:reserves]
+    nights = nights.ravel()[:reserves]
+    return room_index, starts, starts + nights, nights
+
+
+def generate(config: SeedConfig) -> Dataset:
+    """Сгенерировать данные.
+
+    Args:
+        config (SeedConfig): параметры
+
+    Returns:
+        Dataset: данные
+    """
+    rng = np.random.default_rng(config.seed)
+    now = timezone.now()
+    stamp = now.isoformat()
+
+    hotel_ids = uuids(rng, config.hotels)
+    address_ids = uuids(rng, config.hotels)
+    cities = rng.integers(0, len(CITIES), config.hotels)
+    streets = rng.integers(0, len(STREETS), config.hotels)
+    houses = rng.integers(1, 200, config.hotels)
+    ratings = rng.integers(10, 51, config.hotels) / 10
+    addresses = [
+        Address(id=UUID(id_), city=CITIES[city], street=STREETS[street], number=int(house))
+        for id_, city, street, house in zip(address_ids, cities, streets, houses)
+    ]
+    hotels = [
+        Hotel(id=UUID(id_), name=f'{CITIES[city]} hotel {number}', rating=Decimal(f'{rating:.1f}'),
+              hotel_address_id=address.id)
+        for number, (id_, city, rating, address) in enumerate(zip(hotel_ids, cities, ratings, addresses))
+    ]
+
+    service_ids = uuids(rng, config.services)
+    services = [Service(id=UUID(id_), name=service_name(number)) for number, id_ in enumerate(service_ids)]
+    # стоимость услуги за ночь по отелям и услугам
+    service_costs = rng.integers(1, 30, size=(config.hotels, config.services)) * 100
+    hotel_service_ids = uuids(rng, config.hotels * config.services).reshape(config.hotels, config.services)
+    hotel_services = [
+        HotelService(
+            id=UUID(hotel_service_ids[hotel, service]), hotel_id=hotels[hotel].id,
+            service_id=services[service].id, cost=int(service_costs[hotel, service]),
+        )
+        for hotel in range(config.hotels) for service in range(config.services)
+    ]
+
+    users = [User(username=USERNAME.format(seed=config.seed, number=number), password='!')
+             for number in range(config.clients)]
+    client_ids = uuids(rng, config.clients)
+    money = rng.integers(0, 500, config.clients) * 1000
+    clients = [Client(id=UUID(id_), money=int(amount)) for id_, amount in zip(client_ids, money)]
+
+    total_rooms = config.hotels * config.rooms
+    room_ids = uuids(rng, total_rooms)
+    room_hotels = np.repeat(np.arange(config.hotels), config.rooms)
+    positions = np.tile(np.arange(config.rooms), config.hotels)
+    categories = rng.integers(0, len(CATEGORIES), total_rooms)
+    room_costs = (CATEGORY_COSTS[categories] * rng.uniform(0.8, 1.5, total_rooms)).round(-2).astype(np.int64)
+    floors = positions // ROOMS_PER_FLOOR + 1
+    rooms = {
+        'id': room_ids.tolist(),
+        'created': [stamp] * total_rooms,
+        'modified': [stamp] * total_rooms,
+        'category': CATEGORIES[categories].tolist(),
+        'floor': strings(floors),
+        'number': strings(floors * 100 + positions % ROOMS_PER_FLOOR + 1),
+        'cost': strings(room_costs),
+        'hotel_id': hotel_ids[room_hotels].tolist(),
+    }
+
+    room_index, starts, ends, nights = timelines(
+        rng, total_rooms, config.reserves, now.date() - timedelta(days=config.history),
+    )
+    reserve_ids = uuids(rng, len(room_index))
+    with_service = np.flatnonzero(rng.random(len(room_index)) < config.service_ratio)
+    chosen = rng.integers(0, config.services, len(with_service))
+    daily = room_costs[room_index]
+    daily[with_service] += service_costs[room_hotels[room_index[with_service]], chosen]
+    reserves = {
+        'id': reserve_ids.tolist(),
+        'created': [stamp] * len(reserve_ids),
+        'modified': [stamp] * len(reserve_ids),
+        'user_id': client_ids[rng.integers(0, config.clients, len(reserve_ids))].tolist(),
+        'room_id': room_ids[room_index].tolist(),
+        'start_date': strings(starts),
+        'end_date': strings(ends),
+        'price': strings(daily * nights),
+    }
+    reserve_services = {
+        'id': uuids(rng, len(with_service)).tolist(),
+        'created': [stamp] * len(with_service),
+        'modified': [stamp] * len(with_service),
+        'reserve_id': reserve_ids[with_service].tolist(),
+        'service_id': service_ids[chosen].tolist(),
+    }
+    return Dataset(addresses, hotels, services, hotel_services, users, clients, rooms, reserves, reserve_services)
+
+
+def copy_chunk(table: str, columns: list[str], lines: list[str], own_connection: bool) -> int:
+    """Загрузить пачку строк COPY.
+
+    Args:
+        table (str): таблица
+        columns (list[str]): столбцы
+        lines (list[str]): строки через табуляцию
+        own_connection (bool): закрыть соединение потока после пачки
+
+    Returns:
+        int: количество строк
+    """
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f'COPY {table} ({", ".join(columns)}) FROM STDIN', StringIO('\n'.join(lines) + '\n'))
+    finally:
+        if own_connection:
+            connection.close()
+    return len(lines)
+
+
+def copy_rows(model: type[models.Model], values: dict[str, list[str]], chunk_size: int, workers: int) -> int:
+    """Загрузить столбцы в таблицу модели COPY пачками.
+
+    Пачки в потоках фиксируются независимо, поэтому при workers > 1
+    загрузка не атомарна. При workers = 1 загрузка идёт в текущем
+    соединении и его транзакции.
+
+    Args:
+        model (type[models.Model]): модель
+        values (dict[str, list[str]]): значения по столбцам
+        chunk_size (int): строк в пачке
+        workers (int): потоков
+
+    Returns:
+        int: количество строк
+    """
+    columns = list(values)
+    lines = list(map('\t'.join, zip(*values.values())))
+    chunks = [lines[start:start + chunk_size] for start in range(0, len(lines), chunk_size)]
+    table = model._meta.db_table
+    if workers == 1:
+        return sum(copy_chunk(table, columns, chunk, own_connection=False) for chunk in chunks)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(lambda chunk: copy_chunk(table, columns, chunk, own_connection=True), chunks))
+
+
+def load(
+    dataset: Dataset, chunk_size: int = 100_000, workers: int = 4, stats: bool = True,
+) -> dict[str, int]:
+    """Загрузить данные и пересчитать производные сводки.
+
+    Args:
+        dataset (Dataset): данные
+        chunk_size (int): строк в пачке COPY. по умолчанию 100_000.
+        workers (int): потоков COPY. по умолчанию 4.
+        stats (bool): пересчитать дневную сводку отелей. по умолчанию True.
+
+    Returns:
+        dict[str, int]: количество строк по таблицам
+    """
+    Address.objects.bulk_create(dataset.addresses, batch_size=chunk_size)
+    Hotel.objects.bulk_create(dataset.hotels, batch_size=chunk_size)
+    Service.objects.bulk_create(dataset.services, batch_size=chunk_size)
+    HotelService.objects.bulk_create(dataset.hotel_services, batch_size=chunk_size)
+    users = User.objects.bulk_create(dataset.users, batch_size=chunk_size)
+    for client, user in zip(dataset.clients, users):
+        client.user_id = user.id
+    Client.objects.bulk_create(dataset.clients, batch_size=chunk_size)
+    counts = {
+        'hotels': len(dataset.hotels),
+        'services': len(dataset.services),
+        'clients': len(dataset.clients),
+        'rooms': copy_rows(Room, dataset.rooms, chunk_size, workers),
+        'reserves': copy_rows(Reserve, dataset.reserves, chunk_size, workers),
+        'reserve services': copy_rows(ReserveService, dataset.reserve_services, chunk_size, workers),
+    }
+    Client.objects.refresh_summaries()
+    Hotel.objects.refresh_search([hotel.id for hotel in dataset.hotels])
+    autocomplete.index.invalidate()
+    if stats:
+        counts['hotel days'] = analytics.rebuild()
+    with connection.cursor() as cursor:
+        for model in (Hotel, Room, Reserve, ReserveService, Client):
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+    return counts
+
+
+def loaded(config: SeedConfig) -> Optional[User]:
+    """Получить первого пользователя данных с этим seed, если они уже загружены.
+
+    Args:
+        config (SeedConfig): параметры
+
+    Returns:
+        Optional[User]: пользователь или None
+    """
+    return User.objects.filter(username=USERNAME.format(seed=config.seed, number=0)).first()
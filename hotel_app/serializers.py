@@ -1,11 +1,51 @@
 """Модуль для сериализаторов."""
 
-from rest_framework import serializers
+from typing import Any, Optional
 
-from .models import Hotel, Reserve, Room, Service
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import permissions, serializers
 
+from . import autocomplete, export
+from .models import (DATE_END_ERROR, DATE_EQUALLY, NAMES_MAX_LENGTH, Hotel,
+                     Reserve, Room, Service, check_date, class_types)
 
-class HotelSerializer(serializers.HyperlinkedModelSerializer):
+FIELDS_PARAM = 'fields'
+MAX_SUGGESTIONS = 50
+
+
+def requested_fields(request: Any) -> Optional[set[str]]:
+    """Получить поля из параметра ?fields= запроса на чтение.
+
+    Args:
+        request (Any): запрос или None
+
+    Returns:
+        Optional[set[str]]: имена полей или None, если сужать не нужно
+    """
+    if request is None or request.method not in permissions.SAFE_METHODS:
+        return None
+    fields = {name.strip() for name in request.query_params.get(FIELDS_PARAM, '').split(',') if name.strip()}
+    return fields or None
+
+
+class SparseFieldsMixin:
+    """Сериализатор, отдающий только поля из параметра ?fields=."""
+
+    def get_fields(self) -> dict:
+        """Получить поля сериализатора.
+
+        Returns:
+            dict: поля
+        """
+        fields = super().get_fields()
+        selected = requested_fields(self.context.get('request'))
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in selected}
+
+
+class HotelSerializer(SparseFieldsMixin, serializers.HyperlinkedModelSerializer):
     """Отель сериализатор."""
 
     class Meta:
@@ -16,7 +56,38 @@ class HotelSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
 
-class ServiceSerializer(serializers.HyperlinkedModelSerializer):
+class HotelSearchSerializer(HotelSerializer):
+    """Найденный отель сериализатор."""
+
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(HotelSerializer.Meta):
+        fields = HotelSerializer.Meta.fields + ['score']
+
+
+class HotelSearchQuerySerializer(serializers.Serializer):
+    """Параметры поиска отелей."""
+
+    q = serializers.CharField(max_length=NAMES_MAX_LENGTH)
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    """Параметры подсказок поиска."""
+
+    q = serializers.CharField(max_length=NAMES_MAX_LENGTH)
+    limit = serializers.IntegerField(min_value=1, max_value=MAX_SUGGESTIONS, default=autocomplete.DEFAULT_LIMIT)
+
+
+class SuggestionSerializer(serializers.Serializer):
+    """Подсказка поиска сериализатор."""
+
+    kind = serializers.CharField()
+    text = serializers.CharField()
+    rating = serializers.DecimalField(max_digits=2, decimal_places=1)
+    id = serializers.UUIDField(allow_null=True)
+
+
+class ServiceSerializer(SparseFieldsMixin, serializers.HyperlinkedModelSerializer):
     """Сервис сериализатор."""
 
     class Meta:
@@ -27,7 +98,7 @@ class ServiceSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
 
-class RoomSerializer(serializers.HyperlinkedModelSerializer):
+class RoomSerializer(SparseFieldsMixin, serializers.HyperlinkedModelSerializer):
     """Номер сериализатор."""
 
     class Meta:
@@ -38,10 +109,148 @@ class RoomSerializer(serializers.HyperlinkedModelSerializer):
         ]
 
 
-class ReserveSerializer(serializers.ModelSerializer):
+class RoomAvailabilitySerializer(RoomSerializer):
+    """Номер с количеством свободных ночей сериализатор."""
+
+    free_nights = serializers.IntegerField(read_only=True)
+
+    class Meta(RoomSerializer.Meta):
+        fields = RoomSerializer.Meta.fields + ['free_nights']
+
+
+class ReserveSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Бронирование сериализатор."""
 
     class Meta:
         model = Reserve
         fields = ('id', 'room', 'user', 'start_date', 'end_date')
         read_only = True
+
+
+class DateRangeQuerySerializer(serializers.Serializer):
+    """Параметры полуинтервала дат [start, end)."""
+
+    start = serializers.DateField(source='start_date')
+    end = serializers.DateField(source='end_date')
+
+    def validate(self, attrs: dict) -> dict:
+        """Проверить даты.
+
+        Args:
+            attrs (dict): параметры
+
+        Raises:
+            ValidationError: ошибка
+
+        Returns:
+            dict: параметры
+        """
+        if attrs['end_date'] <= attrs['start_date']:
+            raise serializers.ValidationError({'end': DATE_END_ERROR})
+        return attrs
+
+
+class AvailabilityQuerySerializer(DateRangeQuerySerializer):
+    """Параметры поиска свободных номеров."""
+
+    hotel = serializers.UUIDField(required=False)
+    city = serializers.CharField(required=False)
+    category = serializers.ChoiceField(choices=class_types, required=False)
+    max_cost = serializers.DecimalField(max_digits=11, decimal_places=2, required=False)
+    floor = serializers.IntegerField(required=False)
+    free_nights = serializers.BooleanField(required=False, default=False)
+
+
+class QuoteQuerySerializer(DateRangeQuerySerializer):
+    """Параметры расчёта стоимости проживания."""
+
+    room = serializers.UUIDField()
+    services = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Параметры выгрузки бронирований."""
+
+    start = serializers.DateField(required=False, default=None)
+    end = serializers.DateField(required=False, default=None)
+    hotel = serializers.UUIDField(required=False, default=None)
+    output = serializers.ChoiceField(choices=export.FORMATS, required=False, default=export.CSV)
+    gzip = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs: dict) -> dict:
+        """Проверить даты.
+
+        Args:
+            attrs (dict): параметры
+
+        Raises:
+            ValidationError: ошибка
+
+        Returns:
+            dict: параметры
+        """
+        if attrs['start'] and attrs['end'] and attrs['end'] <= attrs['start']:
+            raise serializers.ValidationError({'end': DATE_END_ERROR})
+        return attrs
+
+
+class AnalyticsQuerySerializer(DateRangeQuerySerializer):
+    """Параметры отчёта по загрузке и выручке."""
+
+    hotel = serializers.UUIDField(required=False, default=None)
+
+
+class MonthStatsSerializer(serializers.Serializer):
+    """Загрузка и выручка отеля за месяц сериализатор."""
+
+    month = serializers.DateField(format='%Y-%m')
+    hotel = serializers.UUIDField()
+    hotel_name = serializers.CharField()
+    rooms = serializers.IntegerField()
+    room_nights = serializers.IntegerField()
+    occupancy = serializers.FloatField()
+    revenue = serializers.DecimalField(max_digits=17, decimal_places=2)
+    service_revenue = serializers.DecimalField(max_digits=17, decimal_places=2)
+
+
+class BatchReserveItemSerializer(serializers.Serializer):
+    """Бронь из пакета."""
+
+    room = serializers.UUIDField()
+    user = serializers.UUIDField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    services = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+
+    def validate(self, attrs: dict) -> dict:
+        """Проверить даты и убрать повторы услуг.
+
+        Args:
+            attrs (dict): бронь
+
+        Raises:
+            ValidationError: ошибка
+
+        Returns:
+            dict: бронь
+        """
+        try:
+            check_date(attrs['start_date'])
+        except DjangoValidationError as error:
+            raise serializers.ValidationError({'start_date': error.messages})
+        if attrs['end_date'] < attrs['start_date']:
+            raise serializers.ValidationError({'end_date': DATE_END_ERROR})
+        if attrs['end_date'] == attrs['start_date']:
+            raise serializers.ValidationError({'end_date': DATE_EQUALLY})
+        # услуга в брони уникальна, повтор иначе уронил бы вставку всего пакета
+        attrs['services'] = list(dict.fromkeys(attrs['services']))
+        return attrs
+
+
+class BatchReserveSerializer(serializers.Serializer):
+    """Пакет броней."""
+
+    reserves = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=getattr(settings, 'RESERVE_BATCH_MAX', 500),
+    )
+    all_or_none = serializers.BooleanField(required=False, default=False)
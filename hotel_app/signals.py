@@ -0,0 +1,295 @@
+"""Модуль для обработчиков сигналов."""
+
+from functools import partial
+from typing import Any
+
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import analytics, autocomplete, db_pool, page_cache, pricing
+from .availability_index import index
+from .models import (Address, Client, Hotel, HotelService, Reserve,
+                     ReserveService, Room, Service)
+
+# поля отеля, за изменением которых следят сигналы: поисковые поля собираются
+# из названия и адреса, страницы номеров показывают название и рейтинг отеля
+HOTEL_TRACKED = ('name', 'rating', 'hotel_address_id')
+SEARCH_SOURCES = {'name', 'hotel_address_id'}
+ROOM_PAGE_SOURCES = {'name', 'rating'}
+# поля брони, от которых зависят ночи в сводке отеля
+WINDOW_FIELDS = {'room', 'room_id', 'start_date', 'end_date'}
+WINDOW_ATTNAMES = ('room_id', 'start_date', 'end_date')
+
+
+def invalidate_pages(kind: str, ids: list) -> None:
+    """Сменить версию страниц сразу и ещё раз после фиксации транзакции.
+
+    Вторая смена версии отбрасывает страницы, отрендеренные другими
+    запросами по данным до фиксации.
+
+    Args:
+        kind (str): HOTEL или ROOM
+        ids (list): id объектов
+    """
+    if not ids:
+        return
+    page_cache.invalidate(kind, ids)
+    transaction.on_commit(partial(page_cache.invalidate, kind, ids))
+
+
+def invalidate_prices(hotel_id: Any) -> None:
+    """Сбросить кэш услуг отеля сразу и ещё раз после фиксации транзакции.
+
+    Без второго сброса запрос, прочитавший услуги до фиксации, вернёт
+    в кэш старые цены.
+
+    Args:
+        hotel_id (Any): id отеля
+    """
+    pricing.invalidate(hotel_id)
+    transaction.on_commit(partial(pricing.invalidate, hotel_id))
+
+
+@receiver(pre_save, sender=Reserve)
+def reserve_saving(instance: Reserve, update_fields=None, **kwargs) -> None:
+    """Запомнить прежние ночи брони, если они меняются, чтобы пересчитать их в сводке отеля.
+
+    Прежние ночи берутся из значений, загруженных вместе с бронью, и только
+    для брони, созданной не из базы данных, читаются запросом.
+
+    Args:
+        instance (Reserve): бронь
+        update_fields (_type_): сохраняемые поля или None. по умолчанию None.
+        kwargs (Any): аргументы
+    """
+    instance.stats_window = None
+    if instance._state.adding or (update_fields is not None and not WINDOW_FIELDS & set(update_fields)):
+        return
+    changes = instance.changed_fields(WINDOW_ATTNAMES)
+    if changes is None:
+        instance.stats_window = analytics.reserve_window(instance.id)
+    elif changes:
+        instance.stats_window = analytics.room_window(*(instance._loaded_values[name] for name in WINDOW_ATTNAMES))
+
+
+@receiver(post_save, sender=Reserve)
+def reserve_saved(instance: Reserve, **kwargs) -> None:
+    """Обновить сводку клиента, сводку отеля и индекс занятости после сохранения брони.
+
+    Args:
+        instance (Reserve): бронь
+        kwargs (Any): аргументы
+    """
+    Client.objects.refresh_summary(instance.user_id)
+    window = analytics.instance_window(instance)
+    analytics.schedule_refresh(window)
+    if getattr(instance, 'stats_window', None) not in {None, window}:
+        analytics.schedule_refresh(instance.stats_window)
+    # следующее сохранение сравнивает ночи с сохранёнными сейчас
+    instance.remember_values()
+    transaction.on_commit(partial(
+        index.reserve_saved, instance.id, instance.room_id, instance.start_date, instance.end_date,
+    ))
+
+
+@receiver(post_delete, sender=Reserve)
+def reserve_deleted(instance: Reserve, **kwargs) -> None:
+    """Обновить сводку клиента, сводку отеля и индекс занятости после удаления брони.
+
+    Args:
+        instance (Reserve): бронь
+        kwargs (Any): аргументы
+    """
+    Client.objects.refresh_summary(instance.user_id)
+    analytics.schedule_refresh(analytics.instance_window(instance))
+    transaction.on_commit(partial(index.reserve_deleted, instance.id))
+
+
+@receiver(post_save, sender=ReserveService)
+@receiver(post_delete, sender=ReserveService)
+def reserve_service_changed(instance: ReserveService, **kwargs) -> None:
+    """Пересчитать выручку услуг в сводке отеля за ночи брони.
+
+    Args:
+        instance (ReserveService): услуга брони
+        kwargs (Any): аргументы
+    """
+    analytics.schedule_refresh(analytics.reserve_window(instance.reserve_id))
+
+
+@receiver(post_save, sender=Room)
+def room_saved(instance: Room, created: bool, **kwargs) -> None:
+    """Добавить новый номер в индекс занятости.
+
+    Args:
+        instance (Room): номер
+        created (bool): создан ли номер
+        kwargs (Any): аргументы
+    """
+    if created:
+        transaction.on_commit(partial(index.room_added, instance.id))
+
+
+@receiver(post_delete, sender=Room)
+def room_deleted(instance: Room, **kwargs) -> None:
+    """Удалить номер из индекса занятости.
+
+    Args:
+        instance (Room): номер
+        kwargs (Any): аргументы
+    """
+    transaction.on_commit(partial(index.room_deleted, instance.id))
+
+
+@receiver(post_save, sender=HotelService)
+@receiver(post_delete, sender=HotelService)
+def hotel_service_changed(instance: HotelService, **kwargs) -> None:
+    """Сбросить кэш стоимости услуг отеля.
+
+    Args:
+        instance (HotelService): услуга отеля
+        kwargs (Any): аргументы
+    """
+    invalidate_prices(instance.hotel_id)
+    invalidate_pages(page_cache.HOTEL, [instance.hotel_id])
+
+
+@receiver(post_save, sender=Service)
+def service_saved(instance: Service, **kwargs) -> None:
+    """Сбросить кэш услуг отелей, где есть переименованная услуга.
+
+    Args:
+        instance (Service): услуга
+        kwargs (Any): аргументы
+    """
+    hotel_ids = list(HotelService.objects.filter(service=instance).values_list('hotel_id', flat=True))
+    for hotel_id in hotel_ids:
+        invalidate_prices(hotel_id)
+    invalidate_pages(page_cache.HOTEL, hotel_ids)
+
+
+@receiver(pre_save, sender=Hotel)
+def hotel_saving(instance: Hotel, update_fields=None, **kwargs) -> None:
+    """Запомнить, какие из отслеживаемых полей отеля меняет сохранение.
+
+    Для нового отеля или отеля, созданного не из базы данных, изменёнными
+    считаются все поля.
+
+    Args:
+        instance (Hotel): отель
+        update_fields (_type_): сохраняемые поля или None. по умолчанию None.
+        kwargs (Any): аргументы
+    """
+    changes = None if instance._state.adding else instance.changed_fields(HOTEL_TRACKED)
+    if changes is None:
+        changes = set(HOTEL_TRACKED)
+    if update_fields is not None:
+        changes &= {Hotel._meta.get_field(name).attname for name in update_fields}
+    instance.saved_changes = changes
+
+
+@receiver(post_save, sender=Hotel)
+@receiver(post_delete, sender=Hotel)
+def hotel_changed(instance: Hotel, signal, created: bool = False, **kwargs) -> None:
+    """Сбросить кэш страниц отеля и его номеров, где показаны название и рейтинг отеля.
+
+    Args:
+        instance (Hotel): отель
+        signal (_type_): post_save или post_delete
+        created (bool): создан ли отель. по умолчанию False.
+        kwargs (Any): аргументы
+    """
+    invalidate_pages(page_cache.HOTEL, [instance.id])
+    changes = getattr(instance, 'saved_changes', ROOM_PAGE_SOURCES)
+    # у нового отеля ещё нет номеров
+    if signal is post_save and (created or not ROOM_PAGE_SOURCES & changes):
+        return
+    invalidate_pages(page_cache.ROOM, list(Room.objects.filter(hotel=instance.id).values_list('id', flat=True)))
+
+
+@receiver(post_save, sender=Hotel)
+def hotel_saved(instance: Hotel, **kwargs) -> None:
+    """Пересчитать поисковые поля отеля, если изменились название или адрес, и обновить подсказки.
+
+    Args:
+        instance (Hotel): отель
+        kwargs (Any): аргументы
+    """
+    changes = getattr(instance, 'saved_changes', set(HOTEL_TRACKED))
+    if SEARCH_SOURCES & changes:
+        Hotel.objects.refresh_search([instance.id])
+    if changes:
+        transaction.on_commit(partial(autocomplete.index.hotels_changed, [instance.id]))
+    instance.remember_values()
+
+
+@receiver(post_delete, sender=Hotel)
+def hotel_deleted(instance: Hotel, **kwargs) -> None:
+    """Удалить отель из подсказок поиска.
+
+    Args:
+        instance (Hotel): отель
+        kwargs (Any): аргументы
+    """
+    transaction.on_commit(partial(autocomplete.index.hotel_deleted, instance.id))
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def room_changed(instance: Room, **kwargs) -> None:
+    """Сбросить кэш страницы номера и списка номеров отеля.
+
+    Args:
+        instance (Room): номер
+        kwargs (Any): аргументы
+    """
+    invalidate_pages(page_cache.ROOM, [instance.id])
+    invalidate_pages(page_cache.HOTEL, [instance.hotel_id])
+
+
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+def address_changed(instance: Address, **kwargs) -> None:
+    """Сбросить кэш страниц отелей с этим адресом.
+
+    Args:
+        instance (Address): адрес
+        kwargs (Any): аргументы
+    """
+    hotel_ids = Hotel.objects.filter(hotel_address=instance.id).values_list('id', flat=True)
+    invalidate_pages(page_cache.HOTEL, list(hotel_ids))
+
+
+@receiver(post_save, sender=Address)
+def address_saved(instance: Address, **kwargs) -> None:
+    """Пересчитать поисковые поля и подсказки отелей с этим адресом.
+
+    Args:
+        instance (Address): адрес
+        kwargs (Any): аргументы
+    """
+    Hotel.objects.filter(hotel_address=instance.id).update(**Hotel.objects.search_values())
+    transaction.on_commit(partial(autocomplete.index.address_changed, instance.id))
+
+
+@receiver(request_started)
+def request_counted(**kwargs) -> None:
+    """Посчитать запрос для метрик соединений.
+
+    Args:
+        kwargs (Any): аргументы
+    """
+    db_pool.count('requests')
+
+
+@receiver(connection_created)
+def connection_opened(**kwargs) -> None:
+    """Посчитать открытое соединение с базой данных.
+
+    Args:
+        kwargs (Any): аргументы
+    """
+    db_pool.count('connections')
@@ -0,0 +1,225 @@
+"""Модуль для замера запроса: SQL, шаблоны и сериализаторы.
+
+Middleware включается настройкой REQUEST_TIMING и пишет замер в заголовок
+Server-Timing и строкой JSON в лог hotel_app.timing. Повторы одного SQL с
+разными параметрами считаются дубликатами - так выглядит N+1. Запросы
+медленнее REQUEST_TIMING_SLOW_MS или с дубликатами больше
+REQUEST_TIMING_MAX_DUPLICATES пишутся в лог как предупреждения.
+
+SQL считается на соединении потока middleware, поэтому запросы
+асинхронных страниц из других потоков в замер не попадают.
+"""
+
+import json
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template import base as template_base
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+SLOW_MS = 500
+MAX_DUPLICATES = 5
+current: ContextVar[Optional['RequestTiming']] = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Замер одного запроса."""
+
+    def __init__(self) -> None:
+        """Создать пустой замер."""
+        self.statements = Counter()
+        self.sql_ms = 0.0
+        self.templates_ms = 0.0
+        self.serializers_ms = 0.0
+        self.total_ms = 0.0
+        self.depth = Counter()
+
+    @property
+    def queries(self) -> int:
+        """Количество SQL-запросов.
+
+        Returns:
+            int: количество
+        """
+        return sum(self.statements.values())
+
+    @property
+    def duplicates(self) -> int:
+        """Количество повторов уже выполненного SQL.
+
+        Returns:
+            int: количество
+        """
+        return self.queries - len(self.statements)
+
+    def execute(self, execute: Callable, sql: str, params, many: bool, context: dict):
+        """Выполнить SQL с замером, для connection.execute_wrapper.
+
+        Args:
+            execute (Callable): следующий обработчик
+            sql (str): SQL без параметров
+            params (_type_): параметры
+            many (bool): executemany
+            context (dict): соединение и курсор
+
+        Returns:
+            _type_: результат обработчика
+        """
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_ms += (perf_counter() - start) * 1000
+            self.statements[sql] += 1
+
+    def server_timing(self) -> str:
+        """Получить значение заголовка Server-Timing.
+
+        Returns:
+            str: значение заголовка
+        """
+        return ', '.join((
+            f'sql;dur={self.sql_ms:.1f};desc="{self.queries} queries, {self.duplicates} duplicates"',
+            f'tpl;dur={self.templates_ms:.1f}',
+            f'ser;dur={self.serializers_ms:.1f}',
+            f'total;dur={self.total_ms:.1f}',
+        ))
+
+    def as_dict(self) -> dict:
+        """Получить замер для лога.
+
+        Returns:
+            dict: замер
+        """
+        return {
+            'queries': self.queries,
+            'duplicates': self.duplicates,
+            'sql_ms': round(self.sql_ms, 3),
+            'templates_ms': round(self.templates_ms, 3),
+            'serializers_ms': round(self.serializers_ms, 3),
+            'total_ms': round(self.total_ms, 3),
+        }
+
+
+@contextmanager
+def timed(kind: str):
+    """Добавить время блока к замеру текущего запроса.
+
+    Вложенные блоки того же вида (include в шаблоне, вложенный
+    сериализатор) не считаются второй раз.
+
+    Args:
+        kind (str): templates или serializers
+
+    Yields:
+        None: управление блоку
+    """
+    timing = current.get()
+    if timing is None:
+        yield
+        return
+    timing.depth[kind] += 1
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timing.depth[kind] -= 1
+        if not timing.depth[kind]:
+            setattr(timing, f'{kind}_ms', getattr(timing, f'{kind}_ms') + (perf_counter() - start) * 1000)
+
+
+@contextmanager
+def measure():
+    """Замерить блок: SQL на соединении по умолчанию, шаблоны, сериализаторы и общее время.
+
+    Yields:
+        RequestTiming: замер, заполненный к выходу из блока
+    """
+    timing = RequestTiming()
+    token = current.set(timing)
+    start = perf_counter()
+    try:
+        with connection.execute_wrapper(timing.execute):
+            yield timing
+    finally:
+        timing.total_ms = (perf_counter() - start) * 1000
+        current.reset(token)
+
+
+def timed_call(kind: str, function: Callable) -> Callable:
+    """Обернуть функцию замером.
+
+    Args:
+        kind (str): templates или serializers
+        function (Callable): функция
+
+    Returns:
+        Callable: обёрнутая функция
+    """
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        with timed(kind):
+            return function(*args, **kwargs)
+    wrapper.timed = True
+    return wrapper
+
+
+def install() -> None:
+    """Замерять рендер шаблонов и данные сериализаторов DRF; повторный вызов ничего не делает."""
+    if not getattr(template_base.Template.render, 'timed', False):
+        template_base.Template.render = timed_call('templates', template_base.Template.render)
+    data = serializers.BaseSerializer.data
+    if not getattr(data.fget, 'timed', False):
+        serializers.BaseSerializer.data = property(timed_call('serializers', data.fget))
+
+
+class RequestTimingMiddleware:
+    """Middleware замера запроса."""
+
+    def __init__(self, get_response: Callable) -> None:
+        """Создать middleware, если замер включён.
+
+        Args:
+            get_response (Callable): следующий обработчик
+
+        Raises:
+            MiddlewareNotUsed: замер выключен
+        """
+        if not getattr(settings, 'REQUEST_TIMING', False):
+            raise MiddlewareNotUsed
+        install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Обработать запрос с замером.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: ответ
+        """
+        with measure() as timing:
+            response = self.get_response(request)
+        response['Server-Timing'] = timing.server_timing()
+        response.request_timing = timing
+        slow = (
+            timing.total_ms > getattr(settings, 'REQUEST_TIMING_SLOW_MS', SLOW_MS)
+            or timing.duplicates > getattr(settings, 'REQUEST_TIMING_MAX_DUPLICATES', MAX_DUPLICATES)
+        )
+        line = {'method': request.method, 'path': request.path, 'status': response.status_code, 'slow': slow}
+        line.update(timing.as_dict())
+        if slow:
+            line['repeated'] = [sql for sql, count in timing.statements.most_common(3) if count > 1]
+        logger.log(logging.WARNING if slow else logging.INFO, json.dumps(line, ensure_ascii=False))
+        return response
@@ -1,9 +1,25 @@
 """Модуль для ссылок."""
 
+from django.conf import settings
 from django.urls import include, path
 from rest_framework import routers
 
-from . import views
+from . import async_views, views
+
+read_views = {
+    'homepage': views.HotelListView.as_view(),
+    'hotel': views.hotel,
+    'room': views.room,
+    'book_by_date': views.book_by_date,
+}
+if getattr(settings, 'ASYNC_VIEWS', False):
+    # асинхронные страницы для чтения имеют смысл только под ASGI
+    read_views = {
+        'homepage': async_views.hotel_list,
+        'hotel': async_views.hotel,
+        'room': async_views.room,
+        'book_by_date': async_views.book_by_date,
+    }
 
 router = routers.DefaultRouter()
 router.register(r'hotels', views.HotelViewSet)
@@ -12,15 +28,22 @@ router.register(r'rooms', views.RoomViewSet)
 router.register(r'reserve', views.ReserveViewSet)
 
 urlpatterns = [
+    path('rest/availability/', views.AvailabilityView.as_view(), name='availability'),
+    path('rest/quote/', views.QuoteView.as_view(), name='quote'),
+    path('rest/autocomplete/', views.AutocompleteView.as_view(), name='autocomplete'),
+    path('rest/analytics/', views.AnalyticsView.as_view(), name='analytics'),
+    path('rest/export/reserves/', views.ReserveExportView.as_view(), name='export_reserves'),
+    path('rest/db-pool/', views.DbPoolView.as_view(), name='db_pool'),
     path('rest/', include(router.urls)),
     path('api-auth/', include('rest_framework.urls', namespace='rest_framework')),
-    path('', views.HotelListView.as_view(), name='homepage'),
+    path('', read_views['homepage'], name='homepage'),
     path('accounts/', include('django.contrib.auth.urls')),
     path('register/', views.register, name='register'),
     path('profile/', views.profile, name='profile'),
-    path('hotel/', views.hotel, name='hotel'),
-    path('room/', views.room, name='room'),
+    path('hotel/', read_views['hotel'], name='hotel'),
+    path('room/', read_views['room'], name='room'),
     path('reserve/', views.reserve, name='reserve'),
     path('delete_reserve/', views.delete_reserve, name='delete_reserve'),
-    path('book_by_date/', views.book_by_date, name='book_by_date')
+    path('book_by_date/', read_views['book_by_date'], name='book_by_date'),
+    path('search/', views.search, name='search'),
 ]
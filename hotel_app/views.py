@@ -1,19 +1,53 @@
 """Модуль для просмотра страниц."""
 
-from typing import Any
+from functools import partial
+from hashlib import sha1
+from typing import Any, Optional
+from urllib.parse import urlencode
+from uuid import UUID
 
 from django.contrib.auth import decorators
 from django.core import exceptions
 from django.core import paginator as django_paginator
-from django.shortcuts import redirect, render
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, require_POST
 from django.views.generic import ListView
-from rest_framework import authentication, permissions, viewsets
-
-from .forms import AddFundsForm, BookRoom, RegistrationForm
-from .models import (Client, Hotel, HotelService, Reserve, ReserveService,
-                     Room, Service, check_date, msg_error_reserve)
-from .serializers import (HotelSerializer, ReserveSerializer, RoomSerializer,
-                          ServiceSerializer)
+from rest_framework import (authentication, pagination, permissions, status,
+                            views, viewsets)
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from . import (analytics, autocomplete, availability, availability_index,
+               booking, db_pool, export, fastpath, fragments, page_cache,
+               pricing)
+from .forms import (AddFundsForm, BookRoom, HotelSearchForm,
+                    RegistrationForm, RoomSearchForm)
+from .models import (RESERVE_EXIST, Client, Hotel, Reserve, Room, Service,
+                     check_date, overlapping_reserves, upcoming_first)
+from .paginators import (KeysetPaginator, RestCursorPagination,
+                         UncountedPagination, approximate_count,
+                         page_or_first, uncounted_page)
+from .serializers import (AnalyticsQuerySerializer,
+                          AutocompleteQuerySerializer,
+                          AvailabilityQuerySerializer,
+                          BatchReserveItemSerializer, BatchReserveSerializer,
+                          ExportQuerySerializer, HotelSearchQuerySerializer,
+                          HotelSearchSerializer, HotelSerializer,
+                          MonthStatsSerializer,
+                          QuoteQuerySerializer, ReserveSerializer,
+                          RoomAvailabilitySerializer, RoomSerializer,
+                          ServiceSerializer, SuggestionSerializer,
+                          requested_fields)
+
+FREE_ROOMS_PER_PAGE = 20
+RESERVES_PER_PAGE = 10
+HOTELS_FOUND_PER_PAGE = 10
+HOTEL_ORDERING = ('name', 'rating', 'id')
+DATE_ERROR = 'Дата должна быть больше текущей!'
 
 
 class MyPermission(permissions.BasePermission):
@@ -36,39 +70,339 @@ class MyPermission(permissions.BasePermission):
         return False
 
 
-def create_viewset(model_class, serializer):
+def create_viewset(model_class, serializer, select_related=(), prefetch_related=(), fast_path=False):
     """Создать просмотр модели.
 
+    Списки отдаются курсорными страницами. Параметр ?fields= сужает и поля
+    ответа, и столбцы запроса; связи из select_related и prefetch_related
+    подгружаются, только если попали в выбранные поля.
+
     Args:
         model_class (_type_): класс модели
         serializer (_type_): сериализатор
+        select_related (tuple): связи для select_related. по умолчанию ().
+        prefetch_related (tuple): связи для prefetch_related. по умолчанию ().
+        fast_path (bool): отдавать списки через fastpath, если он включён. по умолчанию False.
 
     Returns:
         _type_: набор моделей
     """
+    columns = {field.name for field in model_class._meta.concrete_fields}
+
     class ViewSet(viewsets.ModelViewSet):
         queryset = model_class.objects.all()
         serializer_class = serializer
         authentication_classes = [authentication.TokenAuthentication]
         permission_classes = [MyPermission]
+        pagination_class = RestCursorPagination
+
+        def get_queryset(self):
+            """Получить объекты с подгрузкой связей и только нужными столбцами.
+
+            Returns:
+                _type_: объекты
+            """
+            queryset = super().get_queryset()
+            joins, prefetches = select_related, prefetch_related
+            selected = requested_fields(self.request)
+            if selected is not None:
+                sources = {field.source.split('.')[0] for field in self.get_serializer().fields.values()}
+                only = (sources & columns) | {name.lstrip('-') for name in self.pagination_class.ordering}
+                queryset = queryset.only(*only)
+                joins = [name for name in joins if name.split('__')[0] in only]
+                prefetches = [name for name in prefetches if name.split('__')[0] in sources]
+            # select_related() без аргументов подгрузил бы все связи
+            if joins:
+                queryset = queryset.select_related(*joins)
+            if prefetches:
+                queryset = queryset.prefetch_related(*prefetches)
+            return queryset
+
+        def list(self, request, *args, **kwargs):
+            """Получить список объектов.
+
+            Args:
+                request (_type_): запрос
+                args (Any): аргументы
+                kwargs (Any): аргументы
+
+            Returns:
+                _type_: ответ
+            """
+            if fast_path and fastpath.is_enabled():
+                response = fastpath.list_response(self, self.filter_queryset(self.get_queryset()))
+                if response is not None:
+                    return response
+            return super().list(request, *args, **kwargs)
 
     return ViewSet
 
 
-HotelViewSet = create_viewset(Hotel, HotelSerializer)
-ServiceViewSet = create_viewset(Service, ServiceSerializer)
-RoomViewSet = create_viewset(Room, RoomSerializer)
-ReserveViewSet = create_viewset(Reserve, ReserveSerializer)
+class HotelViewSet(create_viewset(Hotel, HotelSerializer, fast_path=True)):
+    """Просмотр отелей с поиском."""
+
+    @action(detail=False, pagination_class=UncountedPagination, serializer_class=HotelSearchSerializer)
+    def search(self, request):
+        """Найти отели по названию, городу и улице, лучшие первыми.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: ответ
+        """
+        query = HotelSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        page = self.paginate_queryset(Hotel.objects.search(query.validated_data['q']))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+
+ServiceViewSet = create_viewset(Service, ServiceSerializer, fast_path=True)
+RoomViewSet = create_viewset(Room, RoomSerializer, fast_path=True)
+
+
+class ReserveViewSet(create_viewset(Reserve, ReserveSerializer)):
+    """Просмотр броней с пакетным созданием."""
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """Создать пакет броней в одной транзакции.
+
+        Каждая бронь получает свой результат: id и цену созданной брони или
+        ошибки. С all_or_none пакет сохраняется, только если ошибок нет.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: ответ
+        """
+        batch = BatchReserveSerializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+        all_or_none = batch.validated_data['all_or_none']
+        items = [BatchReserveItemSerializer(data=item) for item in batch.validated_data['reserves']]
+        valid = [item.validated_data for item in items if item.is_valid()]
+        if all_or_none and len(valid) < len(items):
+            booked = iter([booking.BatchResult(None, {booking.NON_FIELD_ERRORS: [booking.BATCH_ABORTED]})] * len(valid))
+        else:
+            booked = iter(booking.book_batch(valid, all_or_none))
+        results = []
+        for index, item in enumerate(items):
+            reserve, errors = next(booked) if not item.errors else (None, item.errors)
+            if reserve is None:
+                results.append({'index': index, 'errors': errors})
+            else:
+                # строкой, как DecimalField сериализаторов
+                results.append({'index': index, 'id': reserve.id, 'price': str(reserve.price)})
+        created = sum('id' in result for result in results)
+        return Response(
+            {'created': created, 'rejected': len(results) - created, 'results': results},
+            status=status.HTTP_201_CREATED if created == len(results) else status.HTTP_207_MULTI_STATUS,
+        )
+
+
+class FreeRoomsPagination(pagination.PageNumberPagination):
+    """Пагинация свободных номеров."""
+
+    page_size = FREE_ROOMS_PER_PAGE
+
+
+def availability_etag(request, *args, **kwargs) -> Optional[str]:
+    """Получить ETag свободных номеров по версии броней в окне дат и параметрам запроса.
+
+    Параметры, включая фильтры и страницу, сортируются, поэтому запросы
+    с одними параметрами в разном порядке получают один ETag.
+
+    Args:
+        request (_type_): запрос
+        args (Any): аргументы
+        kwargs (Any): аргументы
+
+    Returns:
+        Optional[str]: ETag или None для некорректных параметров
+    """
+    query = AvailabilityQuerySerializer(data=request.GET)
+    if not query.is_valid():
+        return None
+    version = availability.availability_version(query.validated_data['start_date'], query.validated_data['end_date'])
+    params = sha1(urlencode(sorted(request.GET.lists()), doseq=True).encode(), usedforsecurity=False).hexdigest()
+    return f'{version}-{params}'
+
+
+class AvailabilityView(views.APIView):
+    """Свободные номера на полуинтервал дат."""
+
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [MyPermission]
+
+    @method_decorator(condition(etag_func=availability_etag))
+    def get(self, request):
+        """Получить свободные номера.
+
+        С параметром free_nights возвращаются номера хотя бы с одной
+        свободной ночью в окне и количество свободных ночей.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: ответ
+        """
+        query = AvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        filters = dict(query.validated_data)
+        if filters.pop('free_nights'):
+            rooms, serializer_class = availability.rooms_free_nights(**filters), RoomAvailabilitySerializer
+        else:
+            rooms, serializer_class = availability.free_rooms(**filters), RoomSerializer
+        paginator = FreeRoomsPagination()
+        page = paginator.paginate_queryset(rooms, request, view=self)
+        serializer = serializer_class(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+
+class AutocompleteView(views.APIView):
+    """Подсказки поиска по началу названия отеля или города.
+
+    Подсказки берутся из индекса в памяти, а названия и города отелей и так
+    видны на главной странице, поэтому ни проверки токена, ни сессии, ни
+    других запросов к базе данных здесь нет.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        """Получить подсказки.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: ответ
+        """
+        query = AutocompleteQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        suggestions = autocomplete.index.suggest(query.validated_data['q'], query.validated_data['limit'])
+        return Response(SuggestionSerializer(suggestions, many=True).data)
+
+
+class QuoteView(views.APIView):
+    """Расчёт стоимости проживания."""
+
+    authentication_classes = [authentication.TokenAuthentication]
+    permission_classes = [MyPermission]
+
+    def get(self, request):
+        """Рассчитать стоимость проживания в номере с услугами.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: ответ
+        """
+        query = QuoteQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        data = query.validated_data
+        room = get_object_or_404(Room.objects.only('id', 'cost', 'hotel_id'), id=data['room'])
+        return Response({
+            'room': room.id,
+            'nights': pricing.nights(data['start_date'], data['end_date']),
+            'price': pricing.quote(room, data['start_date'], data['end_date'], data['services']),
+        })
+
+
+class ReserveExportView(views.APIView):
+    """Потоковая выгрузка бронирований для финансов."""
+
+    authentication_classes = [authentication.TokenAuthentication, authentication.SessionAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        """Выгрузить бронирования в CSV или NDJSON.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: потоковый ответ
+        """
+        query = ExportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        queryset = export.reserves(params['start'], params['end'], params['hotel'])
+        content_type = export.GZIP_CONTENT_TYPE if params['gzip'] else export.CONTENT_TYPES[params['output']]
+        response = StreamingHttpResponse(
+            export.stream(params['output'], queryset, gzip=params['gzip']), content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="{export.filename(params["output"], params["gzip"])}"'
+        return response
+
+
+class AnalyticsView(views.APIView):
+    """Загрузка и выручка отелей по месяцам из дневной сводки."""
+
+    authentication_classes = [authentication.TokenAuthentication, authentication.SessionAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        """Получить отчёт за полуинтервал дат.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: ответ
+        """
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        report = analytics.monthly(params['start_date'], params['end_date'], params['hotel'])
+        return Response({'results': MonthStatsSerializer(report, many=True).data})
+
+
+class DbPoolView(views.APIView):
+    """Метрики постоянных соединений с базой данных процесса."""
+
+    authentication_classes = [authentication.TokenAuthentication, authentication.SessionAuthentication]
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        """Получить метрики.
+
+        Args:
+            request (_type_): запрос
+
+        Returns:
+            _type_: ответ
+        """
+        return Response(db_pool.snapshot())
 
 
 class HotelListView(ListView):
-    """Просмотр списка отелей."""
+    """Просмотр списка отелей.
+
+    Страницы ищутся по ключу (name, rating, id), поэтому глубокие страницы
+    стоят столько же, сколько первая, а количество отелей берётся из
+    статистики планировщика вместо COUNT(*).
+    """
 
     model = Hotel
     template_name = 'index.html'
-    paginate_by = 10
+    paginate_by = None
+    per_page = 10
+    approximate_count = True
     context_object_name = 'hotels'
 
+    def get_queryset(self):
+        """Получить отели.
+
+        Returns:
+            _type_: отели
+        """
+        return Hotel.objects.select_related('hotel_address')
+
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         """получить контекстные данные.
 
@@ -78,12 +412,14 @@ class HotelListView(ListView):
         Args:
             kwargs (Any): аргументы
         """
-        context = super().get_context_data(**kwargs)
-        instances = Hotel.objects.all()
-        paginator = django_paginator.Paginator(instances, 10)
-        page = self.request.GET.get('page')
-        page_obj = paginator.get_page(page)
-        context['hotels_list'] = page_obj
+        paginator = KeysetPaginator(self.object_list, HOTEL_ORDERING, self.per_page)
+        page = page_or_first(paginator, self.request.GET.get('after'), self.request.GET.get('before'))
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
+        context['hotels_list'] = page.object_list
+        context['hotel_cards'] = fragments.render_many(fragments.HOTEL_CARD, page.object_list)
+        context['page'] = page
+        if self.approximate_count:
+            context['hotels_count'] = approximate_count(Hotel)
         return context
 
 
@@ -114,6 +450,37 @@ def register(request):
     )
 
 
+def render_hotel_content(id_: UUID) -> str:
+    """Отрендерить содержимое страницы отеля.
+
+    Args:
+        id_ (UUID): id отеля
+
+    Returns:
+        str: содержимое
+    """
+    hotel = Hotel.objects.select_related('hotel_address').filter(id=id_).first()
+    context = {
+        'hotel': hotel,
+        'room_tiles': fragments.render_many(fragments.ROOM_TILE, Room.objects.filter(hotel=id_)),
+        'services': pricing.hotel_services(id_) if hotel else [],
+    }
+    return render_to_string('content/hotel.html', context)
+
+
+def render_room_content(id_: UUID) -> str:
+    """Отрендерить содержимое страницы номера.
+
+    Args:
+        id_ (UUID): id номера
+
+    Returns:
+        str: содержимое
+    """
+    room = Room.objects.select_related('hotel').filter(id=id_).first()
+    return render_to_string('content/room.html', {'room': room})
+
+
 def hotel(request):
     """Отель.
 
@@ -127,15 +494,14 @@ def hotel(request):
     if not id_:
         return redirect('homepage')
     try:
-        hotel = Hotel.objects.get(id=id_) if id_ else None
-        rooms = Room.objects.filter(hotel=id_) if id_ else None
-    except exceptions.ValidationError:
+        id_ = UUID(id_)
+    except ValueError:
         return redirect('homepage')
-    context = {'hotel': hotel, 'rooms': rooms}
+    content = page_cache.get_or_render(page_cache.HOTEL, id_, partial(render_hotel_content, id_))
     return render(
         request,
         'hotel.html',
-        context
+        {'content': content}
     )
 
 
@@ -152,19 +518,21 @@ def room(request):
     if not id_:
         return redirect('homepage')
     try:
-        room = Room.objects.get(id=id_)
-    except exceptions.ValidationError:
+        id_ = UUID(id_)
+    except ValueError:
         return redirect('homepage')
-    context = {'room': room}
+    content = page_cache.get_or_render(page_cache.ROOM, id_, partial(render_room_content, id_))
     return render(
         request,
         'room.html',
-        context
+        {'content': content}
     )
 
 
+@decorators.login_required
+@require_POST
 def delete_reserve(request):
-    """Удалить бронирование.
+    """Удалить бронирование пользователя.
 
     Args:
         request (_type_): запрос
@@ -172,22 +540,60 @@ def delete_reserve(request):
     Returns:
         _type_: ответ
     """
-    client = Client.objects.get(user=request.user)
     id_ = request.GET.get('id', None)
     try:
-        reserve = Reserve.objects.get(id=id_)
+        reserve = Reserve.objects.get(id=id_, user__user=request.user)
     except exceptions.ValidationError:
         return redirect('homepage')
-    reserve.delete()
-    client.money += reserve.price
-    client.save()
+    except Reserve.DoesNotExist:
+        return redirect('profile')
+    try:
+        booking.cancel_reserve(reserve)
+    except Reserve.DoesNotExist:
+        pass
     return redirect('profile')
 
 
+def search(request):
+    """Поиск отелей.
+
+    Args:
+        request (_type_): запрос
+
+    Returns:
+        _type_: ответ
+    """
+    hotels, has_next, number = None, False, 1
+    form = HotelSearchForm(request.GET) if 'q' in request.GET else HotelSearchForm()
+    if form.is_bound and form.is_valid():
+        try:
+            number = max(int(request.GET.get('page', 1)), 1)
+        except ValueError:
+            number = 1
+        hotels, has_next = uncounted_page(
+            Hotel.objects.search(form.cleaned_data['q']).select_related('hotel_address'), number, HOTELS_FOUND_PER_PAGE,
+        )
+    return render(
+        request,
+        'search.html',
+        {
+            'form': form,
+            'hotel_cards': fragments.render_many(fragments.HOTEL_CARD, hotels or []),
+            'searched': hotels is not None,
+            'query': form.data.get('q', ''),
+            'previous_page': number - 1 if number > 1 else None,
+            'next_page': number + 1 if has_next else None,
+        }
+    )
+
+
 @decorators.login_required
 def profile(request):
     """Профиль.
 
+    Сводка броней берётся из полей клиента, а брони загружаются страницей
+    вместе с номером и отелем.
+
     Args:
         request (_type_): запрос
 
@@ -198,25 +604,38 @@ def profile(request):
     if request.method == 'POST':
         form = AddFundsForm(request.POST)
         if form.is_valid():
-            money = form.cleaned_data.get('money')
-            client.money += money
-            client.save()
+            Client.objects.filter(pk=client.pk).update(money=F('money') + form.cleaned_data.get('money'))
+            client.refresh_from_db(fields=['money'])
     else:
         form = AddFundsForm()
+    if client.summary_stale():
+        client.refresh_summary()
 
+    paginator = django_paginator.Paginator(upcoming_first(Reserve.objects.filter(user=client)), RESERVES_PER_PAGE)
+    page = paginator.get_page(request.GET.get('page'))
     return render(
         request,
         'profile.html',
         {
             'form': form,
-            'client_data': {'username': client.user.username, 'money': client.money},
-            'reserve': Reserve.objects.filter(user=client)
+            'client_data': {
+                'username': request.user.username,
+                'money': client.money,
+                'active bookings': client.active_reserves,
+                'total spent': client.total_spent,
+                'next check-in': client.next_check_in or '-',
+            },
+            'reserve': page,
         }
     )
 
 
 def check_reserve(data: dict) -> list[str]:
-    """Проверить бронирование.
+    """Проверить бронирование до транзакции.
+
+    Пересечения окончательно проверяются при бронировании под блокировкой
+    номера, здесь отсекаются заведомо невозможные брони. Занятость по индексу
+    подтверждается запросом к базе данных.
 
     Args:
         data (dict): словарь с данными о бронировании
@@ -231,9 +650,11 @@ def check_reserve(data: dict) -> list[str]:
     except exceptions.ValidationError:
         msg.append('Дата должна быть больше текущей!')
 
-    msg_error = msg_error_reserve(data)
-    if msg_error:
-        msg += msg_error
+    # индекс может отставать от других процессов, поэтому занятость по нему - только подсказка
+    if availability_index.is_enabled():
+        is_free = availability_index.index.is_free(data['room'], data['start_date'], data['end_date'])
+        if is_free is False and overlapping_reserves(data['room'], data['start_date'], data['end_date']).exists():
+            msg.append(RESERVE_EXIST)
 
     return msg
 
@@ -258,41 +679,21 @@ def reserve(request):
     reserve_room = Reserve.objects.filter(room=room)
     client = Client.objects.get(user=request.user)
     form_errors = []
-    services = room.hotel.services.all()
+    services = pricing.hotel_services(room.hotel_id)
     if request.method == 'POST':
         form = BookRoom(request.POST)
         if form.is_valid():
             start_date = form.cleaned_data.get('start_date')
             end_date = form.cleaned_data.get('end_date')
-            reserve = Reserve(user=client, room=room, start_date=start_date, end_date=end_date)
-
-            data = {
-                'start_date': start_date,
-                'end_date': end_date,
-                'room': room_id,
-                'reserve': reserve.id,
-            }
-            form_errors += check_reserve(data)
-
-            price = reserve.get_price()
-            service_reserve = []
-            for service in services:
-                value = request.POST.get(service.name)
-                if value:
-                    service_cost = HotelService.objects.get(hotel=room.hotel, service=service).cost
-                    price += service_cost * (end_date - start_date).days
-                    service_reserve.append(ReserveService(reserve=reserve, service=service))
-
-            reserve.price = price
-            if client.money < reserve.price:
-                form_errors.append(f'Недостаточно средств! текущая цена:{reserve.price} у вас на счету: {client.money}')
+            form_errors += check_reserve({'start_date': start_date, 'end_date': end_date, 'room': room.id})
             if not form_errors:
-                client.money -= reserve.price
-                client.save()
-                reserve.save()
-                for service in service_reserve:
-                    service.save()
-                return redirect('profile')
+                selected = [service.id for service in services if request.POST.get(service.name)]
+                try:
+                    booking.book_room(client, room, start_date, end_date, selected)
+                except exceptions.ValidationError as error:
+                    form_errors += error.messages
+                else:
+                    return redirect('profile')
     else:
         form = BookRoom()
 
@@ -320,28 +721,27 @@ def book_by_date(request):
         _type_: ответ
     """
     form_errors = []
-    reserves = []
     free_rooms = None
-    if request.method == 'POST':
-        form = BookRoom(request.POST)
+    query = ''
+    data = request.POST if request.method == 'POST' else request.GET
+    if 'start_date' in data:
+        form = RoomSearchForm(data)
         if form.is_valid():
-            start_date = form.cleaned_data.get('start_date')
-            end_date = form.cleaned_data.get('end_date')
             try:
-                check_date(start_date)
-                check_date(end_date)
+                check_date(form.cleaned_data['start_date'])
+                check_date(form.cleaned_data['end_date'])
             except exceptions.ValidationError:
-                form_errors.append('Дата должна быть больше текущей!')
-            reserves += Reserve.objects.filter(start_date__lte=start_date, end_date__gte=end_date)
-            reserves += Reserve.objects.filter(start_date__gte=start_date, start_date__lte=end_date)
-            reserves += Reserve.objects.filter(end_date__gte=start_date, end_date__lte=end_date)
-            rooms = []
-            for reserve in reserves:
-                rooms.append(reserve.room.id)
-            free_rooms = Room.objects.exclude(id__in=rooms) if rooms else Room.objects.all()
-
+                form_errors.append(DATE_ERROR)
+            paginator = django_paginator.Paginator(
+                availability.free_rooms(**form.cleaned_data), FREE_ROOMS_PER_PAGE,
+            )
+            free_rooms = paginator.get_page(request.GET.get('page'))
+            params = data.copy()
+            for excluded in ('page', 'csrfmiddlewaretoken'):
+                params.pop(excluded, None)
+            query = params.urlencode()
     else:
-        form = BookRoom()
+        form = RoomSearchForm()
 
     return render(
         request,
@@ -350,5 +750,6 @@ def book_by_date(request):
             'form': form,
             'form_errors': form_errors,
             'rooms': free_rooms,
+            'query': query,
         }
     )
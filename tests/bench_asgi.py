@@ -0,0 +1,155 @@
+"""Модуль для замера синхронных страниц под WSGI и асинхронных под ASGI.
+
+Каждая волна из CONCURRENCY запросов приходит одновременно, как от
+CONCURRENCY соединений. WSGI обслуживает её пулом из WSGI_THREADS потоков,
+ASGI - одним циклом событий. Время ответа считается от начала волны.
+
+Запуск: ./tests/test.sh tests.bench_asgi
+"""
+
+import asyncio
+from queue import Queue
+from random import Random
+from statistics import quantiles
+from threading import Thread
+from time import perf_counter
+
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import (AsyncClient, Client, TransactionTestCase,
+                         override_settings)
+from django.urls import include, path
+
+from hotel_app import async_views
+from hotel_app.models import Address, Hotel, Room
+
+HOTELS = 200
+ROOMS_PER_HOTEL = 20
+REQUESTS = 5000
+CONCURRENCY = 500
+WSGI_THREADS = 32
+SEED = 17
+
+urlpatterns = [
+    path('async/', async_views.hotel_list),
+    path('async/hotel/', async_views.hotel),
+    path('async/room/', async_views.room),
+    path('', include('hotel.urls')),
+]
+
+
+def wsgi_worker(jobs: Queue, timings: list[float]) -> None:
+    """Обслуживать запросы из очереди, пока не придёт None.
+
+    Args:
+        jobs (Queue): ссылки и время начала волны
+        timings (list[float]): время ответов в миллисекундах
+    """
+    client = Client()
+    try:
+        for url, start in iter(jobs.get, None):
+            client.get(url)
+            timings.append((perf_counter() - start) * 1000)
+            jobs.task_done()
+    finally:
+        connection.close()
+
+
+@override_settings(ROOT_URLCONF='tests.bench_asgi', PAGE_CACHE=False)
+class BenchAsgi(TransactionTestCase):
+    """Замер страниц отелей, номеров и списка отелей при CONCURRENCY соединениях."""
+
+    def setUp(self) -> None:
+        """Заполнить базу данных."""
+        addresses = Address.objects.bulk_create(
+            Address(city=f'city {number}', street='street', number=1) for number in range(HOTELS)
+        )
+        self.hotels = Hotel.objects.bulk_create(
+            Hotel(name=f'hotel {number}', rating=4, hotel_address=address) for number, address in enumerate(addresses)
+        )
+        self.rooms = Room.objects.bulk_create(
+            Room(category='single', floor=floor, number=floor, cost=10, hotel=hotel)
+            for hotel in self.hotels for floor in range(1, ROOMS_PER_HOTEL + 1)
+        )
+
+    def urls(self, prefix: str) -> list[str]:
+        """Получить одинаковую для каждого замера последовательность ссылок.
+
+        Args:
+            prefix (str): префикс страниц
+
+        Returns:
+            list[str]: ссылки
+        """
+        random = Random(SEED)
+        urls = []
+        for _ in range(REQUESTS):
+            kind = random.random()
+            if kind < 0.4:
+                urls.append(f'/{prefix}hotel/?id={random.choice(self.hotels).id}')
+            elif kind < 0.8:
+                urls.append(f'/{prefix}room/?id={random.choice(self.rooms).id}')
+            else:
+                urls.append(f'/{prefix}')
+        return urls
+
+    def run_wsgi(self, urls: list[str]) -> list[float]:
+        """Выполнить запросы через WSGI пулом потоков.
+
+        Args:
+            urls (list[str]): ссылки
+
+        Returns:
+            list[float]: время ответов в миллисекундах
+        """
+        jobs, timings = Queue(), []
+        workers = [Thread(target=wsgi_worker, args=(jobs, timings)) for _ in range(WSGI_THREADS)]
+        for worker in workers:
+            worker.start()
+        for offset in range(0, len(urls), CONCURRENCY):
+            start = perf_counter()
+            for url in urls[offset:offset + CONCURRENCY]:
+                jobs.put((url, start))
+            jobs.join()
+        for _ in workers:
+            jobs.put(None)
+        for worker in workers:
+            worker.join()
+        return timings
+
+    async def run_asgi(self, urls: list[str]) -> list[float]:
+        """Выполнить запросы через ASGI в одном цикле событий.
+
+        Args:
+            urls (list[str]): ссылки
+
+        Returns:
+            list[float]: время ответов в миллисекундах
+        """
+        client, timings = AsyncClient(), []
+
+        async def get(url: str, start: float) -> None:
+            await client.get(url)
+            timings.append((perf_counter() - start) * 1000)
+
+        for offset in range(0, len(urls), CONCURRENCY):
+            start = perf_counter()
+            await asyncio.gather(*(get(url, start) for url in urls[offset:offset + CONCURRENCY]))
+        return timings
+
+    def test_bench(self):
+        """Сравнить WSGI и ASGI."""
+        print(f'\n{REQUESTS} requests, {CONCURRENCY} connections, {WSGI_THREADS} WSGI threads, seed {SEED}')
+        runs = (
+            ('wsgi', self.run_wsgi, self.urls('')),
+            ('asgi', async_to_sync(self.run_asgi), self.urls('async/')),
+        )
+        for name, run, urls in runs:
+            start = perf_counter()
+            timings = run(urls)
+            elapsed = perf_counter() - start
+            percentiles = quantiles(timings, n=100)
+            print(
+                f'{name} {len(urls) / elapsed:7.0f} req/s p50 {percentiles[49]:8.2f} ms '
+                f'p95 {percentiles[94]:8.2f} ms p99 {percentiles[98]:8.2f} ms',
+            )
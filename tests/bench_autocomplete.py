@@ -0,0 +1,77 @@
+"""Модуль для замера подсказок поиска из памяти и из базы данных.
+
+Запуск: ./tests/test.sh tests.bench_autocomplete
+"""
+
+from random import Random
+from statistics import quantiles
+from time import perf_counter
+
+from django.test import TestCase
+
+from hotel_app import autocomplete
+from hotel_app.models import Address, Hotel
+
+HOTELS = 100_000
+CITIES = 1000
+WORDS = ('grand', 'palace', 'river', 'plaza', 'royal', 'park', 'central', 'garden', 'harbour', 'tower')
+REQUESTS = 2000
+SEED = 17
+
+
+class BenchAutocomplete(TestCase):
+    """Замер подсказок для коротких и длинных префиксов."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Заполнить базу данных."""
+        random = Random(SEED)
+        addresses = Address.objects.bulk_create(
+            Address(city=f'city {number}', street='street', number=1) for number in range(CITIES)
+        )
+        Hotel.objects.bulk_create(
+            (
+                Hotel(
+                    name=f'{" ".join(random.sample(WORDS, 2))} {number}', rating=random.randint(0, 50) / 10,
+                    hotel_address=random.choice(addresses),
+                )
+                for number in range(HOTELS)
+            ),
+            batch_size=10_000,
+        )
+        names = list(Hotel.objects.values_list('name', flat=True)[:REQUESTS])
+        cls.prefixes = [name[:random.randint(1, len(name))] for name in names]
+
+    def run_load(self, suggest) -> list[float]:
+        """Запросить подсказки для всех префиксов.
+
+        Args:
+            suggest (_type_): функция подсказок по префиксу
+
+        Returns:
+            list[float]: время в микросекундах
+        """
+        timings = []
+        for prefix in self.prefixes:
+            start = perf_counter()
+            suggest(prefix)
+            timings.append((perf_counter() - start) * 10 ** 6)
+        return timings
+
+    def test_bench(self):
+        """Сравнить индекс в памяти с запросом istartswith по рейтингу."""
+        index = autocomplete.AutocompleteIndex()
+        start = perf_counter()
+        index.build()
+        print(f'\n{HOTELS} hotels, {REQUESTS} prefixes, seed {SEED}, index built in {perf_counter() - start:.2f}s')
+        loads = {
+            'index': index.suggest,
+            'database': lambda prefix: list(
+                Hotel.objects.filter(name__istartswith=prefix).order_by('-rating').values_list('name', flat=True)[
+                    :autocomplete.DEFAULT_LIMIT
+                ],
+            ),
+        }
+        for name, suggest in loads.items():
+            percentiles = quantiles(self.run_load(suggest), n=100)
+            print(f'{name:<8} p50 {percentiles[49]:10.1f} us p99 {percentiles[98]:10.1f} us')
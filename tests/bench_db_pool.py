@@ -0,0 +1,77 @@
+"""Модуль для замера запросов с новым и постоянным соединением с базой данных.
+
+Запросы выполняются через WSGIHandler, как под сервером, поэтому
+соединение закрывается или переиспользуется по CONN_MAX_AGE. Для замера
+через pgbouncer запустить с PG_PORT порта pgbouncer и PG_BOUNCER=on.
+
+Запуск: ./tests/test.sh tests.bench_db_pool
+"""
+
+from random import Random
+from statistics import quantiles
+from time import perf_counter
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from hotel_app import db_pool
+from hotel_app.models import Address, Hotel, Room
+from tests.test_db_pool import connection_profile
+
+HOTELS = 200
+ROOMS_PER_HOTEL = 20
+REQUESTS = 2000
+SEED = 17
+
+
+@override_settings(PAGE_CACHE=False)
+class BenchDbPool(TransactionTestCase):
+    """Замер страниц отелей и номеров с CONN_MAX_AGE=0 и постоянным соединением."""
+
+    def setUp(self) -> None:
+        """Заполнить базу данных."""
+        addresses = Address.objects.bulk_create(
+            Address(city=f'city {number}', street='street', number=1) for number in range(HOTELS)
+        )
+        self.hotels = Hotel.objects.bulk_create(
+            Hotel(name=f'hotel {number}', rating=4, hotel_address=address) for number, address in enumerate(addresses)
+        )
+        self.rooms = Room.objects.bulk_create(
+            Room(category='single', floor=floor, number=floor, cost=10, hotel=hotel)
+            for hotel in self.hotels for floor in range(1, ROOMS_PER_HOTEL + 1)
+        )
+
+    def run_load(self) -> list[float]:
+        """Выполнить одинаковую для каждого замера последовательность запросов.
+
+        Returns:
+            list[float]: время ответов в миллисекундах
+        """
+        handler, factory, random = WSGIHandler(), RequestFactory(), Random(SEED)
+        timings = []
+        for _ in range(REQUESTS):
+            if random.random() < 0.5:
+                url = f"{reverse('hotel')}?id={random.choice(self.hotels).id}"
+            else:
+                url = f"{reverse('room')}?id={random.choice(self.rooms).id}"
+            start = perf_counter()
+            handler(factory.get(url).environ, lambda status, headers: None).close()
+            timings.append((perf_counter() - start) * 1000)
+        return timings
+
+    def test_bench(self):
+        """Сравнить новое соединение на каждый запрос с постоянным."""
+        print(f'\n{REQUESTS} requests, seed {SEED}')
+        for conn_max_age in (0, 60):
+            db_pool.stats.clear()
+            with connection_profile(conn_max_age):
+                start = perf_counter()
+                timings = self.run_load()
+                elapsed = perf_counter() - start
+            percentiles = quantiles(timings, n=100)
+            print(
+                f'CONN_MAX_AGE={conn_max_age:<2} {REQUESTS / elapsed:6.0f} req/s p50 {percentiles[49]:7.3f} ms '
+                f'p99 {percentiles[98]:7.3f} ms connections {db_pool.stats["connections"]} '
+                f'reuse {db_pool.reuse_ratio():.2%}',
+            )
@@ -0,0 +1,61 @@
+"""Модуль для замера скорости отдачи списков REST API.
+
+Запуск: ./tests/test.sh tests.bench_fastpath
+"""
+
+from statistics import median
+from time import perf_counter
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from hotel_app.models import Hotel, Room
+from hotel_app.paginators import RestCursorPagination
+
+ROWS = 10000
+REPEATS = 10
+URLS = (f'/rest/hotels/?page_size={ROWS}', f'/rest/rooms/?page_size={ROWS}')
+
+
+class BenchFastPath(TestCase):
+    """Замер сериализаторов и быстрого пути на страницах по 10 тысяч строк."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Заполнить базу данных."""
+        cls.user = User.objects.create_user(username='bench', password='bench')
+        hotels = Hotel.objects.bulk_create(Hotel(name=f'hotel {number}', rating=4) for number in range(ROWS))
+        Room.objects.bulk_create(
+            Room(category='single', floor=1, number=1, cost=10, hotel=hotel) for hotel in hotels
+        )
+
+    def measure(self, url: str, fast: bool) -> float:
+        """Замерить медианное время ответа.
+
+        Args:
+            url (str): ссылка
+            fast (bool): включить быстрый путь
+
+        Returns:
+            float: время в миллисекундах
+        """
+        timings = []
+        with override_settings(REST_FAST_PATH=fast):
+            for _ in range(REPEATS):
+                start = perf_counter()
+                response = self.client.get(url)
+                timings.append((perf_counter() - start) * 1000)
+        self.assertEqual(len(response.json()['results']), ROWS)
+        return median(timings)
+
+    def test_bench(self):
+        """Сравнить сериализаторы и быстрый путь."""
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        print(f'\n{ROWS} rows per page, median of {REPEATS} runs')
+        with mock.patch.object(RestCursorPagination, 'max_page_size', ROWS):
+            for url in URLS:
+                serializer, fast = self.measure(url, fast=False), self.measure(url, fast=True)
+                print(f'{url:<40} serializer {serializer:9.3f} ms fast path {fast:9.3f} ms x{serializer / fast:.1f}')
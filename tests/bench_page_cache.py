@@ -0,0 +1,76 @@
+"""Модуль для замера кэша страниц отелей и номеров.
+
+Запуск: ./tests/test.sh tests.bench_page_cache
+"""
+
+from random import Random
+from statistics import quantiles
+from time import perf_counter
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from hotel_app import page_cache
+from hotel_app.models import Address, Hotel, Room
+
+HOTELS = 200
+ROOMS_PER_HOTEL = 20
+REQUESTS = 5000
+WRITE_RATIO = 0.02
+SEED = 17
+
+
+class BenchPageCache(TestCase):
+    """Замер страниц отелей и номеров под нагрузкой с редкими изменениями."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Заполнить базу данных."""
+        addresses = Address.objects.bulk_create(
+            Address(city=f'city {number}', street='street', number=1) for number in range(HOTELS)
+        )
+        cls.hotels = Hotel.objects.bulk_create(
+            Hotel(name=f'hotel {number}', rating=4, hotel_address=address) for number, address in enumerate(addresses)
+        )
+        cls.rooms = Room.objects.bulk_create(
+            Room(category='single', floor=floor, number=floor, cost=10, hotel=hotel)
+            for hotel in cls.hotels for floor in range(1, ROOMS_PER_HOTEL + 1)
+        )
+
+    def run_load(self) -> list[float]:
+        """Выполнить одинаковую для каждого замера последовательность запросов.
+
+        Returns:
+            list[float]: время ответов в миллисекундах
+        """
+        random = Random(SEED)
+        timings = []
+        for _ in range(REQUESTS):
+            if random.random() < WRITE_RATIO:
+                hotel = random.choice(self.hotels)
+                hotel.rating = random.randint(0, 5)
+                hotel.save()
+                continue
+            if random.random() < 0.5:
+                url = f"{reverse('hotel')}?id={random.choice(self.hotels).id}"
+            else:
+                url = f"{reverse('room')}?id={random.choice(self.rooms).id}"
+            start = perf_counter()
+            self.client.get(url)
+            timings.append((perf_counter() - start) * 1000)
+        return timings
+
+    def test_bench(self):
+        """Сравнить страницы с кэшем и без."""
+        print(f'\n{REQUESTS} requests, {WRITE_RATIO:.0%} writes, seed {SEED}')
+        for enabled in (False, True):
+            cache.clear()
+            page_cache.stats.clear()
+            with override_settings(PAGE_CACHE=enabled):
+                timings = self.run_load()
+            percentiles = quantiles(timings, n=100)
+            print(
+                f'cache {"on " if enabled else "off"} p50 {percentiles[49]:7.3f} ms p99 {percentiles[98]:7.3f} ms '
+                f'hit ratio {page_cache.hit_ratio():.2%}',
+            )
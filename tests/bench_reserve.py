@@ -0,0 +1,130 @@
+"""Модуль для замера скорости бронирования.
+
+Запуск: ./tests/test.sh tests.bench_reserve
+"""
+
+from datetime import date, timedelta
+from statistics import median
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from hotel_app.models import (RESERVE_EXIST, ROOM_NOT_EXIST, Client, Hotel,
+                              Reserve, Room, msg_error_reserve)
+from tests import test_reserve
+
+ROOMS = 1000
+RESERVES_PER_ROOM = 100
+REPEATS = 50
+CHUNK_SIZE = 5000
+FIRST_DAY = date(2030, 1, 1)
+
+
+def legacy_msg_error_reserve(data: dict) -> list[str]:
+    """Проверка пересечений в том виде, в котором она была до оптимизации.
+
+    Args:
+        data (dict): словарь с данными о бронировании
+
+    Returns:
+        list[str]: список с сообщениями об ошибках
+    """
+    start_date = data['start_date']
+    end_date = data['end_date']
+    reserve_id = data['reserve']
+    msg = []
+    try:
+        room = Room.objects.get(id=data['room'])
+    except Exception:
+        msg.append(ROOM_NOT_EXIST)
+    if Reserve.objects.filter(~Q(id=reserve_id), room=room, start_date__lte=start_date, end_date__gte=end_date)\
+        or Reserve.objects.filter(~Q(id=reserve_id), room=room, start_date__gte=start_date, start_date__lte=end_date)\
+            or Reserve.objects.filter(~Q(id=reserve_id), room=room, end_date__gte=start_date, end_date__lte=end_date):
+        msg.append(RESERVE_EXIST)
+    return msg
+
+
+def measure(func, *args) -> tuple[float, int]:
+    """Замерить медианное время и количество запросов.
+
+    Args:
+        func (_type_): функция
+        args (Any): аргументы функции
+
+    Returns:
+        tuple[float, int]: время в миллисекундах и количество запросов
+    """
+    timings = []
+    for _ in range(REPEATS):
+        with CaptureQueriesContext(connection) as queries:
+            start = perf_counter()
+            func(*args)
+            timings.append((perf_counter() - start) * 1000)
+    return median(timings), len(queries)
+
+
+class BenchReserve(TestCase):
+    """Замер проверки пересечений и бронирования на 100 тысячах броней."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Заполнить базу данных."""
+        user = User.objects.create(username='bench', password='bench')
+        cls.hotel_client = Client.objects.create(user=user)
+        hotel = Hotel.objects.create(name='bench', rating=4)
+        cls.rooms = Room.objects.bulk_create(
+            Room(category='single', floor=1, number=number, cost=10, hotel=hotel) for number in range(ROOMS)
+        )
+        reserves = (
+            Reserve(
+                user=cls.hotel_client, room=room, price=20,
+                start_date=FIRST_DAY + timedelta(days=3 * day),
+                end_date=FIRST_DAY + timedelta(days=3 * day + 2),
+            )
+            for room in cls.rooms for day in range(RESERVES_PER_ROOM)
+        )
+        Reserve.objects.bulk_create(reserves, batch_size=CHUNK_SIZE)
+        with connection.cursor() as cursor:
+            cursor.execute('analyze "hotel"."reserve"')
+
+    def test_bench(self):
+        """Сравнить старую и новую проверку, замерить бронирование."""
+        room = self.rooms[ROOMS // 2]
+        start_date = FIRST_DAY + timedelta(days=3 * RESERVES_PER_ROOM)
+        data = {
+            'start_date': start_date,
+            'end_date': start_date + timedelta(days=2),
+            'room': room.id,
+            'reserve': None,
+        }
+        results = {
+            'legacy check': measure(legacy_msg_error_reserve, data),
+            'check': measure(msg_error_reserve, data),
+        }
+
+        def book():
+            reserve = Reserve(user=self.hotel_client, room=room, start_date=data['start_date'],
+                              end_date=data['end_date'])
+            reserve.save()
+            reserve.delete()
+
+        results['booking (save + delete)'] = measure(book)
+        print(f'\n{Reserve.objects.count()} reserves, median of {REPEATS} runs')
+        for name, (timing, queries) in results.items():
+            print(f'{name:<25} {timing:8.3f} ms {queries:3} queries')
+
+
+class BenchConcurrentBooking(test_reserve.TestConcurrentBooking):
+    """Замер параллельных броней одного номера."""
+
+    def test_one_winner(self):
+        """Замерить, сколько параллельных попыток брони обрабатывается в секунду."""
+        start = perf_counter()
+        results = self.book_all()
+        elapsed = perf_counter() - start
+        self.assertEqual(sum(results), 1)
+        print(f'\n{self.bookings} bookings in {elapsed:.2f} s, {self.bookings / elapsed:.0f} bookings/s')
@@ -0,0 +1,29 @@
+"""Модуль для проверки бюджета SQL-запросов в тестах."""
+
+from contextlib import contextmanager
+
+from hotel_app import timing
+
+
+class QueryBudgetMixin:
+    """Проверки количества и повторов SQL-запросов по замеру hotel_app.timing."""
+
+    @contextmanager
+    def assertQueryBudget(self, queries: int, duplicates: int = 0):
+        """Проверить, что блок уложился в бюджет SQL-запросов.
+
+        В отличие от assertNumQueries бюджет - верхняя граница, а повтор
+        одного SQL с разными параметрами (N+1) проверяется отдельно.
+
+        Args:
+            queries (int): наибольшее количество запросов
+            duplicates (int): наибольшее количество повторов. по умолчанию 0.
+
+        Yields:
+            timing.RequestTiming: замер
+        """
+        with timing.measure() as measured:
+            yield measured
+        statements = '\n'.join(f'{count} x {sql}' for sql, count in measured.statements.most_common())
+        self.assertLessEqual(measured.queries, queries, f'too many queries:\n{statements}')
+        self.assertLessEqual(measured.duplicates, duplicates, f'repeated queries:\n{statements}')
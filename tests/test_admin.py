@@ -0,0 +1,139 @@
+"""Модуль для тестов количества запросов админки."""
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hotel_app import paginators
+from hotel_app.models import (Address, Client, Hotel, HotelService, Reserve,
+                              ReserveService, Room, Service)
+from hotel_app.paginators import EstimatedCountPaginator
+
+CHANGE_FORM_QUERY_BUDGET = 20
+FIRST_DAY = date(2030, 1, 1)
+MODELS = (Address, Hotel, Service, HotelService, Room, Client, Reserve, ReserveService)
+
+
+def create_rows(count: int, offset: int = 0) -> None:
+    """Создать по count строк каждой модели.
+
+    Args:
+        count (int): количество строк
+        offset (int): сдвиг номеров, чтобы строки не совпадали. по умолчанию 0.
+    """
+    numbers = range(offset, offset + count)
+    addresses = Address.objects.bulk_create(Address(city='city', street='street', number=number) for number in numbers)
+    hotels = Hotel.objects.bulk_create(
+        Hotel(name=f'hotel {number}', rating=4, hotel_address=address) for number, address in zip(numbers, addresses)
+    )
+    services = Service.objects.bulk_create(Service(name=f'service {number}') for number in numbers)
+    HotelService.objects.bulk_create(
+        HotelService(hotel=hotel, service=service, cost=1) for hotel, service in zip(hotels, services)
+    )
+    rooms = Room.objects.bulk_create(
+        Room(category='single', floor=1, number=number, cost=10, hotel=hotel) for number, hotel in zip(numbers, hotels)
+    )
+    users = User.objects.bulk_create(User(username=f'user {number}') for number in numbers)
+    clients = Client.objects.bulk_create(Client(user=user) for user in users)
+    reserves = Reserve.objects.bulk_create(
+        Reserve(user=client, room=room, price=10, start_date=FIRST_DAY, end_date=FIRST_DAY + timedelta(days=1))
+        for client, room in zip(clients, rooms)
+    )
+    ReserveService.objects.bulk_create(
+        ReserveService(reserve=reserve, service=service) for reserve, service in zip(reserves, services)
+    )
+
+
+def changelist_url(model) -> str:
+    """Получить ссылку на список объектов модели в админке.
+
+    Args:
+        model (_type_): класс модели
+
+    Returns:
+        str: ссылка
+    """
+    return reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+
+
+class AdminQueriesTest(TestCase):
+    """Тесты, что страницы админки не делают запросов на каждую строку."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        self.admin = User.objects.create_superuser(username='admin', password='admin')
+        self.client.force_login(self.admin)
+
+    def count_queries(self, url: str) -> int:
+        """Получить количество запросов страницы.
+
+        Args:
+            url (str): ссылка
+
+        Returns:
+            int: количество запросов
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists(self):
+        """Тест, что количество запросов списков не растёт с количеством строк."""
+        create_rows(3)
+        few = {model: self.count_queries(changelist_url(model)) for model in MODELS}
+        create_rows(30, offset=3)
+        for model in MODELS:
+            with self.subTest(model=model.__name__):
+                self.assertEqual(self.count_queries(changelist_url(model)), few[model])
+
+    def test_change_forms(self):
+        """Тест количества запросов форм изменения."""
+        create_rows(30)
+        for model in MODELS:
+            instance = model.objects.order_by().first()
+            url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_change', args=[instance.pk])
+            with self.subTest(model=model.__name__):
+                self.assertLessEqual(self.count_queries(url), CHANGE_FORM_QUERY_BUDGET)
+
+    def test_change_form_no_full_select(self):
+        """Тест, что форма номера не выводит все отели в выпадающем списке."""
+        create_rows(30)
+        room = Room.objects.order_by().first()
+        other_hotel = Hotel.objects.exclude(id=room.hotel_id).first()
+        content = self.client.get(reverse('admin:hotel_app_room_change', args=[room.pk])).content.decode()
+        self.assertIn(str(room.hotel_id), content)
+        self.assertNotIn(str(other_hotel.id), content)
+
+    def test_service_hotels_inline(self):
+        """Тест, что на форме услуги можно изменить отели, где она есть."""
+        create_rows(3)
+        service = Service.objects.order_by().first()
+        response = self.client.get(reverse('admin:hotel_app_service_change', args=[service.pk]))
+        self.assertContains(response, 'hotelservice_set-TOTAL_FORMS')
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    """Тесты пагинатора с оценкой количества строк."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        Hotel.objects.bulk_create(Hotel(name=f'hotel {number}', rating=4) for number in range(5))
+
+    def test_estimate(self):
+        """Тест оценки для большой таблицы без фильтров."""
+        with mock.patch.object(paginators, 'approximate_count', return_value=50000):
+            with self.assertNumQueries(0):
+                self.assertEqual(EstimatedCountPaginator(Hotel.objects.all(), 10).count, 50000)
+
+    def test_exact(self):
+        """Тест точного количества для фильтра и небольшой таблицы."""
+        with mock.patch.object(paginators, 'approximate_count', return_value=50000):
+            self.assertEqual(EstimatedCountPaginator(Hotel.objects.filter(name='hotel 1'), 10).count, 1)
+        with mock.patch.object(paginators, 'approximate_count', return_value=3):
+            self.assertEqual(EstimatedCountPaginator(Hotel.objects.all(), 10).count, 5)
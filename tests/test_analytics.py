@@ -0,0 +1,140 @@
+"""Модуль для тестов дневной сводки загрузки и выручки отелей."""
+
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+
+from hotel_app import analytics
+from hotel_app.models import (Client, Hotel, HotelDailyStats, HotelService,
+                              Reserve, ReserveService, Room, Service)
+
+
+class AnalyticsTest(TestCase):
+    """Тесты сводки, её пересчёта сигналами и отчёта по месяцам."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        self.hotel = Hotel.objects.create(name='Sea', rating=4)
+        self.room = Room.objects.create(category='single', floor=1, number=101, cost=10, hotel=self.hotel)
+        Room.objects.create(category='single', floor=1, number=102, cost=10, hotel=self.hotel)
+        self.spa = Service.objects.create(name='spa')
+        HotelService.objects.create(hotel=self.hotel, service=self.spa, cost=5)
+        self.client_user = Client.objects.create(user=User.objects.create_user(username='guest', password='guest'))
+
+    def reserve(self, start: date, end: date, price: int) -> Reserve:
+        """Создать бронь с пересчётом сводки.
+
+        Args:
+            start (date): дата заезда
+            end (date): дата выезда
+            price (int): цена
+
+        Returns:
+            Reserve: бронь
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            return Reserve.objects.create(user=self.client_user, room=self.room, price=price, start_date=start,
+                                          end_date=end)
+
+    def stats(self) -> list[tuple]:
+        """Получить сводку.
+
+        Returns:
+            list[tuple]: день, проданные номера, выручка, выручка услуг
+        """
+        return list(HotelDailyStats.objects.order_by('day').values_list(
+            'day', 'rooms_sold', 'revenue', 'service_revenue',
+        ))
+
+    def test_reserve_written(self):
+        """Тест пересчёта ночей при создании, добавлении услуги, переносе и удалении брони."""
+        reserve = self.reserve(date(2030, 1, 30), date(2030, 2, 2), 90)
+        self.assertEqual(self.stats(), [
+            (date(2030, 1, 30), 1, Decimal(30), Decimal(0)),
+            (date(2030, 1, 31), 1, Decimal(30), Decimal(0)),
+            (date(2030, 2, 1), 1, Decimal(30), Decimal(0)),
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            ReserveService.objects.create(reserve=reserve, service=self.spa)
+        self.assertEqual({row[3] for row in self.stats()}, {Decimal(5)})
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve.start_date, reserve.end_date = date(2030, 3, 1), date(2030, 3, 2)
+            reserve.save()
+        self.assertEqual(self.stats(), [(date(2030, 3, 1), 1, Decimal(90), Decimal(5))])
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve.delete()
+        self.assertEqual(self.stats(), [])
+
+    def test_signal_queries(self):
+        """Тест, что сигналы не читают ночи без переноса брони и пересчитывают отель один раз за транзакцию."""
+        reserve = Reserve.objects.select_related('room').get(pk=self.reserve(date(2030, 1, 1), date(2030, 1, 3), 20).pk)
+        with self.captureOnCommitCallbacks(execute=True), \
+                mock.patch.object(analytics, 'reserve_window') as reserve_window, \
+                mock.patch.object(analytics, 'room_window', wraps=analytics.room_window) as room_window:
+            reserve.price = 30
+            reserve.save()
+            room_window.assert_not_called()
+            reserve.start_date = date(2030, 1, 2)
+            reserve.save()
+            room_window.assert_called_once_with(self.room.id, date(2030, 1, 1), date(2030, 1, 3))
+            reserve_window.assert_not_called()
+        with self.captureOnCommitCallbacks() as callbacks:
+            for start, end in ((date(2030, 2, 1), date(2030, 2, 3)), (date(2030, 2, 5), date(2030, 2, 6))):
+                Reserve.objects.create(user=self.client_user, room=self.room, price=10, start_date=start, end_date=end)
+        batches = [callback for callback in callbacks if isinstance(getattr(callback, '__self__', None),
+                                                                    analytics.RefreshBatch)]
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(
+            list(batches[0].__self__.windows.values()),
+            [analytics.Window(self.hotel.id, date(2030, 2, 1), date(2030, 2, 6))],
+        )
+
+    def test_rebuild(self):
+        """Тест, что команда пересчёта совпадает со сводкой сигналов."""
+        self.reserve(date(2030, 1, 1), date(2030, 1, 5), 40)
+        self.reserve(date(2030, 1, 10), date(2030, 1, 11), 15)
+        incremental = self.stats()
+        HotelDailyStats.objects.all().delete()
+        call_command('rebuild_stats', stdout=StringIO())
+        self.assertEqual(self.stats(), incremental)
+        call_command('rebuild_stats', '--start', '2030-01-03', '--end', '2030-01-04', stdout=StringIO())
+        self.assertEqual(self.stats(), incremental)
+
+    def test_locks(self):
+        """Тест, что пересчёт отеля держит его блокировку и разделяемую общую."""
+        analytics.rebuild(hotel=self.hotel.id)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT classid, mode FROM pg_locks WHERE locktype = 'advisory' AND pid = pg_backend_pid()",
+            )
+            locks = set(cursor.fetchall())
+        self.assertEqual(locks, {(analytics.LOCK_ALL, 'ShareLock'), (analytics.LOCK_HOTEL, 'ExclusiveLock')})
+
+    def test_monthly(self):
+        """Тест отчёта по месяцам: загрузка считается от номеров отеля и ночей месяца в периоде."""
+        self.reserve(date(2030, 1, 30), date(2030, 2, 2), 90)
+        report = analytics.monthly(date(2030, 1, 1), date(2030, 2, 11))
+        self.assertEqual([(row.month, row.room_nights) for row in report], [
+            (date(2030, 1, 1), 2), (date(2030, 2, 1), 1),
+        ])
+        self.assertEqual(report[0].revenue, Decimal(60))
+        self.assertAlmostEqual(report[0].occupancy, 2 / (2 * 31))
+        self.assertAlmostEqual(report[1].occupancy, 1 / (2 * 10))
+
+    def test_view(self):
+        """Тест отчёта через REST API."""
+        self.reserve(date(2030, 1, 30), date(2030, 2, 2), 90)
+        url = reverse('analytics')
+        self.client.force_login(User.objects.create_superuser(username='finance', password='finance'))
+        with self.assertNumQueries(4):
+            response = self.client.get(url, {'start': '2030-01-01', 'end': '2030-03-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['month'] for row in response.json()['results']], ['2030-01', '2030-02'])
+        self.assertEqual(response.json()['results'][0]['revenue'], '60.00')
@@ -1,5 +1,7 @@
 """Модуль для тестирования апи."""
 
+from unittest import mock
+
 from django.contrib.auth.models import User
 from django.test import TestCase
 from rest_framework import status
@@ -7,6 +9,10 @@ from rest_framework.authtoken.models import Token
 from rest_framework.test import APIClient
 
 from hotel_app.models import Client, Hotel, Reserve, Room, Service
+from hotel_app.paginators import RestCursorPagination
+from hotel_app.serializers import (HotelSerializer, RoomSerializer,
+                                   ServiceSerializer)
+from tests.budget import QueryBudgetMixin
 
 
 def create_viewset_test(model_class, url: str, creation_attrs: dict):
@@ -20,7 +26,7 @@ def create_viewset_test(model_class, url: str, creation_attrs: dict):
     Returns:
         _type_: тест для апи модели
     """
-    class ViewSetTest(TestCase):
+    class ViewSetTest(QueryBudgetMixin, TestCase):
         def setUp(self):
             """Параметры."""
             self.client = APIClient()
@@ -41,7 +47,8 @@ def create_viewset_test(model_class, url: str, creation_attrs: dict):
                 token (Token): токен
             """
             self.client.force_authenticate(user=user, token=token)
-            response = self.client.get(url)
+            with self.assertQueryBudget(1):
+                response = self.client.get(url)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         def test_get_by_user(self):
@@ -136,3 +143,71 @@ RoomViewSetTest = create_viewset_test(
     Reserve, '/rest/reserve/',
     {'start_date': '2025-07-11', 'end_date': '2025-07-15', 'price': 10}
 )
+
+
+class ListPaginationTest(QueryBudgetMixin, TestCase):
+    """Тесты страниц и выбора полей в списках апи."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Заполнить базу данных."""
+        cls.user = User.objects.create_user(username='user', password='user')
+        cls.hotels = Hotel.objects.bulk_create(Hotel(name=f'hotel {number}', rating=4) for number in range(7))
+
+    def setUp(self):
+        """Параметры."""
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_pages(self):
+        """Тест прохода по курсорным страницам."""
+        names = []
+        url = '/rest/hotels/?page_size=3'
+        while url:
+            with self.assertQueryBudget(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 3)
+            names.extend(hotel['name'] for hotel in response.data['results'])
+            url = response.data['next']
+        self.assertCountEqual(names, [hotel.name for hotel in self.hotels])
+
+    def test_same_created(self):
+        """Тест, что объекты с одной датой создания проходятся по id без повторов и пропусков."""
+        Hotel.objects.update(created=self.hotels[0].created)
+        ids = []
+        url = '/rest/hotels/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            ids.extend(hotel['id'] for hotel in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(ids, sorted((str(hotel.id) for hotel in self.hotels), reverse=True))
+
+    def test_created_read_only(self):
+        """Тест, что клиент не может задать дату создания."""
+        for serializer in (HotelSerializer, RoomSerializer, ServiceSerializer):
+            self.assertTrue(serializer().fields['created'].read_only)
+
+    def test_page_size_cap(self):
+        """Тест ограничения размера страницы."""
+        with mock.patch.object(RestCursorPagination, 'max_page_size', 2):
+            response = self.client.get('/rest/hotels/?page_size=100000')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_fields(self):
+        """Тест выбора полей."""
+        with self.assertNumQueries(1):
+            response = self.client.get('/rest/hotels/?fields=id,name')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for hotel in response.data['results']:
+            self.assertEqual(set(hotel), {'id', 'name'})
+
+    def test_num_queries(self):
+        """Тест, что страница списка строится одним запросом."""
+        Room.objects.bulk_create(
+            Room(category='single', floor=1, number=number, cost=10, hotel=self.hotels[0]) for number in range(1, 30)
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get('/rest/rooms/')
+        self.assertEqual(len(response.data['results']), 29)
@@ -0,0 +1,79 @@
+"""Модуль для тестов асинхронных страниц."""
+
+import re
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase, override_settings
+
+from hotel_app import async_views, views
+from hotel_app.models import Address, Hotel, HotelService, Room, Service
+from hotel_app.paginators import KeysetPaginator
+
+CSRF_INPUT = re.compile(r'<input type="hidden" name="csrfmiddlewaretoken" value="[^"]*">')
+
+
+@override_settings(PAGE_CACHE=False)
+class AsyncViewsTest(TestCase):
+    """Тесты, что асинхронные страницы совпадают с синхронными."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        self.factory = RequestFactory()
+        address = Address.objects.create(city='Sochi', street='Kurortny', number=1)
+        self.hotels = [
+            Hotel.objects.create(name=f'hotel {number}', rating=4, hotel_address=address) for number in range(12)
+        ]
+        self.room = Room.objects.create(category='single', floor=1, number=101, cost=10, hotel=self.hotels[0])
+        Room.objects.create(category='double', floor=2, number=202, cost=20, hotel=self.hotels[0])
+        service = Service.objects.create(name='breakfast')
+        HotelService.objects.create(hotel=self.hotels[0], service=service, cost=5)
+
+    async def responses(self, sync_view, async_view, path: str) -> tuple[str, str]:
+        """Получить ответы синхронной и асинхронной страницы без токена csrf.
+
+        Args:
+            sync_view (_type_): синхронная страница
+            async_view (_type_): асинхронная страница
+            path (str): ссылка
+
+        Returns:
+            tuple[str, str]: html синхронной и асинхронной страницы
+        """
+        contents = []
+        for view in (sync_to_async(sync_view), async_view):
+            request = self.factory.get(path)
+            request.user = AnonymousUser()
+            response = await view(request)
+            self.assertEqual(response.status_code, 200)
+            contents.append(CSRF_INPUT.sub('', response.content.decode()))
+        return contents[0], contents[1]
+
+    async def test_pages(self):
+        """Тест страниц отеля, номера, списка отелей и поиска номеров."""
+        pages = (
+            (views.hotel, async_views.hotel, f'/hotel/?id={self.hotels[0].id}'),
+            (views.room, async_views.room, f'/room/?id={self.room.id}'),
+            (views.HotelListView.as_view(), async_views.hotel_list, '/'),
+            (views.book_by_date, async_views.book_by_date, '/book_by_date/'),
+            (views.book_by_date, async_views.book_by_date, '/book_by_date/?start_date=2030-01-01&end_date=2030-01-03'),
+        )
+        for sync_view, async_view, path in pages:
+            with self.subTest(path=path):
+                expected, content = await self.responses(sync_view, async_view, path)
+                self.assertEqual(content, expected)
+
+    async def test_redirect(self):
+        """Тест перенаправления при некорректном id."""
+        for view in (async_views.hotel, async_views.room):
+            with self.subTest(view=view.__name__):
+                self.assertEqual((await view(self.factory.get('/?id=abc'))).status_code, 302)
+
+    async def test_keyset_page(self):
+        """Тест, что асинхронная страница пагинатора совпадает с синхронной."""
+        paginator = KeysetPaginator(Hotel.objects.all(), views.HOTEL_ORDERING, 5)
+        first = await paginator.apage()
+        second = await paginator.apage(after=first.next_cursor)
+        expected = await sync_to_async(paginator.page)(after=first.next_cursor)
+        self.assertEqual(second.object_list, expected.object_list)
+        self.assertEqual((await paginator.apage(before=second.previous_cursor)).object_list, first.object_list)
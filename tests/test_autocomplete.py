@@ -0,0 +1,107 @@
+"""Модуль для тестов подсказок поиска."""
+
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from hotel_app import autocomplete
+from hotel_app.models import Address, Hotel
+
+
+def texts(suggestions: list) -> list:
+    """Получить тексты подсказок.
+
+    Args:
+        suggestions (list): подсказки
+
+    Returns:
+        list: виды и тексты
+    """
+    return [(suggestion.kind, suggestion.text) for suggestion in suggestions]
+
+
+class AutocompleteTest(TestCase):
+    """Тесты индекса подсказок."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        self.index = autocomplete.index
+        self.index.invalidate()
+        self.addCleanup(self.index.invalidate)
+        moscow = Address.objects.create(city='Moscow', street='Tverskaya', number=1)
+        self.palace = Hotel.objects.create(name='Grand Palace', rating=5, hotel_address=moscow)
+        self.park = Hotel.objects.create(name='Green  Park', rating=4, hotel_address=moscow)
+        self.kazan = Address.objects.create(city='Kazan', street='Baumana', number=2)
+        self.grand = Hotel.objects.create(name='Grand Hotel', rating=3, hotel_address=self.kazan)
+
+    def test_normalize(self):
+        """Тест нормализации и ключей по словам."""
+        self.assertEqual(autocomplete.normalize('  Ёлки  ПАЛКИ '), 'елки палки')
+        self.assertEqual(autocomplete.word_keys('Grand  Palace Hotel'), ['grand palace hotel', 'palace hotel', 'hotel'])
+        self.assertEqual(autocomplete.word_keys(None), [])
+
+    def test_suggest(self):
+        """Тест поиска по началу любого слова и ранга по рейтингу."""
+        self.assertEqual(
+            texts(self.index.suggest('GR')),
+            [('hotel', 'Grand Palace'), ('hotel', 'Green  Park'), ('hotel', 'Grand Hotel')],
+        )
+        self.assertEqual(texts(self.index.suggest('pal')), [('hotel', 'Grand Palace')])
+        self.assertEqual(texts(self.index.suggest('green park')), [('hotel', 'Green  Park')])
+        self.assertEqual(self.index.suggest('mos'), [autocomplete.Suggestion('city', 'Moscow', Decimal(5))])
+        self.assertEqual(texts(self.index.suggest('gr', limit=1)), [('hotel', 'Grand Palace')])
+        self.assertEqual(self.index.suggest('paris'), [])
+        self.assertEqual(self.index.suggest(' '), [])
+
+    def test_signals(self):
+        """Тест обновления индекса сигналами без перестроения."""
+        self.index.build()
+        built_at = self.index.built_at
+        with self.captureOnCommitCallbacks(execute=True):
+            self.palace.name = 'Riverside'
+            self.palace.save()
+        self.assertEqual(texts(self.index.suggest('riv')), [('hotel', 'Riverside')])
+        self.assertEqual(texts(self.index.suggest('pal')), [])
+        self.assertEqual(self.index.suggest('mos')[0].rating, 5)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.palace.delete()
+        self.assertEqual(self.index.suggest('mos')[0].rating, 4)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kazan.city = 'Samara'
+            self.kazan.save()
+        self.assertEqual(texts(self.index.suggest('sam')), [('city', 'Samara')])
+        self.assertEqual(self.index.suggest('kaz'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Hotel.objects.create(name='Samara Inn', rating=5, hotel_address=self.kazan)
+        self.assertEqual(
+            texts(self.index.suggest('sam')), [('city', 'Samara'), ('hotel', 'Samara Inn')],
+        )
+        self.assertEqual(self.index.built_at, built_at)
+
+    def test_single_rebuild(self):
+        """Тест, что пока один поток перестраивает индекс, другие отвечают по старому."""
+        self.index.build()
+        self.index.built_at -= self.index.max_age + 1
+        with mock.patch.object(self.index, 'build') as build:
+            with self.index._building:
+                self.assertEqual(texts(self.index.suggest('pal')), [('hotel', 'Grand Palace')])
+            build.assert_not_called()
+            self.index.suggest('pal')
+            build.assert_called_once()
+
+    def test_view(self):
+        """Тест подсказок без запросов к базе данных и проверки параметров."""
+        url = reverse('autocomplete')
+        self.index.build()
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'q': 'gr', 'limit': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), [
+            {'kind': 'hotel', 'text': 'Grand Palace', 'rating': '5.0', 'id': str(self.palace.id)},
+            {'kind': 'hotel', 'text': 'Green  Park', 'rating': '4.0', 'id': str(self.park.id)},
+        ])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'q': 'gr', 'limit': 0}).status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,202 @@
+"""Модуль для тестов поиска свободных номеров."""
+
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.client import Client as TestClient
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hotel_app.availability import free_rooms
+from hotel_app.availability_index import index
+from hotel_app.models import Address, Client, Hotel, Reserve, Room
+from hotel_app.views import check_reserve
+
+
+class FreeRoomsTest(TestCase):
+    """Тесты поиска свободных номеров."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        user = User.objects.create(username='user', password='user')
+        self.hotel_client = Client.objects.create(user=user)
+        address = Address.objects.create(city='Sochi', street='Kurortny', number=1)
+        self.hotel = Hotel.objects.create(name='abc', rating=4.4, hotel_address=address)
+        other_hotel = Hotel.objects.create(name='def', rating=3)
+        self.busy = Room.objects.create(category='single', floor=1, number=101, cost=10, hotel=self.hotel)
+        self.free = Room.objects.create(category='double', floor=2, number=201, cost=20, hotel=self.hotel)
+        self.other = Room.objects.create(category='single', floor=1, number=1, cost=5, hotel=other_hotel)
+        Reserve.objects.create(
+            user=self.hotel_client, room=self.busy,
+            start_date=date(2030, 7, 10), end_date=date(2030, 7, 15), price=10,
+        )
+
+    def test_overlapping(self):
+        """Тест на исключение занятых номеров."""
+        rooms = free_rooms(date(2030, 7, 14), date(2030, 7, 16))
+        self.assertEqual(set(rooms), {self.free, self.other})
+
+    def test_adjacent(self):
+        """Тест на заезд в день выезда."""
+        rooms = free_rooms(date(2030, 7, 15), date(2030, 7, 16))
+        self.assertIn(self.busy, rooms)
+
+    def test_filters(self):
+        """Тест на фильтры."""
+        period = (date(2030, 8, 1), date(2030, 8, 2))
+        self.assertEqual(set(free_rooms(*period, hotel=self.hotel.id)), {self.busy, self.free})
+        self.assertEqual(set(free_rooms(*period, city='sochi')), {self.busy, self.free})
+        self.assertEqual(set(free_rooms(*period, category='single')), {self.busy, self.other})
+        self.assertEqual(set(free_rooms(*period, max_cost=10)), {self.busy, self.other})
+        self.assertEqual(set(free_rooms(*period, floor=2)), {self.free})
+
+    def test_single_query(self):
+        """Тест на поиск одним запросом."""
+        with self.assertNumQueries(1):
+            list(free_rooms(date(2030, 7, 1), date(2030, 7, 30), city='Sochi', max_cost=100))
+
+    def test_page(self):
+        """Тест страницы поиска."""
+        test_client = TestClient()
+        response = test_client.get('/book_by_date/', {'start_date': '2030-07-14', 'end_date': '2030-07-16'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.context['rooms']), {self.free, self.other})
+
+    def test_api(self):
+        """Тест апи поиска."""
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.hotel_client.user)
+        response = api_client.get('/rest/availability/', {'start': '2030-07-14', 'end': '2030-07-16', 'floor': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([room['id'] for room in response.data['results']], [str(self.free.id)])
+        response = api_client.get('/rest/availability/', {'start': '2030-07-16', 'end': '2030-07-14'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_api_free_nights(self):
+        """Тест апи количества свободных ночей."""
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.hotel_client.user)
+        params = {'start': '2030-07-12', 'end': '2030-07-18', 'hotel': self.hotel.id, 'free_nights': 1}
+        response = api_client.get('/rest/availability/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        free_nights = {room['id']: room['free_nights'] for room in response.data['results']}
+        self.assertEqual(free_nights, {str(self.free.id): 6, str(self.busy.id): 3})
+
+    def test_api_etag(self):
+        """Тест ответа 304 без изменений броней."""
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.hotel_client.user)
+        params = {'start': '2030-07-12', 'end': '2030-07-18'}
+        etag = api_client.get('/rest/availability/', params).headers['ETag']
+        response = api_client.get('/rest/availability/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        Reserve.objects.filter(room=self.busy).delete()
+        response = api_client.get('/rest/availability/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_api_etag_filters(self):
+        """Тест, что ETag зависит от фильтров и адресов отелей."""
+        api_client = APIClient()
+        api_client.force_authenticate(user=self.hotel_client.user)
+        params = {'start': '2030-07-12', 'end': '2030-07-18', 'city': 'Moscow'}
+        etag = api_client.get('/rest/availability/', params).headers['ETag']
+        response = api_client.get('/rest/availability/', {**params, 'city': 'Kazan'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        Address.objects.create(city='Moscow', street='Tverskaya', number=1)
+        response = api_client.get('/rest/availability/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class AvailabilityIndexTest(TestCase):
+    """Тесты индекса занятости."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        user = User.objects.create(username='user', password='user')
+        self.hotel_client = Client.objects.create(user=user)
+        hotel = Hotel.objects.create(name='abc', rating=4.4)
+        self.busy = Room.objects.create(category='single', floor=1, number=101, cost=10, hotel=hotel)
+        self.free = Room.objects.create(category='double', floor=2, number=201, cost=20, hotel=hotel)
+        self.today = timezone.localdate()
+        self.reserve = Reserve.objects.create(
+            user=self.hotel_client, room=self.busy,
+            start_date=self.day(10), end_date=self.day(15), price=10,
+        )
+        index.build()
+
+    def day(self, offset: int) -> date:
+        """Получить дату относительно сегодняшней.
+
+        Args:
+            offset (int): смещение в днях
+
+        Returns:
+            date: дата
+        """
+        return self.today + timedelta(days=offset)
+
+    def test_free_room_ids(self):
+        """Тест поиска по индексу."""
+        self.assertEqual(index.free_room_ids(self.day(14), self.day(16)), [self.free.id])
+        self.assertEqual(set(index.free_room_ids(self.day(15), self.day(16))), {self.busy.id, self.free.id})
+        self.assertIsNone(index.free_room_ids(self.day(1), self.day(index.horizon + 1)))
+        self.assertFalse(index.is_free(self.busy.id, self.day(9), self.day(11)))
+        self.assertTrue(index.is_free(self.busy.id, self.day(5), self.day(10)))
+
+    def test_signals(self):
+        """Тест обновления индекса сигналами."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reserve.delete()
+        self.assertTrue(index.is_free(self.busy.id, self.day(10), self.day(15)))
+        with self.captureOnCommitCallbacks(execute=True):
+            room = Room.objects.create(category='single', floor=3, number=301, cost=10, hotel=self.free.hotel)
+            Reserve.objects.create(
+                user=self.hotel_client, room=room,
+                start_date=self.day(3), end_date=self.day(4), price=10,
+            )
+        self.assertFalse(index.is_free(room.id, self.day(3), self.day(4)))
+        self.assertTrue(index.is_free(room.id, self.day(4), self.day(5)))
+
+    @override_settings(AVAILABILITY_INDEX=True)
+    def test_free_rooms(self):
+        """Тест поиска свободных номеров через индекс."""
+        self.assertEqual(list(free_rooms(self.day(14), self.day(16))), [self.free])
+
+    @override_settings(AVAILABILITY_INDEX=True)
+    def test_stale_busy(self):
+        """Тест, что занятость по устаревшему индексу подтверждается базой данных."""
+        data = {'room': self.busy.id, 'start_date': self.day(10), 'end_date': self.day(15)}
+        self.assertEqual(len(check_reserve(data)), 1)
+        Reserve.objects.filter(pk=self.reserve.pk).update(start_date=self.day(20), end_date=self.day(25))
+        self.assertFalse(index.is_free(self.busy.id, self.day(10), self.day(15)))
+        self.assertEqual(check_reserve(data), [])
+
+    def test_build_new_room(self):
+        """Тест перестроения, когда номер появился между запросами номеров и броней."""
+        with mock.patch('hotel_app.availability_index.Room') as room_model:
+            room_model.objects.order_by.return_value.values_list.return_value = [self.free.id]
+            index.build()
+        self.assertFalse(index.is_free(self.busy.id, self.day(10), self.day(15)))
+        self.assertTrue(index.is_free(self.free.id, self.day(10), self.day(15)))
+        index.build()
+
+    def test_changes_during_build(self):
+        """Тест, что изменения от сигналов во время чтения базы не теряются при замене матрицы."""
+        def localdate():
+            # бронь удалена в другом запросе после начала перестроения, но до чтения броней
+            index.reserve_deleted(self.reserve.id)
+            return self.today
+
+        with mock.patch('hotel_app.availability_index.timezone.localdate', side_effect=localdate):
+            index.build()
+        self.assertTrue(index.is_free(self.busy.id, self.day(10), self.day(15)))
+
+    def test_command(self):
+        """Тест команды проверки индекса."""
+        call_command('check_availability_index', samples=20, stdout=StringIO())
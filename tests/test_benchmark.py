@@ -0,0 +1,32 @@
+"""Модуль для тестов замера страниц и REST API."""
+
+from django.test import TestCase
+
+from hotel_app import benchmark
+
+
+class BenchmarkTest(TestCase):
+    """Тесты замера ссылок и сравнения с базовым отчётом."""
+
+    def test_run(self):
+        """Тест, что все ссылки отвечают без ошибок на сгенерированных данных."""
+        dataset = benchmark.seed(hotels=2, rooms=3, reserves=2)
+        results = benchmark.run(dataset, requests=2, warmup=1)
+        self.assertEqual(set(results), {endpoint.name for endpoint in benchmark.ENDPOINTS})
+        for name, result in results.items():
+            with self.subTest(name=name):
+                self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+                self.assertEqual(result['requests'], 2)
+
+    def test_regressions(self):
+        """Тест порогов замедления и роста SQL-запросов."""
+        baseline = {'hotel': {'p95_ms': 10, 'queries': 3}, 'room': {'p95_ms': 10, 'queries': 3}}
+        report = {
+            'hotel': {'p95_ms': 11.5, 'queries': 3},
+            'room': {'p95_ms': 13, 'queries': 4},
+            'profile': {'p95_ms': 100, 'queries': 10},
+        }
+        found = benchmark.regressions(report, baseline, 'p95_ms', max_slowdown=20, max_extra_queries=0)
+        self.assertEqual(len(found), 2)
+        self.assertTrue(all(line.startswith('room:') for line in found))
+        self.assertEqual(benchmark.regressions(report, baseline, 'p95_ms', 50, 1), [])
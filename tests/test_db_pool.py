@@ -0,0 +1,103 @@
+"""Модуль для тестов постоянных соединений с базой данных."""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import RequestFactory, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from hotel_app import db_pool
+from hotel_app.models import Hotel
+
+
+@contextmanager
+def connection_profile(conn_max_age: int, health_checks: bool = True):
+    """Временно сменить настройки соединения с базой данных.
+
+    Args:
+        conn_max_age (int): CONN_MAX_AGE
+        health_checks (bool): CONN_HEALTH_CHECKS. по умолчанию True.
+
+    Yields:
+        None: управление блоку
+    """
+    saved = {name: connection.settings_dict[name] for name in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+    connection.close()
+    connection.settings_dict.update(CONN_MAX_AGE=conn_max_age, CONN_HEALTH_CHECKS=health_checks)
+    try:
+        yield
+    finally:
+        connection.close()
+        connection.settings_dict.update(saved)
+
+
+class DbPoolTest(TransactionTestCase):
+    """Тесты переиспользования соединений между запросами и метрик."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        self.handler = WSGIHandler()
+        self.url = reverse('homepage')
+        Hotel.objects.create(name='abc', rating=4)
+
+    def request(self) -> int:
+        """Выполнить запрос через WSGI так же, как сервер, с закрытием ответа.
+
+        Returns:
+            int: код ответа
+        """
+        statuses = []
+        response = self.handler(RequestFactory().get(self.url).environ, lambda status, headers: statuses.append(status))
+        response.close()
+        return int(statuses[0].split()[0])
+
+    def opened(self, requests: int) -> int:
+        """Посчитать соединения, открытые за серию запросов.
+
+        Args:
+            requests (int): количество запросов
+
+        Returns:
+            int: открытые соединения
+        """
+        before = db_pool.stats['connections']
+        for _ in range(requests):
+            self.assertEqual(self.request(), 200)
+        return db_pool.stats['connections'] - before
+
+    def test_persistent(self):
+        """Тест, что постоянное соединение открывается один раз на серию запросов."""
+        with connection_profile(60):
+            self.assertEqual(self.opened(5), 1)
+        with connection_profile(0):
+            self.assertEqual(self.opened(5), 5)
+
+    def test_health_check(self):
+        """Тест, что разорванное соединение заменяется без ошибки запроса."""
+        with connection_profile(60):
+            self.assertEqual(self.opened(1), 1)
+            connection.connection.close()
+            self.assertEqual(self.opened(1), 1)
+
+    def test_view(self):
+        """Тест метрик через REST API."""
+        api = APIClient()
+        api.force_authenticate(user=User.objects.create_superuser(username='admin', password='admin'))
+        response = api.get(reverse('db_pool'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.json()),
+            {'requests', 'connections', 'reuse_ratio', 'conn_max_age', 'health_checks', 'server_side_cursors'},
+        )
+        self.assertEqual(APIClient().get(reverse('db_pool')).status_code, 401)
+
+    def test_threaded_counts(self):
+        """Тест, что счётчики не теряют увеличения из разных потоков."""
+        before, _ = db_pool.counts()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: db_pool.count('requests'), range(8000)))
+        self.assertEqual(db_pool.counts()[0] - before, 8000)
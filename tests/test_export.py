@@ -0,0 +1,105 @@
+"""Модуль для тестов потоковой выгрузки бронирований."""
+
+import csv
+import gzip
+import json
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from hotel_app import export
+from hotel_app.models import (Address, Client, Hotel, HotelService, Reserve,
+                              ReserveService, Room, Service)
+
+FIRST_DAY = date(2030, 1, 1)
+
+
+class ExportTest(TestCase):
+    """Тесты выгрузки бронирований."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        address = Address.objects.create(city='Sochi', street='Kurortny', number=1)
+        self.hotel = Hotel.objects.create(name='Sea', rating=4, hotel_address=address)
+        self.other_hotel = Hotel.objects.create(name='Hills', rating=3)
+        room = Room.objects.create(category='single', floor=1, number=101, cost=10, hotel=self.hotel)
+        other_room = Room.objects.create(category='double', floor=2, number=201, cost=20, hotel=self.other_hotel)
+        spa = Service.objects.create(name='spa')
+        breakfast = Service.objects.create(name='breakfast')
+        HotelService.objects.create(hotel=self.hotel, service=spa, cost=5)
+        HotelService.objects.create(hotel=self.hotel, service=breakfast, cost=3)
+        self.user = User.objects.create_user(username='guest', password='guest')
+        client = Client.objects.create(user=self.user)
+        self.reserve = Reserve.objects.create(
+            user=client, room=room, price=100, start_date=FIRST_DAY, end_date=date(2030, 1, 4),
+        )
+        ReserveService.objects.create(reserve=self.reserve, service=spa)
+        ReserveService.objects.create(reserve=self.reserve, service=breakfast)
+        Reserve.objects.create(
+            user=client, room=other_room, price=50, start_date=date(2030, 2, 1), end_date=date(2030, 2, 2),
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def run_export(self, *args: str) -> bytes:
+        """Выгрузить бронирования командой.
+
+        Args:
+            args (str): параметры команды
+
+        Returns:
+            bytes: выгрузка
+        """
+        path = Path(self.directory.name) / 'reserves'
+        call_command('export_reserves', '--output', str(path), *args)
+        return path.read_bytes()
+
+    def test_csv(self):
+        """Тест выгрузки CSV."""
+        rows = list(csv.DictReader(self.run_export().decode().splitlines()))
+        self.assertEqual([row['hotel'] for row in rows], ['Sea', 'Hills'])
+        self.assertEqual(rows[0]['id'], str(self.reserve.id))
+        self.assertEqual(rows[0]['nights'], '3')
+        self.assertEqual(rows[0]['price'], '100.00')
+        self.assertEqual(rows[0]['client'], 'guest')
+        self.assertEqual(rows[0]['services'], 'breakfast;spa')
+        self.assertEqual(rows[1]['services'], '')
+
+    def test_ndjson_filters(self):
+        """Тест выгрузки NDJSON с фильтрами по датам и отелю."""
+        content = self.run_export('--format', export.NDJSON, '--start', '2030-01-01', '--end', '2030-02-01')
+        rows = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [str(self.reserve.id)])
+        self.assertEqual(rows[0]['services'], ['breakfast', 'spa'])
+        self.assertEqual(rows[0]['start_date'], '2030-01-01')
+        content = self.run_export('--format', export.NDJSON, '--hotel', str(self.other_hotel.id))
+        self.assertEqual([json.loads(line)['hotel'] for line in content.splitlines()], ['Hills'])
+
+    def test_gzip(self):
+        """Тест сжатой выгрузки."""
+        self.assertEqual(gzip.decompress(self.run_export('--gzip')), self.run_export())
+
+    def test_single_query(self):
+        """Тест, что выгрузка делает один запрос независимо от количества строк."""
+        with self.assertNumQueries(1):
+            b''.join(export.stream(export.CSV, export.reserves()))
+
+    def test_view(self):
+        """Тест потоковой выгрузки через REST API."""
+        url = reverse('export_reserves')
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(User.objects.create_superuser(username='finance', password='finance'))
+        response = self.client.get(url, {'output': export.NDJSON, 'gzip': 'true', 'hotel': self.hotel.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('reserves.ndjson.gz', response['Content-Disposition'])
+        lines = gzip.decompress(b''.join(response.streaming_content)).splitlines()
+        self.assertEqual([json.loads(line)['hotel'] for line in lines], ['Sea'])
+        response = self.client.get(url, {'start': '2030-02-01', 'end': '2030-01-01'})
+        self.assertEqual(response.status_code, 400)
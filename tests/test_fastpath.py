@@ -0,0 +1,98 @@
+"""Модуль для тестов быстрой отдачи списков."""
+
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hotel_app import fastpath
+from hotel_app.models import Hotel, Room, Service
+
+URLS = ('/rest/hotels/', '/rest/rooms/', '/rest/services/')
+
+
+class FastPathParityTest(TestCase):
+    """Тесты совпадения ответов быстрого пути и сериализаторов."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Заполнить базу данных."""
+        cls.user = User.objects.create_user(username='user', password='user')
+        hotels = Hotel.objects.bulk_create([
+            Hotel(name='Отель "Юг"', rating=4.5, image='https://example.com/1.png'),
+            Hotel(name='abc def', rating=0),
+        ])
+        Room.objects.bulk_create(
+            Room(category='single', floor=floor, number=floor * 100, cost=10.5, hotel=hotel)
+            for hotel in hotels for floor in range(1, 4)
+        )
+        Room.objects.create(category='double', floor=1, number=1, hotel=hotels[0])
+        Service.objects.bulk_create(Service(name=f'service {number}') for number in range(3))
+
+    def setUp(self):
+        """Параметры."""
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url: str, fast: bool, **headers):
+        """Получить ответ.
+
+        Args:
+            url (str): ссылка
+            fast (bool): включить быстрый путь
+            headers (Any): заголовки
+
+        Returns:
+            _type_: ответ
+        """
+        with override_settings(REST_FAST_PATH=fast):
+            response = self.client.get(url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def assert_parity(self, url: str):
+        """Проверить, что ответы совпадают побайтно.
+
+        Args:
+            url (str): ссылка
+        """
+        self.assertEqual(self.get(url, fast=True).content, self.get(url, fast=False).content)
+
+    def test_lists(self):
+        """Тест списков."""
+        for url in URLS:
+            with self.subTest(url=url):
+                self.assert_parity(url)
+
+    def test_fields(self):
+        """Тест выбора полей."""
+        for url in ('/rest/hotels/?fields=name,rating', '/rest/rooms/?fields=id,hotel,cost'):
+            with self.subTest(url=url):
+                self.assert_parity(url)
+
+    def test_pages(self):
+        """Тест курсорных страниц."""
+        url = '/rest/rooms/?page_size=2'
+        while url:
+            self.assert_parity(url)
+            url = self.get(url, fast=True).json()['next']
+
+    def test_json_fallback(self):
+        """Тест рендеринга без orjson."""
+        with mock.patch.object(fastpath, 'orjson', None):
+            for url in URLS:
+                with self.subTest(url=url):
+                    self.assert_parity(url)
+
+    def test_num_queries(self):
+        """Тест, что список строится одним запросом."""
+        with self.assertNumQueries(1):
+            self.get('/rest/rooms/', fast=True)
+
+    def test_browsable_api(self):
+        """Тест, что страница браузера строится сериализатором."""
+        with mock.patch.object(fastpath, 'to_rows') as to_rows:
+            self.get('/rest/rooms/', fast=True, HTTP_ACCEPT='text/html')
+        to_rows.assert_not_called()
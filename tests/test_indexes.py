@@ -0,0 +1,80 @@
+"""Модуль для тестов планов горячих запросов."""
+
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from hotel_app.models import (Client, Hotel, HotelService, Reserve, Room,
+                              Service, overlapping_reserves)
+
+HOTELS = 5000
+ROOMS_PER_HOTEL = 2
+RESERVES_PER_ROOM = 2
+CLIENTS = 1000
+SERVICES = 5
+FIRST_DAY = date(2030, 1, 1)
+
+
+class HotQueryPlanTest(TestCase):
+    """Тесты, что горячие запросы используют индексы."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Заполнить базу данных."""
+        users = User.objects.bulk_create(User(username=f'user{number}') for number in range(CLIENTS))
+        cls.clients = Client.objects.bulk_create(Client(user=user) for user in users)
+        cls.hotels = Hotel.objects.bulk_create(Hotel(name=f'hotel {number}') for number in range(HOTELS))
+        cls.services = Service.objects.bulk_create(Service(name=f'service {number}') for number in range(SERVICES))
+        HotelService.objects.bulk_create(
+            HotelService(hotel=hotel, service=service, cost=1) for hotel in cls.hotels for service in cls.services
+        )
+        cls.rooms = Room.objects.bulk_create(
+            Room(category='single', floor=floor, number=floor, cost=10, hotel=hotel)
+            for hotel in cls.hotels for floor in range(ROOMS_PER_HOTEL)
+        )
+        Reserve.objects.bulk_create(
+            Reserve(
+                user=cls.clients[(position * RESERVES_PER_ROOM + day) % CLIENTS], room=room, price=10,
+                start_date=FIRST_DAY + timedelta(days=2 * day),
+                end_date=FIRST_DAY + timedelta(days=2 * day + 1),
+            )
+            for position, room in enumerate(cls.rooms) for day in range(RESERVES_PER_ROOM)
+        )
+        with connection.cursor() as cursor:
+            for table in ('hotel', 'room', 'reserve', 'hotel_service', 'client'):
+                cursor.execute(f'analyze "hotel"."{table}"')
+
+    def assert_index_scan(self, queryset):
+        """Проверить, что план запроса читает таблицы по индексу.
+
+        Args:
+            queryset (_type_): запрос
+        """
+        plan = queryset.explain()
+        self.assertIn('Index', plan)
+        self.assertNotIn('Seq Scan', plan)
+
+    def test_reserve_overlap(self):
+        """Тест проверки пересечения броней номера."""
+        room = self.rooms[len(self.rooms) // 2]
+        self.assert_index_scan(overlapping_reserves(room.id, FIRST_DAY, FIRST_DAY + timedelta(days=3)))
+
+    def test_reserve_user(self):
+        """Тест броней клиента."""
+        self.assert_index_scan(Reserve.objects.filter(user=self.clients[CLIENTS // 2]).order_by('start_date'))
+
+    def test_room_hotel(self):
+        """Тест номеров отеля."""
+        self.assert_index_scan(Room.objects.filter(hotel=self.hotels[HOTELS // 2]))
+
+    def test_hotel_order(self):
+        """Тест первой страницы отелей."""
+        self.assert_index_scan(Hotel.objects.all()[:10])
+
+    def test_hotel_service(self):
+        """Тест услуги отеля."""
+        hotel_service = HotelService.objects.filter(hotel=self.hotels[HOTELS // 2])
+        self.assert_index_scan(hotel_service)
+        self.assert_index_scan(hotel_service.filter(service=self.services[1]).values('cost'))
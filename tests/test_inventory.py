@@ -0,0 +1,131 @@
+"""Модуль для тестов массового импорта отелей, адресов, номеров и услуг."""
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from hotel_app import inventory, pricing
+from hotel_app.models import Address, Hotel, HotelService, Room, Service
+
+CSV = '''hotel,rating,city,street,house,hotel_image,category,floor,number,cost,room_image,services
+Sea,4.5,Sochi,Kurortny,1,,single,1,101,1000,,breakfast=500;parking=200
+Sea,4.5,Sochi,Kurortny,1,,double,1,102,1500,,breakfast=500
+Hills,3,,,,,studio,2,201,800,,
+Hills,3,,,,,unknown,2,202,800,,
+,3,,,,,studio,2,203,800,,
+Hills,3,,,,,studio,-1,204,800,,
+'''
+JSONL = '\n'.join(json.dumps(row) for row in (
+    {'hotel': 'Sea', 'rating': 4.5, 'city': 'Sochi', 'street': 'Kurortny', 'house': 1,
+     'category': 'single', 'floor': 0, 'number': 103, 'cost': 900, 'services': 'spa=300'},
+    {'hotel': 'Sea', 'rating': 4.5, 'city': 'Sochi', 'street': 'Kurortny', 'house': 1,
+     'category': 'single', 'floor': 1, 'number': 101, 'cost': 900},
+))
+
+
+class InventoryImportTest(TestCase):
+    """Тесты команды import_inventory."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def run_import(self, name: str, content: str, *args: str) -> list[dict]:
+        """Импортировать файл и прочитать отклонённые строки.
+
+        Args:
+            name (str): имя файла
+            content (str): содержимое
+            args (str): параметры команды
+
+        Returns:
+            list[dict]: отклонённые строки
+        """
+        path = Path(self.directory.name) / name
+        path.write_text(content, encoding='utf-8')
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('import_inventory', str(path), *args, stdout=StringIO())
+        with open(f'{path}.rejects', encoding='utf-8') as errors:
+            return [json.loads(line) for line in errors]
+
+    def test_csv(self):
+        """Тест импорта CSV и отклонённых строк."""
+        rejects = self.run_import('inventory.csv', CSV, '--chunk-size', '2')
+        self.assertEqual(
+            [(reject['line'], reject['error']) for reject in rejects],
+            [
+                (5, inventory.BAD_CATEGORY),
+                (6, inventory.MISSING.format(column='hotel')),
+                (7, inventory.NOT_INTEGER.format(column='floor')),
+            ],
+        )
+        self.assertEqual(rejects[0]['row']['number'], '202')
+        self.assertEqual(Address.objects.count(), 1)
+        sea = Hotel.objects.get(name='Sea')
+        self.assertEqual(sea.hotel_address.city, 'Sochi')
+        self.assertIsNone(Hotel.objects.get(name='Hills').hotel_address)
+        self.assertEqual(sorted(Room.objects.values_list('number', flat=True)), [101, 102, 201])
+        self.assertEqual(
+            sorted((price.name, price.cost) for price in pricing.hotel_services(sea.id)),
+            [('breakfast', 500), ('parking', 200)],
+        )
+
+    def test_jsonl_reuses_existing(self):
+        """Тест, что повторный импорт находит адреса, отели и услуги и не дублирует номера."""
+        self.run_import('inventory.csv', CSV)
+        self.assertEqual(len(pricing.hotel_services(Hotel.objects.get(name='Sea').id)), 2)
+        rejects = self.run_import('inventory.jsonl', JSONL)
+        self.assertEqual([(reject['line'], reject['error']) for reject in rejects], [(2, inventory.ROOM_EXISTS)])
+        self.assertEqual(Address.objects.count(), 1)
+        self.assertEqual(Hotel.objects.filter(name='Sea').count(), 1)
+        self.assertEqual(Room.objects.get(number=103).floor, 0)
+        self.assertEqual(Service.objects.count(), 3)
+        self.assertEqual(HotelService.objects.count(), 3)
+        self.assertEqual(len(pricing.hotel_services(Hotel.objects.get(name='Sea').id)), 3)
+
+    def test_reimport_is_idempotent(self):
+        """Тест, что повторный импорт того же файла ничего не добавляет."""
+        self.run_import('inventory.csv', CSV)
+        counts = [model.objects.count() for model in (Address, Hotel, Service, HotelService, Room)]
+        rejects = self.run_import('inventory.csv', CSV, '--chunk-size', '1')
+        self.assertEqual([model.objects.count() for model in (Address, Hotel, Service, HotelService, Room)], counts)
+        self.assertEqual(sum(reject['error'] == inventory.ROOM_EXISTS for reject in rejects), 3)
+
+    def test_atomic(self):
+        """Тест, что с --atomic отклонённая строка отменяет весь импорт."""
+        with self.assertRaises(CommandError):
+            self.run_import('inventory.csv', CSV, '--atomic')
+        self.assertFalse(Room.objects.exists())
+        self.assertFalse(Hotel.objects.exists())
+
+    def test_bad_values(self):
+        """Тест, что битая строка JSONL и неверная стоимость отклоняют строку, а не весь импорт."""
+        self.assertIsNone(inventory.parse_services('a=NaN'))
+        self.assertIsNone(inventory.parse_services('a=Infinity'))
+        self.assertIsNone(inventory.parse_services(f'a={inventory.MAX_COST}'))
+        room = {'hotel': 'Sea', 'category': 'single', 'floor': 1}
+        content = '\n'.join((
+            '{not json',
+            '[1, 2]',
+            json.dumps({**room, 'number': 1, 'services': 'x=NaN'}),
+            json.dumps({**room, 'number': 2, 'cost': 10 ** 12}),
+            json.dumps({**room, 'number': 3}),
+        ))
+        rejects = self.run_import('inventory.jsonl', content)
+        self.assertEqual(
+            [(reject['line'], reject['error'].split(':')[0]) for reject in rejects],
+            [
+                (1, inventory.BAD_JSON.split(':')[0]),
+                (2, inventory.NOT_OBJECT),
+                (3, inventory.BAD_SERVICES.split(':')[0]),
+                (4, inventory.COST_TOO_LARGE),
+            ],
+        )
+        self.assertEqual(list(Room.objects.values_list('number', flat=True)), [3])
@@ -4,6 +4,7 @@ from datetime import date
 
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 
 from hotel_app.models import Client, Hotel, Reserve, Room, Service
@@ -104,3 +105,42 @@ class ReserveTest(TestCase):
     def test_create_and_str(self):
         """Тест на создание и метод стр."""
         self.assertEqual(str(Reserve.objects.create(**self.reserve_data)), 'abc 5 2030-07-20')
+
+    def test_adjacent_reserves(self):
+        """Тест на брони, где выезд совпадает с заездом."""
+        Reserve.objects.create(**self.reserve_data)
+        self.reserve_data.update(start_date=date(2030, 7, 20), end_date=date(2030, 7, 22))
+        Reserve.objects.create(**self.reserve_data)
+        self.assertEqual(Reserve.objects.filter(room=self.room).count(), 2)
+
+    def test_overlapping_reserves(self):
+        """Тест на пересекающиеся брони."""
+        Reserve.objects.create(**self.reserve_data)
+        periods = (
+            (date(2030, 7, 16), date(2030, 7, 18)),
+            (date(2030, 7, 18), date(2030, 7, 19)),
+            (date(2030, 7, 19), date(2030, 7, 25)),
+            (date(2030, 7, 10), date(2030, 7, 25)),
+        )
+        for start_date, end_date in periods:
+            self.reserve_data.update(start_date=start_date, end_date=end_date)
+            with self.assertRaises(ValidationError):
+                Reserve.objects.create(**self.reserve_data)
+
+    def test_clean_single_query(self):
+        """Тест на проверку брони одним запросом."""
+        Reserve.objects.create(**self.reserve_data)
+        reserve = Reserve(**self.reserve_data)
+        with self.assertNumQueries(1):
+            with self.assertRaises(ValidationError):
+                reserve.clean()
+
+    def test_database_constraint(self):
+        """Тест на ограничение базы данных при обходе проверки модели."""
+        reserves = [
+            Reserve(**self.reserve_data),
+            Reserve(**{**self.reserve_data, 'start_date': date(2030, 7, 19), 'end_date': date(2030, 7, 21)}),
+        ]
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Reserve.objects.bulk_create(reserves)
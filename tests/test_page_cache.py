@@ -0,0 +1,142 @@
+"""Модуль для тестов кэша страниц отелей и номеров."""
+
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from hotel_app import fragments, page_cache
+from hotel_app.models import Address, Hotel, HotelService, Room, Service
+
+
+@override_settings(PAGE_CACHE=True)
+class PageCacheTest(TestCase):
+    """Тесты кэша страниц и его сброса сигналами."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        cache.clear()
+        self.address = Address.objects.create(city='Sochi', street='Kurortny', number=1)
+        self.hotel = Hotel.objects.create(name='abc', rating=4.4, hotel_address=self.address)
+        self.room = Room.objects.create(category='single', floor=1, number=101, cost=10, hotel=self.hotel)
+        self.hotel_url = f"{reverse('hotel')}?id={self.hotel.id}"
+        self.room_url = f"{reverse('room')}?id={self.room.id}"
+
+    def get(self, url: str) -> str:
+        """Получить страницу.
+
+        Args:
+            url (str): ссылка
+
+        Returns:
+            str: html
+        """
+        return self.client.get(url).content.decode()
+
+    def test_hit(self):
+        """Тест, что повторная страница не делает запросов."""
+        for url in (self.hotel_url, self.room_url):
+            with self.subTest(url=url):
+                first = self.get(url)
+                with self.assertNumQueries(0):
+                    self.assertEqual(self.get(url), first)
+
+    def test_hotel_changed(self):
+        """Тест сброса при изменении отеля."""
+        self.get(self.hotel_url)
+        self.get(self.room_url)
+        self.hotel.name = 'renamed'
+        self.hotel.save()
+        self.assertIn('renamed', self.get(self.hotel_url))
+        self.assertIn('renamed', self.get(self.room_url))
+
+    def test_room_changed(self):
+        """Тест сброса при добавлении и изменении номера."""
+        self.get(self.hotel_url)
+        Room.objects.create(category='double', floor=7, number=707, cost=10, hotel=self.hotel)
+        self.assertIn('707', self.get(self.hotel_url))
+        self.get(self.room_url)
+        self.room.cost = 55
+        self.room.save()
+        self.assertIn('55', self.get(self.room_url))
+
+    def test_address_changed(self):
+        """Тест сброса при изменении адреса."""
+        self.get(self.hotel_url)
+        self.address.city = 'Anapa'
+        self.address.save()
+        self.assertIn('Anapa', self.get(self.hotel_url))
+
+    def test_hotel_service_changed(self):
+        """Тест сброса при добавлении услуги отеля."""
+        self.get(self.hotel_url)
+        HotelService.objects.create(hotel=self.hotel, service=Service.objects.create(name='breakfast'), cost=5)
+        self.assertIn('breakfast', self.get(self.hotel_url))
+
+    def test_other_hotel_kept(self):
+        """Тест, что изменение другого отеля не сбрасывает страницу."""
+        self.get(self.hotel_url)
+        Hotel.objects.create(name='other', rating=3)
+        hits = page_cache.stats['hit']
+        self.get(self.hotel_url)
+        self.assertEqual(page_cache.stats['hit'], hits + 1)
+
+    def test_version_expires(self):
+        """Тест, что версия страницы, в том числе несуществующего объекта, хранится не бессрочно."""
+        with mock.patch.object(page_cache.cache, 'add', wraps=page_cache.cache.add) as add:
+            page_cache.get_or_render(page_cache.HOTEL, 'missing', lambda: '')
+        self.assertEqual(add.call_args.args[2], page_cache.timeout())
+
+    @override_settings(PAGE_CACHE=False)
+    def test_disabled(self):
+        """Тест без кэша."""
+        self.get(self.hotel_url)
+        Hotel.objects.filter(id=self.hotel.id).update(name='updated')
+        self.assertIn('updated', self.get(self.hotel_url))
+
+
+class FragmentCacheTest(TestCase):
+    """Тесты кэша карточек отелей и плиток номеров."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        cache.clear()
+        self.address = Address.objects.create(city='Sochi', street='Kurortny', number=1)
+        self.hotels = [
+            Hotel.objects.create(name=f'hotel {number}', rating=4, hotel_address=self.address) for number in range(10)
+        ]
+
+    def test_one_round_trip(self):
+        """Тест, что карточки страницы читаются одним get_many и не рендерятся заново."""
+        first = self.client.get(reverse('homepage')).content
+        with mock.patch.object(fragments.cache, 'get_many', wraps=fragments.cache.get_many) as get_many:
+            with mock.patch.object(fragments, 'render_to_string') as render_to_string:
+                self.assertEqual(self.client.get(reverse('homepage')).content, first)
+        get_many.assert_called_once()
+        render_to_string.assert_not_called()
+
+    def test_changed(self):
+        """Тест новых карточек после изменения отеля и адреса."""
+        self.client.get(reverse('homepage'))
+        self.hotels[0].name = 'hotel renamed'
+        self.hotels[0].save()
+        self.address.city = 'Anapa'
+        self.address.save()
+        content = self.client.get(reverse('homepage')).content.decode()
+        self.assertIn('hotel renamed', content)
+        self.assertNotIn('Sochi', content)
+
+    def test_warm(self):
+        """Тест прогрева кэша командой."""
+        Room.objects.create(category='single', floor=1, number=101, cost=10, hotel=self.hotels[0])
+        out = StringIO()
+        call_command('warm_fragments', batch_size=3, stdout=out)
+        self.assertIn(f'{fragments.HOTEL_CARD}: 10 fragments', out.getvalue())
+        self.assertIn(f'{fragments.ROOM_TILE}: 1 fragments', out.getvalue())
+        with mock.patch.object(fragments, 'render_to_string') as render_to_string:
+            self.client.get(reverse('homepage'))
+            self.client.get(f"{reverse('hotel')}?id={self.hotels[0].id}")
+        render_to_string.assert_not_called()
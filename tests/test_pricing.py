@@ -0,0 +1,69 @@
+"""Модуль для тестов расчёта стоимости."""
+
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from hotel_app import pricing
+from hotel_app.models import Hotel, HotelService, Room, Service
+
+
+class PricingTest(TestCase):
+    """Тесты расчёта стоимости."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        hotel = Hotel.objects.create(name='abc', rating=4.4)
+        self.room = Room.objects.create(category='single', floor=1, number=101, cost=10, hotel=hotel)
+        self.breakfast = Service.objects.create(name='breakfast')
+        self.parking = Service.objects.create(name='parking')
+        self.hotel_breakfast = HotelService.objects.create(hotel=hotel, service=self.breakfast, cost=3)
+        HotelService.objects.create(hotel=hotel, service=self.parking, cost=2)
+        self.period = (date(2030, 7, 10), date(2030, 7, 13))
+
+    def test_quote(self):
+        """Тест стоимости номера с услугами."""
+        self.assertEqual(pricing.quote(self.room, *self.period), 30)
+        self.assertEqual(pricing.quote(self.room, *self.period, [self.breakfast.id]), 39)
+        self.assertEqual(pricing.quote(self.room, *self.period, [self.breakfast.id, self.parking.id]), 45)
+
+    def test_cached(self):
+        """Тест, что услуги отеля читаются одним запросом и кэшируются."""
+        pricing.invalidate(self.room.hotel_id)
+        with self.assertNumQueries(1):
+            pricing.quote(self.room, *self.period, [self.breakfast.id, self.parking.id])
+        with self.assertNumQueries(0):
+            pricing.quote(self.room, *self.period, [self.breakfast.id])
+
+    def test_invalidation(self):
+        """Тест сброса кэша при изменении услуги отеля."""
+        pricing.quote(self.room, *self.period, [self.breakfast.id])
+        self.hotel_breakfast.cost = 5
+        self.hotel_breakfast.save()
+        self.assertEqual(pricing.quote(self.room, *self.period, [self.breakfast.id]), 45)
+        self.hotel_breakfast.delete()
+        self.assertEqual(pricing.quote(self.room, *self.period, [self.breakfast.id]), 30)
+
+    def test_invalidation_on_commit(self):
+        """Тест, что цены, прочитанные до фиксации транзакции, сбрасываются после неё."""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hotel_breakfast.cost = 5
+            self.hotel_breakfast.save()
+            # другой запрос кладёт в кэш цены, прочитанные до фиксации
+            stale = [pricing.ServicePrice(self.breakfast.id, self.breakfast.name, 3)]
+            cache.set(pricing.CACHE_KEY.format(hotel_id=self.room.hotel_id), stale)
+        self.assertEqual(pricing.quote(self.room, *self.period, [self.breakfast.id]), 45)
+
+    def test_api(self):
+        """Тест апи расчёта стоимости."""
+        api_client = APIClient()
+        api_client.force_authenticate(user=User.objects.create(username='user', password='user'))
+        params = {'room': self.room.id, 'start': '2030-07-10', 'end': '2030-07-13', 'services': [self.parking.id]}
+        response = api_client.get('/rest/quote/', params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['nights'], 3)
+        self.assertEqual(response.data['price'], 36)
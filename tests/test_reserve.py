@@ -1,10 +1,22 @@
 """Модуль для тестов бронирования."""
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from time import perf_counter
+
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
 from django.test import client as test_client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
 
-from hotel_app.models import Client, Hotel, Room
+from hotel_app import booking
+from hotel_app.booking import book_room
+from hotel_app.models import (RESERVE_EXIST, Client, Hotel, HotelService,
+                              Reserve, ReserveService, Room, Service)
 
 
 class TestReserve(TestCase):
@@ -19,8 +31,8 @@ class TestReserve(TestCase):
         self.hotel_client = Client.objects.create(user=self.user)
         self.test_client.force_login(self.user)
 
-        hotel = Hotel.objects.create(name='abc', rating=4.4)
-        self.room = Room.objects.create(category='business', floor=10, number=111, hotel=hotel, cost=10)
+        self.hotel = Hotel.objects.create(name='abc', rating=4.4)
+        self.room = Room.objects.create(category='business', floor=10, number=111, hotel=self.hotel, cost=10)
         self.page_url = f'{self._reserve_page}?id={self.room.id}'
 
     def test_insufficient_funds(self):
@@ -58,3 +70,161 @@ class TestReserve(TestCase):
         self.assertEqual(self.hotel_client.money, 0)
         reserved_client_rooms = self.hotel_client.rooms.filter(id=self.room.id)
         self.assertEqual(len(reserved_client_rooms), 2)
+
+    def test_book_with_services(self):
+        """Тест бронирования с услугами."""
+        service = Service.objects.create(name='breakfast')
+        HotelService.objects.create(hotel=self.hotel, service=service, cost=5)
+        self.hotel_client.money = 40
+        self.hotel_client.save()
+
+        start_date = date.today() + timedelta(days=30)
+        self.test_client.post(
+            self.page_url, {'start_date': start_date, 'end_date': start_date + timedelta(days=2), 'breakfast': 'on'},
+        )
+        self.hotel_client.refresh_from_db()
+
+        self.assertEqual(self.hotel_client.money, 10)
+        self.assertTrue(ReserveService.objects.filter(reserve__room=self.room, service=service).exists())
+
+
+class TestConcurrentBooking(TransactionTestCase):
+    """Тест конкурентного бронирования одного номера."""
+
+    bookings = 200
+    workers = 20
+    max_seconds = 30
+
+    def setUp(self) -> None:
+        """Параметры."""
+        hotel = Hotel.objects.create(name='abc', rating=4.4)
+        self.room = Room.objects.create(category='business', floor=10, number=111, hotel=hotel, cost=10)
+        users = User.objects.bulk_create(User(username=f'user{number}') for number in range(self.bookings))
+        self.clients = Client.objects.bulk_create(Client(user=user, money=100) for user in users)
+
+    def book(self, client: Client) -> bool:
+        """Забронировать номер в отдельном потоке.
+
+        Args:
+            client (Client): клиент
+
+        Returns:
+            bool: удалось ли забронировать
+        """
+        try:
+            book_room(client, self.room, date(2030, 7, 20), date(2030, 7, 22))
+        except ValidationError:
+            return False
+        finally:
+            connection.close()
+        return True
+
+    def book_all(self) -> list[bool]:
+        """Забронировать номер всеми клиентами параллельно.
+
+        Returns:
+            list[bool]: удалось ли забронировать каждому клиенту
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self.book, self.clients))
+
+    def test_one_winner(self):
+        """Тест, что из параллельных броней проходит ровно одна."""
+        start = perf_counter()
+        results = self.book_all()
+        elapsed = perf_counter() - start
+
+        self.assertEqual(sum(results), 1)
+        self.assertEqual(Reserve.objects.filter(room=self.room).count(), 1)
+        self.assertEqual(Client.objects.filter(money=80).count(), 1)
+        self.assertEqual(Client.objects.filter(money=100).count(), self.bookings - 1)
+        self.assertLess(elapsed, self.max_seconds)
+
+
+class BatchReserveTest(TestCase):
+    """Тесты пакетного создания броней."""
+
+    url = '/rest/reserve/batch/'
+
+    def setUp(self) -> None:
+        """Параметры."""
+        self.api = APIClient()
+        self.api.force_authenticate(user=User.objects.create_user(username='operator', is_superuser=True))
+        self.hotel = Hotel.objects.create(name='abc', rating=4.4)
+        self.room = Room.objects.create(category='business', floor=10, number=111, hotel=self.hotel, cost=10)
+        self.other_room = Room.objects.create(category='business', floor=10, number=112, hotel=self.hotel, cost=20)
+        self.service = Service.objects.create(name='breakfast')
+        HotelService.objects.create(hotel=self.hotel, service=self.service, cost=5)
+        self.hotel_client = Client.objects.create(user=User.objects.create(username='user', password='user'))
+        Reserve.objects.create(
+            user=self.hotel_client, room=self.room, start_date=date(2030, 7, 10), end_date=date(2030, 7, 15),
+        )
+
+    def item(self, room: Room, start: str, end: str, **extra) -> dict:
+        """Получить бронь пакета.
+
+        Args:
+            room (Room): номер
+            start (str): дата заезда
+            end (str): дата выезда
+            extra (Any): другие поля
+
+        Returns:
+            dict: бронь
+        """
+        return {'room': str(room.id), 'user': str(self.hotel_client.id), 'start_date': start, 'end_date': end, **extra}
+
+    def test_batch(self):
+        """Тест пакета с пересечениями в базе и внутри пакета."""
+        reserves = [
+            self.item(self.room, '2030-07-15', '2030-07-17', services=[str(self.service.id)]),
+            self.item(self.room, '2030-07-14', '2030-07-15'),
+            self.item(self.room, '2030-07-16', '2030-07-18'),
+            self.item(self.other_room, '2030-07-16', '2030-07-18'),
+            self.item(self.other_room, '2030-07-18', '2030-07-16'),
+            {'room': 'not a uuid'},
+        ]
+        response = self.api.post(self.url, {'reserves': reserves}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        results = response.json()['results']
+        self.assertEqual(response.json()['created'], 2)
+        self.assertEqual([result['price'] for result in results if 'id' in result], ['30.00', '40.00'])
+        self.assertEqual(results[1]['errors'], {booking.NON_FIELD_ERRORS: [RESERVE_EXIST]})
+        self.assertEqual(results[2]['errors'], {booking.NON_FIELD_ERRORS: [RESERVE_EXIST]})
+        self.assertIn('end_date', results[4]['errors'])
+        self.assertIn('room', results[5]['errors'])
+        reserve = Reserve.objects.get(id=results[0]['id'])
+        self.assertEqual(list(reserve.services.all()), [self.service])
+        self.hotel_client.refresh_from_db()
+        self.assertEqual(self.hotel_client.active_reserves, 3)
+
+    def test_duplicate_services(self):
+        """Тест, что повтор услуги в брони пакета не роняет пакет."""
+        service = str(self.service.id)
+        reserves = [self.item(self.other_room, '2030-07-16', '2030-07-18', services=[service, service])]
+        response = self.api.post(self.url, {'reserves': reserves}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        reserve = Reserve.objects.get(id=response.json()['results'][0]['id'])
+        self.assertEqual(list(reserve.services.all()), [self.service])
+        self.assertEqual(reserve.price, 50)
+
+    def test_all_or_none(self):
+        """Тест, что с all_or_none пакет с ошибкой ничего не сохраняет."""
+        reserves = [
+            self.item(self.other_room, '2030-07-16', '2030-07-18'), self.item(self.room, '2030-07-11', '2030-07-12'),
+        ]
+        response = self.api.post(self.url, {'reserves': reserves, 'all_or_none': True}, format='json')
+        self.assertEqual(response.json()['created'], 0)
+        self.assertEqual(response.json()['results'][0]['errors'], {booking.NON_FIELD_ERRORS: [booking.BATCH_ABORTED]})
+        self.assertFalse(Reserve.objects.filter(room=self.other_room).exists())
+
+    def test_queries(self):
+        """Тест, что количество запросов не растёт с размером пакета."""
+        def post(count: int, month: int) -> int:
+            reserves = [self.item(self.other_room, f'2030-{month:02}-{day:02}', f'2030-{month:02}-{day + 1:02}')
+                        for day in range(1, count + 1)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.api.post(self.url, {'reserves': reserves}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+        self.assertEqual(post(2, 8), post(20, 9))
@@ -0,0 +1,117 @@
+"""Модуль для тестов поиска отелей."""
+
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from hotel_app.models import Address, Hotel
+
+
+class SearchTest(TestCase):
+    """Тесты поиска отелей."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        self.palace = Hotel.objects.create(
+            name='Grand Palace', rating=5,
+            hotel_address=Address.objects.create(city='Moscow', street='Tverskaya', number=1),
+        )
+        self.lenina = Hotel.objects.create(name='Lenina', rating=4)
+        self.street = Hotel.objects.create(
+            name='Quiet corner', rating=3,
+            hotel_address=Address.objects.create(city='Kazan', street='Lenina', number=2),
+        )
+
+    def found(self, text: str) -> list:
+        """Найти отели.
+
+        Args:
+            text (str): запрос
+
+        Returns:
+            list: названия найденных отелей, лучшие первыми
+        """
+        return [hotel.name for hotel in Hotel.objects.search(text)]
+
+    def test_fields(self):
+        """Тест поиска по названию, городу и улице и ранга названия выше улицы."""
+        self.assertEqual(self.found('grand'), ['Grand Palace'])
+        self.assertEqual(self.found('moscow'), ['Grand Palace'])
+        self.assertEqual(self.found('tverskaya'), ['Grand Palace'])
+        self.assertEqual(self.found('lenina'), ['Lenina', 'Quiet corner'])
+        self.assertEqual(self.found('paris'), [])
+
+    def test_typo(self):
+        """Тест, что триграммы находят запрос с опечаткой."""
+        self.assertEqual(self.found('grand palase'), ['Grand Palace'])
+
+    def test_refresh_on_write(self):
+        """Тест пересчёта поисковых полей при смене названия, адреса и после bulk_create."""
+        self.palace.name = 'Riverside'
+        self.palace.save()
+        self.assertEqual(self.found('riverside'), ['Riverside'])
+        address = self.street.hotel_address
+        address.city = 'Samara'
+        address.save()
+        self.assertEqual(self.found('samara'), ['Quiet corner'])
+        Hotel.objects.bulk_create([Hotel(name='Bulk inn', rating=2)])
+        self.assertEqual(self.found('bulk'), [])
+        Hotel.objects.refresh_search()
+        self.assertEqual(self.found('bulk'), ['Bulk inn'])
+
+    def test_save_untracked(self):
+        """Тест, что сохранение без смены названия, адреса и рейтинга не пересчитывает поиск и номера."""
+        hotel = Hotel.objects.get(pk=self.palace.pk)
+        hotel.image = 'palace.png'
+        with mock.patch.object(Hotel.objects, 'refresh_search') as refresh_search, \
+                CaptureQueriesContext(connection) as queries:
+            hotel.save()
+        refresh_search.assert_not_called()
+        self.assertFalse([query for query in queries if '"room"' in query['sql']])
+        hotel.name = 'Palace'
+        hotel.save()
+        self.assertEqual(self.found('palace'), ['Palace'])
+
+    def test_rest(self):
+        """Тест поиска REST API со страницами без подсчёта."""
+        client = APIClient()
+        url = reverse('hotel-search')
+        self.assertEqual(client.get(url, {'q': 'lenina'}).status_code, status.HTTP_401_UNAUTHORIZED)
+        user = User.objects.create_user(username='user', password='user')
+        client.force_authenticate(user=user, token=Token.objects.create(user=user))
+        self.assertEqual(client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        first = client.get(url, {'q': 'lenina', 'page_size': 1}).json()
+        self.assertEqual([hotel['name'] for hotel in first['results']], ['Lenina'])
+        self.assertIn('score', first['results'][0])
+        self.assertIsNone(first['previous'])
+        second = client.get(first['next']).json()
+        self.assertEqual([hotel['name'] for hotel in second['results']], ['Quiet corner'])
+        self.assertIsNone(second['next'])
+        self.assertEqual(client.get(url, {'q': 'lenina', 'page': 0}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_deferred(self):
+        """Тест, что списки и страницы отелей не читают поисковые поля."""
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(reverse('homepage')).status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                self.client.get(reverse('hotel'), {'id': self.palace.id}).status_code, status.HTTP_200_OK,
+            )
+        for query in queries:
+            self.assertNotIn('search_vector', query['sql'])
+            self.assertNotIn('search_text', query['sql'])
+
+    def test_page(self):
+        """Тест страницы поиска."""
+        response = self.client.get(reverse('search'), {'q': 'moscow'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContains(response, 'Grand Palace')
+        self.assertNotContains(response, 'Quiet corner')
+        self.assertContains(self.client.get(reverse('search'), {'q': 'paris'}), 'Ничего не найдено')
+        self.assertNotContains(self.client.get(reverse('search')), 'Ничего не найдено')
@@ -0,0 +1,56 @@
+"""Модуль для тестов генерации синтетических данных."""
+
+from io import StringIO
+
+import numpy as np
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.test import TestCase
+
+from hotel_app import pricing, seed
+from hotel_app.models import (Client, HotelDailyStats, Reserve,
+                              ReserveService, Room)
+
+CONFIG = seed.SeedConfig(hotels=3, rooms=4, reserves=100, clients=5, services=3, service_ratio=0.5, seed=7)
+
+
+class SeedTest(TestCase):
+    """Тесты генерации и загрузки данных."""
+
+    def test_deterministic(self):
+        """Тест, что один seed даёт одинаковые данные, а брони номера не пересекаются."""
+        first, second = seed.generate(CONFIG), seed.generate(CONFIG)
+        self.assertEqual(first.reserves['id'], second.reserves['id'])
+        self.assertEqual(first.reserves['start_date'], second.reserves['start_date'])
+        self.assertNotEqual(first.reserves['id'], seed.generate(CONFIG._replace(seed=8)).reserves['id'])
+        rooms = np.array(first.reserves['room_id'])
+        starts = np.array(first.reserves['start_date'], dtype='datetime64[D]')
+        ends = np.array(first.reserves['end_date'], dtype='datetime64[D]')
+        for room in set(first.reserves['room_id']):
+            mask = rooms == room
+            self.assertTrue((starts[mask][1:] >= ends[mask][:-1]).all())
+
+    def test_load(self):
+        """Тест загрузки, цен броней и пересчёта сводок."""
+        counts = seed.load(seed.generate(CONFIG), chunk_size=30, workers=1)
+        self.assertEqual(counts['rooms'], 12)
+        self.assertEqual(Reserve.objects.count(), 100)
+        self.assertEqual(ReserveService.objects.count(), counts['reserve services'])
+        for reserve in Reserve.objects.select_related('room').prefetch_related('services')[:20]:
+            with self.subTest(reserve=reserve.id):
+                services = [service.id for service in reserve.services.all()]
+                self.assertEqual(reserve.price, pricing.quote(reserve.room, reserve.start_date, reserve.end_date,
+                                                              services))
+        spent = Client.objects.aggregate(total=Sum('total_spent'))['total']
+        self.assertEqual(spent, Reserve.objects.aggregate(total=Sum('price'))['total'])
+        self.assertTrue(HotelDailyStats.objects.exists())
+        self.assertEqual(Room.objects.filter(category__in=seed.CATEGORIES.tolist()).count(), 12)
+
+    def test_command(self):
+        """Тест команды и отказа загружать тот же seed повторно."""
+        options = ['--hotels', '2', '--rooms', '3', '--reserves', '20', '--clients', '4', '--workers', '1']
+        call_command('seed', *options, stdout=StringIO())
+        self.assertEqual(Reserve.objects.count(), 20)
+        with self.assertRaises(CommandError):
+            call_command('seed', *options, stdout=StringIO())
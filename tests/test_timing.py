@@ -0,0 +1,74 @@
+"""Модуль для тестов замера запросов."""
+
+import json
+
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework import serializers
+
+from hotel_app import timing
+from hotel_app.models import Hotel
+
+
+class HotelNameSerializer(serializers.ModelSerializer):
+    """Название отеля сериализатор."""
+
+    class Meta:
+        model = Hotel
+        fields = ['name']
+
+
+def n_plus_one(request):
+    """Страница, читающая отели по одному, с шаблоном и сериализатором.
+
+    Args:
+        request (_type_): запрос
+
+    Returns:
+        _type_: ответ
+    """
+    hotels = [Hotel.objects.get(id=id_) for id_ in Hotel.objects.values_list('id', flat=True)]
+    content = Template('{% for hotel in hotels %}{{ hotel.name }}{% endfor %}').render(Context({'hotels': hotels}))
+    HotelNameSerializer(hotels, many=True).data
+    return HttpResponse(content)
+
+
+@override_settings(REQUEST_TIMING=True, REQUEST_TIMING_SLOW_MS=10 ** 6, REQUEST_TIMING_MAX_DUPLICATES=5)
+class TimingTest(TestCase):
+    """Тесты middleware замера."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        Hotel.objects.bulk_create(Hotel(name=f'hotel {number}', rating=4) for number in range(4))
+        self.middleware = timing.RequestTimingMiddleware(n_plus_one)
+
+    def test_measure(self):
+        """Тест счёта запросов, повторов и времени шаблонов и сериализаторов."""
+        with self.assertLogs('hotel_app.timing', 'INFO') as logs:
+            response = self.middleware(RequestFactory().get('/'))
+        self.assertEqual(response.content.decode(), ''.join(f'hotel {number}' for number in range(4)))
+        measured = response.request_timing
+        self.assertEqual(measured.queries, 5)
+        self.assertEqual(measured.duplicates, 3)
+        self.assertGreater(measured.templates_ms, 0)
+        self.assertGreater(measured.serializers_ms, 0)
+        self.assertIn('sql;dur=', response['Server-Timing'])
+        self.assertIn('5 queries, 3 duplicates', response['Server-Timing'])
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual((line['path'], line['queries'], line['slow']), ('/', 5, False))
+
+    def test_slow(self):
+        """Тест предупреждения о запросе с повторами SQL выше порога."""
+        with override_settings(REQUEST_TIMING_MAX_DUPLICATES=2):
+            with self.assertLogs('hotel_app.timing', 'WARNING') as logs:
+                self.middleware(RequestFactory().get('/'))
+        line = json.loads(logs.records[0].getMessage())
+        self.assertTrue(line['slow'])
+        self.assertEqual(len(line['repeated']), 1)
+
+    def test_disabled(self):
+        """Тест, что без настройки middleware не подключается."""
+        with override_settings(REQUEST_TIMING=False):
+            with self.assertRaises(timing.MiddlewareNotUsed):
+                timing.RequestTimingMiddleware(n_plus_one)
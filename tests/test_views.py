@@ -1,21 +1,28 @@
 """Модуль для тестов представления."""
 
+from datetime import date, timedelta
+
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.test.client import Client as TestClient
 from django.urls import reverse
 from rest_framework import status
 
+from hotel_app.booking import book_room, cancel_reserve
 from hotel_app.models import Client, Hotel, Reserve, Room
+from tests.budget import QueryBudgetMixin
 
 
-def create_method_with_auth(url: str, page_name: str, template: str, login=False):
+def create_method_with_auth(url: str, page_name: str, template: str, budget: int, login=False):
     """Создать метод с аутентификацией.
 
     Args:
         url (str): ссылка
         page_name (str): имя страницы
         template (str): шаблон
+        budget (int): наибольшее количество SQL-запросов страницы
         login (bool): истина/ложь. по умолчанию False.
 
     Returns:
@@ -33,7 +40,8 @@ def create_method_with_auth(url: str, page_name: str, template: str, login=False
             Client.objects.create(user=user)
             self.client.force_login(user=user)
 
-        response = self.client.get(url)
+        with self.assertQueryBudget(budget):
+            response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTemplateUsed(response, template)
 
@@ -42,19 +50,22 @@ def create_method_with_auth(url: str, page_name: str, template: str, login=False
     return method
 
 
+# сессия и пользователь - два запроса при входе
 casual_pages = (
-    ('', 'homepage', 'index.html'),
-    ('/register/', 'register', 'registration/register.html'),
-    ('/accounts/login/', 'login', 'registration/login.html'),
-    ('/book_by_date/', 'book_by_date', 'book_by_date.html'),
+    ('', 'homepage', 'index.html', 4),
+    ('/register/', 'register', 'registration/register.html', 2),
+    ('/accounts/login/', 'login', 'registration/login.html', 2),
+    ('/book_by_date/', 'book_by_date', 'book_by_date.html', 2),
 )
 
-methods_with_auth = {'test_profile': create_method_with_auth(*('/profile/', 'profile', 'profile.html'), login=True)}
-TestWithAuth = type('TestWithAuth', (TestCase,), methods_with_auth)
+methods_with_auth = {
+    'test_profile': create_method_with_auth(*('/profile/', 'profile', 'profile.html', 5), login=True),
+}
+TestWithAuth = type('TestWithAuth', (QueryBudgetMixin, TestCase), methods_with_auth)
 
 casual_methods = {f'test_with_auth_{page[1]}': create_method_with_auth(*page, login=True) for page in casual_pages}
 casual_methods.update({f'test_no_auth_{page[1]}': create_method_with_auth(*page, login=False) for page in casual_pages})
-TestCasualPage = type('TestCasualPages', (TestCase,), casual_methods)
+TestCasualPage = type('TestCasualPages', (QueryBudgetMixin, TestCase), casual_methods)
 
 
 def create_method_no_auth(url: str):
@@ -81,13 +92,14 @@ methods_no_auth = {f'test_{url}': create_method_no_auth(url) for url in ('/profi
 TestNoAuth = type('TestNoAuth', (TestCase,), methods_no_auth)
 
 
-def create_method_instance(url: str, page_name: str, template: str, model, creation_attrs: dict):
+def create_method_instance(url: str, page_name: str, template: str, budget: int, model, creation_attrs: dict):
     """Создать метод экземпляра.
 
     Args:
         url (str): ссылка
         page_name (str): имя траницы
         template (str): шаблон
+        budget (int): наибольшее количество SQL-запросов страницы
         model (_type_): класс модели
         creation_attrs (dict): словарь с атрибутами
 
@@ -119,7 +131,8 @@ def create_method_instance(url: str, page_name: str, template: str, model, creat
         created_url = f'{url}?id={created_id}'
         created_reversed_url = f'{reverse(page_name)}?id={created_id}'
         # GET with valid id
-        response = self.client.get(created_url)
+        with self.assertQueryBudget(budget):
+            response = self.client.get(created_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertTemplateUsed(response, template)
         self.assertEqual(self.client.get(created_reversed_url).status_code, status.HTTP_200_OK)
@@ -128,16 +141,16 @@ def create_method_instance(url: str, page_name: str, template: str, model, creat
 
 
 instance_pages = (
-    ('/hotel/', 'hotel', 'hotel.html', Hotel, {'name': 'abc', 'rating': 4.4}),
-    ('/room/', 'room', 'room.html', Room, {'category': 'double', 'floor': 2, 'number': 201, 'cost': 10}),
-    ('/reserve/', 'reserve', 'reserve.html', Room, {'category': 'double', 'floor': 2, 'number': 201, 'cost': 10}),
+    ('/hotel/', 'hotel', 'hotel.html', 5, Hotel, {'name': 'abc', 'rating': 4.4}),
+    ('/room/', 'room', 'room.html', 3, Room, {'category': 'double', 'floor': 2, 'number': 201, 'cost': 10}),
+    ('/reserve/', 'reserve', 'reserve.html', 6, Room, {'category': 'double', 'floor': 2, 'number': 201, 'cost': 10}),
 )
 
 methods_intance = {f'test_{page[1]}': create_method_instance(*page) for page in instance_pages}
-TestInstancePages = type('TestInstancePages', (TestCase,), methods_intance)
+TestInstancePages = type('TestInstancePages', (QueryBudgetMixin, TestCase), methods_intance)
 
 
-class TestDeleteReserve(TestCase):
+class TestDeleteReserve(QueryBudgetMixin, TestCase):
     """Класс тестов для удаления бронирования."""
 
     def setUp(self) -> None:
@@ -155,10 +168,144 @@ class TestDeleteReserve(TestCase):
 
     def test_valid(self):
         """Тест с корректными данными."""
-        self.assertEqual(self.client.get(f'/delete_reserve/?id={self.reserve.id}').status_code, status.HTTP_302_FOUND)
+        with self.assertQueryBudget(16, duplicates=2):
+            response = self.client.post(f'/delete_reserve/?id={self.reserve.id}')
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
         self.assertFalse(Reserve.objects.filter(user=self.client_test))
+        response = self.client.post(f'/delete_reserve/?id={self.reserve.id}')
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+
+    def test_forbidden(self):
+        """Тест, что бронь нельзя отменить без входа, чужим пользователем и GET-запросом."""
+        url = f'/delete_reserve/?id={self.reserve.id}'
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+        other = User.objects.create(username='other', password='other')
+        Client.objects.create(user=other)
+        self.client.force_login(user=other)
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_302_FOUND)
+        self.client.logout()
+        self.assertIn('login', self.client.post(url).url)
+        self.assertTrue(Reserve.objects.filter(pk=self.reserve.pk).exists())
+
+    def test_cancel_twice(self):
+        """Тест, что повторная отмена той же брони не возвращает деньги второй раз."""
+        money = Client.objects.get(pk=self.client_test.pk).money
+        refund = cancel_reserve(self.reserve)
+        with self.assertRaises(Reserve.DoesNotExist):
+            cancel_reserve(self.reserve)
+        self.assertEqual(Client.objects.get(pk=self.client_test.pk).money, money + refund)
 
     def test_invalid(self):
         """Тест с некорректными данными."""
-        self.assertEqual(self.client.get('/delete_reserve/?id=123').status_code, status.HTTP_302_FOUND)
+        self.assertEqual(self.client.post('/delete_reserve/?id=123').status_code, status.HTTP_302_FOUND)
         self.assertTrue(Reserve.objects.filter(user=self.client_test))
+
+
+class TestHotelList(TestCase):
+    """Класс тестов для списка отелей."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        """Заполнить базу данных."""
+        Hotel.objects.bulk_create(Hotel(name=f'hotel {number:02}', rating=4) for number in range(25))
+
+    def test_pages(self):
+        """Тест прохода по страницам вперёд и назад."""
+        first = self.client.get(reverse('homepage')).context['page']
+        self.assertEqual([hotel.name for hotel in first], [f'hotel {number:02}' for number in range(10)])
+        self.assertFalse(first.has_previous)
+
+        second = self.client.get(reverse('homepage'), {'after': first.next_cursor}).context['page']
+        third = self.client.get(reverse('homepage'), {'after': second.next_cursor}).context['page']
+        self.assertEqual([hotel.name for hotel in third], [f'hotel {number:02}' for number in range(20, 25)])
+        self.assertFalse(third.has_next)
+
+        back = self.client.get(reverse('homepage'), {'before': third.previous_cursor}).context['page']
+        self.assertEqual(list(back), list(second))
+
+    def test_invalid_cursor(self):
+        """Тест некорректного курсора."""
+        response = self.client.get(reverse('homepage'), {'after': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.context['page']), 10)
+
+    def test_num_queries(self):
+        """Тест, что страница строится запросом страницы и оценкой количества без COUNT(*)."""
+        first = self.client.get(reverse('homepage')).context['page']
+        with self.assertNumQueries(2):
+            self.client.get(reverse('homepage'), {'after': first.next_cursor})
+
+
+class TestProfile(QueryBudgetMixin, TestCase):
+    """Класс тестов для профиля и сводки броней клиента."""
+
+    def setUp(self) -> None:
+        """Параметры."""
+        self.today = date.today()
+        self.user = User.objects.create(username='user', password='user')
+        self.hotel_client = Client.objects.create(user=self.user, money=1000)
+        self.client.force_login(user=self.user)
+        hotel = Hotel.objects.create(name='abc', rating=4.4)
+        self.rooms = [
+            Room.objects.create(category='single', floor=1, number=number, cost=10, hotel=hotel)
+            for number in range(1, 4)
+        ]
+
+    def book(self, room: Room, days: int, nights: int = 1) -> Reserve:
+        """Забронировать номер.
+
+        Args:
+            room (Room): номер
+            days (int): через сколько дней заезд
+            nights (int): количество ночей. по умолчанию 1.
+
+        Returns:
+            Reserve: бронь
+        """
+        start_date = self.today + timedelta(days=days)
+        return book_room(self.hotel_client, room, start_date, start_date + timedelta(days=nights))
+
+    def test_summary(self):
+        """Тест сводки при бронировании и отмене."""
+        self.book(self.rooms[0], days=5)
+        second = self.book(self.rooms[1], days=2, nights=3)
+        self.hotel_client.refresh_from_db()
+        self.assertEqual(self.hotel_client.active_reserves, 2)
+        self.assertEqual(self.hotel_client.total_spent, 40)
+        self.assertEqual(self.hotel_client.next_check_in, second.start_date)
+
+        cancel_reserve(second)
+        self.hotel_client.refresh_from_db()
+        self.assertEqual(self.hotel_client.active_reserves, 1)
+        self.assertEqual(self.hotel_client.total_spent, 10)
+        self.assertEqual(self.hotel_client.next_check_in, self.today + timedelta(days=5))
+
+    def test_upcoming_first(self):
+        """Тест порядка броней: будущие по дате заезда, затем прошедшие."""
+        later = self.book(self.rooms[0], days=9)
+        sooner = self.book(self.rooms[1], days=3)
+        past = Reserve.objects.bulk_create([Reserve(
+            user=self.hotel_client, room=self.rooms[2], price=10,
+            start_date=self.today - timedelta(days=5), end_date=self.today - timedelta(days=3),
+        )])[0]
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(list(response.context['reserve']), [sooner, later, past])
+
+    def test_stale_summary(self):
+        """Тест пересчёта сводки после наступления даты заезда."""
+        self.book(self.rooms[0], days=3)
+        Client.objects.filter(pk=self.hotel_client.pk).update(next_check_in=self.today - timedelta(days=1))
+        response = self.client.get(reverse('profile'))
+        self.assertEqual(response.context['client_data']['next check-in'], self.today + timedelta(days=3))
+
+    def test_num_queries(self):
+        """Тест, что количество запросов не зависит от количества броней."""
+        self.book(self.rooms[0], days=1)
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(reverse('profile'))
+        for days in range(2, 30, 2):
+            self.book(self.rooms[1], days=days)
+        with CaptureQueriesContext(connection) as many, self.assertQueryBudget(5):
+            response = self.client.get(reverse('profile'))
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(len(response.context['reserve']), 10)